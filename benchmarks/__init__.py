@@ -0,0 +1 @@
+"""Benchmarks do gerador de etiquetas (`python -m benchmarks.executar --help`)."""
@@ -0,0 +1,80 @@
+"""Catálogo sintético e reprodutível para os benchmarks.
+
+Mesma semente, mesmo catálogo: fornecedores x produtos com títulos longos (que
+obrigam a reduzir a fonte), listas de especificações de tamanhos variados,
+1 a 4 tamanhos por produto e, opcionalmente, fotos JPEG de câmera.
+"""
+import os
+import random
+from typing import Dict, List, Optional
+
+import pandas as pd
+from PIL import Image
+
+TIPOS = ["Sofá", "Poltrona", "Mesa de Jantar", "Cadeira", "Rack", "Cabeceira", "Aparador"]
+ADJETIVOS = ["retrátil", "reclinável", "modular", "com chaise", "de canto", "orgânico", "com puff",
+             "em madeira maciça", "com tampo de vidro", "estofado", "com braço largo"]
+NOMES = ["Lisboa", "Porto", "Milano", "Oslo", "Toscana", "Bali", "Sevilha", "Kyoto", "Atenas"]
+CAMPOS = ["Módulos", "Braços", "Almofadas", "Tecido", "Pé"]
+VALORES = ["Linho", "Veludo", "Couro natural", "Suede", "Madeira tauari tingida", "Aço carbono preto",
+           "3 módulos com 2 assentos retráteis", "25cm", "Espuma D33 com molas ensacadas", "Bouclê"]
+MEDIDAS = ["2,00 x 0,95 x 0,90 m", "1,80 x 0,90 m", "2,50 x 1,00 x 0,85 metros de largura total",
+           "0,60 x 0,60 m", "Ø 1,20 m"]
+
+
+def gerar_catalogo(fornecedores: int, produtos_por_fornecedor: int, semente: int = 42,
+                   imagens: Optional[List[str]] = None) -> List[Dict]:
+    """Lista de etiquetas no formato do app (mesmas chaves de `planilha.ler_planilha`)"""
+    rnd = random.Random(semente)
+    lista = []
+    for f in range(fornecedores):
+        fornecedor = f"{rnd.choice(NOMES)} Móveis {'Estofados ' * rnd.randint(0, 2)}Ltda {f:03d}"
+        for p in range(produtos_por_fornecedor):
+            titulo = f"{rnd.choice(TIPOS)} {' '.join(rnd.sample(ADJETIVOS, rnd.randint(1, 4)))} {rnd.choice(NOMES)} {p}"
+            specs = [f"{c}: {' '.join(rnd.sample(VALORES, rnd.randint(1, 3)))}"
+                     for c in rnd.sample(CAMPOS, rnd.randint(1, len(CAMPOS)))]
+            tamanhos = [{'tamanho': t, 'medida': rnd.choice(MEDIDAS), 'codigo': f"{f:03d}-{p:05d}-{t}"}
+                        for t in ("P", "M", "G", "GG")[:rnd.randint(1, 4)]]
+            d = {'Produto': titulo, 'Fornecedor': fornecedor, 'Prazo': f"{rnd.choice((15, 30, 45, 60))} dias",
+                 'specs_list': specs, 'tamanhos': tamanhos}
+            if imagens: d['imagem'] = rnd.choice(imagens)
+            lista.append(d)
+    return lista
+
+
+def gerar_fotos(pasta: str, quantidade: int, semente: int = 42, tamanho=(2400, 1800)) -> List[str]:
+    """Fotos JPEG com ruído (comprimem como fotos reais, não como cores chapadas)"""
+    os.makedirs(pasta, exist_ok=True)
+    rnd = random.Random(semente)
+    caminhos = []
+    for i in range(quantidade):
+        base = Image.new('RGB', tamanho, (rnd.randrange(256), rnd.randrange(256), rnd.randrange(256)))
+        ruido = Image.effect_noise(tamanho, 60).convert('RGB')
+        foto = Image.blend(base, ruido, 0.35)
+        caminho = os.path.join(pasta, f"foto_{i:03d}.jpg")
+        foto.save(caminho, quality=90)
+        caminhos.append(caminho)
+    return caminhos
+
+
+def gravar_planilha(lista: List[Dict], caminho: str):
+    """Planilha no formato do modelo (Produto, Fornecedor, Prazo, campos, TamN/MedN/CodN, Imagem)"""
+    linhas = []
+    for d in lista:
+        linha = {'Produto': d['Produto'], 'Fornecedor': d['Fornecedor'], 'Prazo': d['Prazo']}
+        for spec in d['specs_list']:
+            campo, valor = spec.split(': ', 1)
+            linha[campo] = valor
+        for n, t in enumerate(d['tamanhos'], 1):
+            linha[f'Tam{n}'], linha[f'Med{n}'], linha[f'Cod{n}'] = t['tamanho'], t['medida'], t['codigo']
+        linha['Imagem'] = d.get('imagem')
+        linhas.append(linha)
+    pd.DataFrame(linhas).to_excel(caminho, index=False)
+
+
+def agrupar_biblioteca(lista: List[Dict]) -> Dict[str, Dict[str, Dict]]:
+    """Catálogo no formato do antigo db_produtos.json ({fornecedor: {produto: dados}})"""
+    db: Dict[str, Dict[str, Dict]] = {}
+    for d in lista:
+        db.setdefault(d['Fornecedor'], {})[d['Produto']] = d
+    return db
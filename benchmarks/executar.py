@@ -0,0 +1,251 @@
+"""Benchmarks dos caminhos principais, com resultado em JSON para comparar execuções.
+
+    python -m benchmarks.executar -o resultado.json
+    python -m benchmarks.executar --rapido --casos render lote
+
+Casos: render (uma etiqueta), lote (PDF do lote, com e sem fotos), planilha
+(leitura do .xlsx) e biblioteca (migração, leitura e gravação com 100, 10k e
+100k produtos). O tempo vem das repetições sem instrumentação (mediana e
+melhor); o pico de memória vem de uma execução extra sob `tracemalloc`.
+Tudo roda em uma pasta temporária, com caches de imagem e de texto frios.
+"""
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from gerador_etiquetas import lote
+from gerador_etiquetas.dados import GerenciadorDados
+from gerador_etiquetas.imagens import CacheImagens
+from gerador_etiquetas.pdf import GeradorPDF
+from gerador_etiquetas.planilha import ler_planilha
+from gerador_etiquetas.texto import ajustar_fonte, quebrar_linhas
+
+from .catalogo import CAMPOS, agrupar_biblioteca, gerar_catalogo, gerar_fotos, gravar_planilha
+
+CASOS = ("render", "lote", "planilha", "biblioteca")
+
+
+# === MEDIÇÃO ===
+def _limpar_caches_texto():
+    ajustar_fonte.cache_clear()
+    quebrar_linhas.cache_clear()
+
+
+def medir(nome: str, funcao: Callable[[], Optional[Dict]], itens: int, repeticoes: int = 3,
+          preparar: Optional[Callable[[], None]] = None, **parametros) -> Dict:
+    """Executa `funcao` `repeticoes` vezes (mais uma sob tracemalloc) e resume os números.
+
+    `preparar` roda antes de cada execução, fora do tempo medido. `funcao` pode
+    devolver métricas extras (ex.: bytes do PDF), que entram no resultado.
+    """
+    tempos, extras = [], {}
+    for _ in range(repeticoes):
+        if preparar: preparar()
+        inicio = time.perf_counter()
+        extras = funcao() or {}
+        tempos.append(time.perf_counter() - inicio)
+
+    if preparar: preparar()
+    tracemalloc.start()
+    try:
+        funcao()
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    mediana = statistics.median(tempos)
+    resultado = {
+        "caso": nome,
+        "parametros": parametros,
+        "itens": itens,
+        "repeticoes": repeticoes,
+        "segundos_mediana": round(mediana, 6),
+        "segundos_melhor": round(min(tempos), 6),
+        "itens_por_segundo": round(itens / mediana, 2) if mediana else None,
+        "pico_memoria_mb": round(pico / 2**20, 3),
+    }
+    resultado.update(extras)
+    print(f"  {nome:<28} {json.dumps(parametros, ensure_ascii=False):<48} "
+          f"{mediana * 1000:10.1f} ms  {resultado['itens_por_segundo'] or 0:12.1f} it/s  "
+          f"{resultado['pico_memoria_mb']:8.1f} MB", file=sys.stderr)
+    return resultado
+
+
+@contextmanager
+def biblioteca_temporaria(pasta: str):
+    """Aponta o GerenciadorDados para uma biblioteca vazia dentro de `pasta`"""
+    originais = (GerenciadorDados.ARQUIVO_BIBLIOTECA, GerenciadorDados.ARQUIVO_DB_PRODUTOS)
+    GerenciadorDados.ARQUIVO_BIBLIOTECA = os.path.join(pasta, 'biblioteca.sqlite3')
+    GerenciadorDados.ARQUIVO_DB_PRODUTOS = os.path.join(pasta, 'db_produtos.json')
+    GerenciadorDados.fechar()
+    try:
+        yield
+    finally:
+        GerenciadorDados.fechar()
+        GerenciadorDados.ARQUIVO_BIBLIOTECA, GerenciadorDados.ARQUIVO_DB_PRODUTOS = originais
+
+
+# === CASOS ===
+def caso_render(pasta: str, catalogo: List[Dict], logo: str, repeticoes: int) -> List[Dict]:
+    """Uma etiqueta em uma página, do zero (caches frios)"""
+    resultados = []
+    for nome, dados in (("curta", min(catalogo, key=lambda d: len(d['Produto']))),
+                        ("titulo_longo", max(catalogo, key=lambda d: len(d['Produto'])))):
+        def render():
+            buf = io.BytesIO()
+            lote.gerar_pdf([dados], buf, logo, usar_img=False, gerador=GeradorPDF(_cache_vazio(pasta)))
+            return {"bytes_pdf": buf.getbuffer().nbytes}
+        resultados.append(medir("render_etiqueta", render, 1, repeticoes, _limpar_caches_texto, etiqueta=nome))
+    return resultados
+
+
+def caso_lote(pasta: str, catalogo: List[Dict], logo: str, repeticoes: int,
+              trabalhadores: Optional[int]) -> List[Dict]:
+    resultados = []
+    for usar_img in (False, True):
+        if usar_img and not any(d.get('imagem') for d in catalogo): continue
+
+        def gerar():
+            buf = io.BytesIO()
+            paginas = lote.gerar_pdf(catalogo, buf, logo, usar_img, gerador=GeradorPDF(_cache_vazio(pasta)),
+                                     trabalhadores=trabalhadores)
+            return {"bytes_pdf": buf.getbuffer().nbytes, "paginas": paginas,
+                    "bytes_por_etiqueta": round(buf.getbuffer().nbytes / len(catalogo), 1)}
+        resultados.append(medir("lote_pdf", gerar, len(catalogo), repeticoes, _limpar_caches_texto,
+                                etiquetas=len(catalogo), fotos=usar_img, trabalhadores=trabalhadores))
+    return resultados
+
+
+def caso_planilha(pasta: str, catalogo: List[Dict], repeticoes: int) -> List[Dict]:
+    caminho = os.path.join(pasta, 'catalogo.xlsx')
+    gravar_planilha(catalogo, caminho)
+
+    def ler():
+        etiquetas = ler_planilha(caminho, CAMPOS)
+        return {"etiquetas_lidas": len(etiquetas), "bytes_planilha": os.path.getsize(caminho)}
+    return [medir("ler_planilha", ler, len(catalogo), repeticoes, linhas=len(catalogo))]
+
+
+def caso_biblioteca(pasta: str, tamanhos: List[int], repeticoes: int, gravacoes: int = 50) -> List[Dict]:
+    resultados = []
+    for total in tamanhos:
+        fornecedores = max(1, total // 100)
+        catalogo = gerar_catalogo(fornecedores, total // fornecedores, semente=total)
+        pasta_caso = os.path.join(pasta, f'biblioteca_{total}')
+
+        def migrar():
+            # Importa um db_produtos.json antigo em uma biblioteca nova
+            shutil.rmtree(pasta_caso, ignore_errors=True)
+            os.makedirs(pasta_caso)
+            with open(os.path.join(pasta_caso, 'db_produtos.json'), 'w', encoding='utf-8') as f:
+                json.dump(agrupar_biblioteca(catalogo), f, ensure_ascii=False)
+            with biblioteca_temporaria(pasta_caso):
+                GerenciadorDados.biblioteca()
+            return {"bytes_banco": os.path.getsize(os.path.join(pasta_caso, 'biblioteca.sqlite3'))}
+        resultados.append(medir("biblioteca_migrar", migrar, len(catalogo), repeticoes, produtos=len(catalogo)))
+
+        def carregar():
+            assert len(GerenciadorDados.carregar_db_produtos()) == fornecedores
+
+        with biblioteca_temporaria(pasta_caso):
+            resultados.append(medir("biblioteca_carregar", carregar, len(catalogo), repeticoes,
+                                    GerenciadorDados.limpar_cache, produtos=len(catalogo), cache=False))
+            carregar()
+            resultados.append(medir("biblioteca_carregar", carregar, len(catalogo), repeticoes,
+                                    produtos=len(catalogo), cache=True))
+
+            def salvar():
+                for i in range(gravacoes):
+                    d = dict(catalogo[i % len(catalogo)], Prazo=f"{i} dias")
+                    GerenciadorDados.salvar_produto_db(d)
+            resultados.append(medir("biblioteca_salvar", salvar, gravacoes, repeticoes, produtos=len(catalogo)))
+    return resultados
+
+
+def _cache_vazio(pasta: str) -> CacheImagens:
+    diretorio = tempfile.mkdtemp(prefix='cache_', dir=pasta)
+    return CacheImagens(diretorio)
+
+
+# === EXECUÇÃO ===
+def _ambiente() -> Dict:
+    versoes = {}
+    for modulo in ('reportlab', 'PIL', 'pandas', 'openpyxl', 'pypdf'):
+        try:
+            versoes[modulo] = getattr(__import__(modulo), '__version__', '?')
+        except ImportError:
+            versoes[modulo] = None
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {"python": platform.python_version(), "plataforma": platform.platform(),
+            "processador": platform.processor() or platform.machine(), "cpus": os.cpu_count(),
+            "commit": commit, "versoes": versoes, "data": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+def executar(casos=CASOS, fornecedores: int = 20, produtos: int = 25, fotos: int = 12,
+             tamanhos_biblioteca=(100, 10_000, 100_000), repeticoes: int = 3, semente: int = 42,
+             trabalhadores: Optional[int] = None) -> Dict:
+    pasta = tempfile.mkdtemp(prefix='bench_etiquetas_')
+    try:
+        caminhos_fotos = gerar_fotos(os.path.join(pasta, 'fotos'), fotos, semente) if fotos else None
+        catalogo = gerar_catalogo(fornecedores, produtos, semente, caminhos_fotos)
+        logo = gerar_fotos(os.path.join(pasta, 'logo'), 1, semente + 1, (600, 380))[0]
+
+        resultados = []
+        if "render" in casos: resultados += caso_render(pasta, catalogo, logo, repeticoes)
+        if "lote" in casos: resultados += caso_lote(pasta, catalogo, logo, repeticoes, trabalhadores)
+        if "planilha" in casos: resultados += caso_planilha(pasta, catalogo, repeticoes)
+        if "biblioteca" in casos: resultados += caso_biblioteca(pasta, list(tamanhos_biblioteca), repeticoes)
+        return {"ambiente": _ambiente(),
+                "catalogo": {"fornecedores": fornecedores, "produtos_por_fornecedor": produtos,
+                             "fotos": fotos, "semente": semente},
+                "resultados": resultados}
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="benchmarks.executar", description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--saida", help="Arquivo JSON de saída (padrão: stdout)")
+    parser.add_argument("--casos", nargs="+", choices=CASOS, default=list(CASOS))
+    parser.add_argument("--fornecedores", type=int, default=20)
+    parser.add_argument("--produtos", type=int, default=25, help="Produtos por fornecedor")
+    parser.add_argument("--fotos", type=int, default=12, help="Fotos distintas no catálogo (0 = sem fotos)")
+    parser.add_argument("--biblioteca", type=int, nargs="+", default=[100, 10_000, 100_000],
+                        help="Tamanhos da biblioteca")
+    parser.add_argument("-n", "--repeticoes", type=int, default=3)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("-j", "--trabalhadores", type=int, default=None, help="Processos no caso 'lote'")
+    parser.add_argument("--rapido", action="store_true", help="Catálogo e bibliotecas pequenos, 1 repetição")
+    args = parser.parse_args(argv)
+
+    if args.rapido:
+        args.fornecedores, args.produtos, args.fotos = 4, 10, 3
+        args.biblioteca, args.repeticoes = [100, 1000], 1
+
+    relatorio = executar(args.casos, args.fornecedores, args.produtos, args.fotos, args.biblioteca,
+                         args.repeticoes, args.semente, args.trabalhadores)
+    texto = json.dumps(relatorio, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f: f.write(texto + "\n")
+    else:
+        print(texto)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,21 @@
 # -*- mode: python ; coding: utf-8 -*-
+# Build em pasta (onedir): o executável abre direto, sem extrair o pacote inteiro
+# para uma pasta temporária a cada execução como no modo de arquivo único.
+# Distribua a pasta dist/gerador_etiquetas inteira.
 
 
 a = Analysis(
-    ['gerador_etiquetas.py'],
-    pathex=[],
+    ['gerador_etiquetas/__main__.py'],
+    pathex=['.'],
     binaries=[],
     datas=[],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    # Não usados pelo app, mas puxados como dependências opcionais do pandas/PIL
+    excludes=['pdf2image', 'matplotlib', 'IPython', 'jupyter_client', 'notebook', 'scipy',
+              'pytest', 'tkinter.test', 'pydoc_data'],
     noarchive=False,
     optimize=0,
 )
@@ -19,16 +24,13 @@ pyz = PYZ(a.pure)
 exe = EXE(
     pyz,
     a.scripts,
-    a.binaries,
-    a.datas,
     [],
+    exclude_binaries=True,
     name='gerador_etiquetas',
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
+    upx=False,  # DLLs comprimidas com UPX são descomprimidas a cada partida
     console=False,
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -36,3 +38,12 @@ exe = EXE(
     codesign_identity=None,
     entitlements_file=None,
 )
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='gerador_etiquetas',
+)
@@ -0,0 +1,5 @@
+"""Gerador de Etiquetas Fortunne.
+
+Módulos sem interface gráfica: config, dados, pdf, planilha e lote.
+A interface Tk fica em `interface` e só é importada ao abrir a janela.
+"""
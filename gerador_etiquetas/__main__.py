@@ -0,0 +1,12 @@
+from gerador_etiquetas import partida  # primeiro import: marca o início da partida
+
+import sys
+from multiprocessing import freeze_support
+
+from gerador_etiquetas.cli import main
+
+partida.marcar("cli")
+
+if __name__ == "__main__":
+    freeze_support()
+    sys.exit(main())
@@ -0,0 +1,368 @@
+"""Backends que executam as operações de `layout.py`.
+
+- `desenhar_reportlab`: desenha no canvas do reportlab (PDF).
+- `RenderizadorPIL`: rasteriza direto em um `PIL.ImageDraw`, sem gerar PDF,
+  sem poppler e sem subprocessos; usado no preview.
+- `GeradorZPL` e `RenderizadorMonocromatico`: impressoras térmicas, em ZPL
+  nativo ou PNG de 1 bit na resolução da impressora. Fotos e logo são
+  reticuladas uma vez (cache) e o resto sai em preto puro.
+"""
+import os
+import logging
+from dataclasses import replace
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFont, ImageOps
+
+from .layout import Retangulo, Linha, Texto, Imagem
+
+logger = logging.getLogger("FortunneApp")
+
+
+# === REPORTLAB ===
+@lru_cache(maxsize=64)
+def _cor_reportlab(cor: str):
+    from reportlab.lib.colors import HexColor
+    return HexColor(cor)
+
+
+def desenhar_reportlab(c, ops: Iterable, dx: float = 0, dy: float = 0):
+    """Desenha as operações no canvas, deslocadas de (dx, dy)"""
+    for op in ops:
+        if isinstance(op, Texto):
+            c.setFillColor(_cor_reportlab(op.cor))
+            c.setFont(op.fonte, op.tamanho)
+            if op.centralizado:
+                c.drawCentredString(dx + op.x, dy + op.y, op.texto)
+            else:
+                c.drawString(dx + op.x, dy + op.y, op.texto)
+        elif isinstance(op, Retangulo):
+            if op.preenchimento: c.setFillColor(_cor_reportlab(op.preenchimento))
+            if op.contorno:
+                c.setStrokeColor(_cor_reportlab(op.contorno))
+                c.setLineWidth(op.espessura)
+            preencher, contornar = int(bool(op.preenchimento)), int(bool(op.contorno))
+            if op.raio:
+                c.roundRect(dx + op.x, dy + op.y, op.largura, op.altura, op.raio, fill=preencher, stroke=contornar)
+            else:
+                c.rect(dx + op.x, dy + op.y, op.largura, op.altura, fill=preencher, stroke=contornar)
+        elif isinstance(op, Linha):
+            c.setStrokeColor(_cor_reportlab(op.cor))
+            c.setLineWidth(op.espessura)
+            c.line(dx + op.x1, dy + op.y1, dx + op.x2, dy + op.y2)
+        elif isinstance(op, Imagem):
+            try:
+                c.drawImage(op.caminho, dx + op.x, dy + op.y, width=op.largura, height=op.altura,
+                            preserveAspectRatio=True, anchor='c', mask='auto')
+            except:
+                desenhar_reportlab(c, op.substituto, dx, dy)
+
+
+# === PIL ===
+# Fontes Type 1 que acompanham o reportlab, com as mesmas métricas da Helvetica
+_FONTES_PIL = {
+    "Helvetica": ("_a______.pfb", "LiberationSans-Regular.ttf", "arial.ttf", "DejaVuSans.ttf"),
+    "Helvetica-Bold": ("_ab_____.pfb", "LiberationSans-Bold.ttf", "arialbd.ttf", "DejaVuSans-Bold.ttf"),
+}
+
+
+def _diretorio_fontes_reportlab() -> Optional[str]:
+    try:
+        import reportlab
+    except ImportError:
+        return None
+    return os.path.join(os.path.dirname(reportlab.__file__), 'fonts')
+
+
+@lru_cache(maxsize=128)
+def _fonte_pil(fonte: str, tamanho_px: int):
+    base = _diretorio_fontes_reportlab()
+    for nome in _FONTES_PIL.get(fonte, _FONTES_PIL["Helvetica"]):
+        if nome.endswith('.pfb'):
+            if not base: continue
+            nome = os.path.join(base, nome)
+        try:
+            return ImageFont.truetype(nome, tamanho_px)
+        except OSError:
+            continue
+    return ImageFont.load_default(tamanho_px)
+
+
+class RenderizadorPIL:
+    def __init__(self, largura_pt: float, altura_pt: float, largura_px: int):
+        self.escala = largura_px / largura_pt
+        self.altura_pt = altura_pt
+        self.tamanho = (largura_px, max(1, round(altura_pt * self.escala)))
+
+    def renderizar(self, ops: Iterable, fundo: str = '#FFFFFF') -> Image.Image:
+        img = Image.new('RGB', self.tamanho, fundo)
+        self.desenhar(img, ops)
+        return img
+
+    def desenhar(self, img: Image.Image, ops: Iterable):
+        draw = ImageDraw.Draw(img)
+        for op in ops:
+            if isinstance(op, Texto):
+                tamanho_px = max(1, round(op.tamanho * self.escala))
+                fonte = _fonte_pil(op.fonte, tamanho_px)
+                ancora = 'ms' if op.centralizado else 'ls'
+                draw.text(self._ponto(op.x, op.y), op.texto, fill=op.cor, font=fonte, anchor=ancora)
+            elif isinstance(op, Retangulo):
+                x0, y0 = self._ponto(op.x, op.y + op.altura)
+                x1, y1 = self._ponto(op.x + op.largura, op.y)
+                largura = max(1, round(op.espessura * self.escala)) if op.contorno else 0
+                caixa = [x0, y0, x1 - 1, y1 - 1]
+                if op.raio:
+                    draw.rounded_rectangle(caixa, radius=op.raio * self.escala, fill=op.preenchimento,
+                                           outline=op.contorno, width=largura)
+                else:
+                    draw.rectangle(caixa, fill=op.preenchimento, outline=op.contorno, width=largura)
+            elif isinstance(op, Linha):
+                largura = max(1, round(op.espessura * self.escala))
+                draw.line([self._ponto(op.x1, op.y1), self._ponto(op.x2, op.y2)], fill=op.cor, width=largura)
+            elif isinstance(op, Imagem):
+                if not self._colar_imagem(img, op):
+                    self.desenhar(img, op.substituto)
+                    draw = ImageDraw.Draw(img)
+
+    def _ponto(self, x: float, y: float):
+        return (round(x * self.escala), round((self.altura_pt - y) * self.escala))
+
+    def _colar_imagem(self, img: Image.Image, op: Imagem) -> bool:
+        try:
+            with Image.open(op.caminho) as original:
+                foto = ImageOps.exif_transpose(original)
+                caixa_l = max(1, round(op.largura * self.escala))
+                caixa_a = max(1, round(op.altura * self.escala))
+                proporcao = min(caixa_l / foto.width, caixa_a / foto.height)
+                tamanho = (max(1, round(foto.width * proporcao)), max(1, round(foto.height * proporcao)))
+                foto = foto.convert('RGBA').resize(tamanho, Image.Resampling.LANCZOS)
+        except Exception as e:
+            logger.debug(f"Imagem não desenhada no preview ({op.caminho}): {e}")
+            return False
+        x0, y0 = self._ponto(op.x, op.y + op.altura)
+        x = x0 + (caixa_l - tamanho[0]) // 2
+        y = y0 + (caixa_a - tamanho[1]) // 2
+        img.paste(foto, (x, y), foto)
+        return True
+
+
+# === IMPRESSORAS TÉRMICAS (1 BIT) ===
+LIMITE_PREENCHIMENTO = 0.5  # preenchimentos mais claros que isso (fundo, placeholder) ficam brancos
+LIMITE_TRACO = 0.95         # textos e contornos saem em preto, inclusive os cinza-claros
+TAMANHO_CACHE_GRAFICOS = 256
+
+
+@lru_cache(maxsize=256)
+def _luminancia(cor: str) -> float:
+    cor = cor.lstrip('#')
+    r, g, b = (int(cor[i:i + 2], 16) for i in (0, 2, 4))
+    return (0.299 * r + 0.587 * g + 0.114 * b) / 255
+
+
+def _tinta(cor: Optional[str], limite: float) -> bool:
+    """A cor imprime (preto) em uma impressora de 1 bit?"""
+    if not cor: return False
+    try:
+        return _luminancia(cor) < limite
+    except ValueError:
+        return True
+
+
+@lru_cache(maxsize=TAMANHO_CACHE_GRAFICOS)
+def _foto_1bit(caminho: str, assinatura: Tuple, largura_px: int, altura_px: int) -> Image.Image:
+    with Image.open(caminho) as original:
+        foto = ImageOps.exif_transpose(original)
+        proporcao = min(largura_px / foto.width, altura_px / foto.height)
+        tamanho = (max(1, round(foto.width * proporcao)), max(1, round(foto.height * proporcao)))
+        foto = foto.convert('RGBA').resize(tamanho, Image.Resampling.LANCZOS)
+    fundo = Image.new('RGBA', tamanho, '#FFFFFF')
+    fundo.alpha_composite(foto)
+    return fundo.convert('L').convert('1')  # Floyd–Steinberg
+
+
+def foto_monocromatica(caminho: str, largura_px: int, altura_px: int) -> Optional[Image.Image]:
+    """Foto encaixada na caixa e reticulada para 1 bit; cacheada por arquivo (mtime/tamanho) e caixa"""
+    try:
+        st = os.stat(caminho)
+        return _foto_1bit(caminho, (st.st_mtime_ns, st.st_size), largura_px, altura_px)
+    except Exception as e:
+        logger.debug(f"Imagem não reticulada ({caminho}): {e}")
+        return None
+
+
+class _Raster1Bit:
+    """Conversão de pontos (origem embaixo) para dots da impressora (origem em cima)"""
+    def __init__(self, largura_pt: float, altura_pt: float, dpi: int):
+        self.escala = dpi / 72
+        self.altura_pt = altura_pt
+        self.tamanho = (max(1, round(largura_pt * self.escala)), max(1, round(altura_pt * self.escala)))
+
+    def _ponto(self, x: float, y: float):
+        return (round(x * self.escala), round((self.altura_pt - y) * self.escala))
+
+    def _dots(self, medida: float) -> int:
+        return max(1, round(medida * self.escala))
+
+    def _separar_imagens(self, ops: Iterable, fotos: List) -> List:
+        """Operações vetoriais; as imagens que abriram vão para `fotos` como (x, y, foto, op)"""
+        vetoriais = []
+        for op in ops:
+            if not isinstance(op, Imagem):
+                vetoriais.append(op)
+                continue
+            caixa = (self._dots(op.largura), self._dots(op.altura))
+            foto = foto_monocromatica(op.caminho, *caixa)
+            if foto is None:
+                vetoriais.extend(self._separar_imagens(op.substituto, fotos))
+                continue
+            x0, y0 = self._ponto(op.x, op.y + op.altura)
+            fotos.append((x0 + (caixa[0] - foto.width) // 2, y0 + (caixa[1] - foto.height) // 2, foto, op))
+        return vetoriais
+
+
+class RenderizadorMonocromatico(_Raster1Bit):
+    """PNG de 1 bit na resolução da impressora: traços em preto puro e fotos reticuladas"""
+    def renderizar(self, ops: Iterable) -> Image.Image:
+        fotos: List = []
+        vetoriais = [_em_preto_e_branco(op) for op in self._separar_imagens(ops, fotos)]
+        img = Image.new('L', self.tamanho, 255)
+        RenderizadorPIL(self.tamanho[0] / self.escala, self.altura_pt, self.tamanho[0]).desenhar(img, vetoriais)
+        img = img.point(lambda v: 255 if v >= 128 else 0).convert('1', dither=Image.Dither.NONE)
+        for x, y, foto, _ in fotos:
+            img.paste(foto, (x, y))
+        return img
+
+
+def _em_preto_e_branco(op):
+    if isinstance(op, Texto):
+        return replace(op, cor='#000000' if _tinta(op.cor, LIMITE_TRACO) else '#FFFFFF')
+    if isinstance(op, Retangulo):
+        return replace(op, preenchimento='#000000' if _tinta(op.preenchimento, LIMITE_PREENCHIMENTO) else None,
+                       contorno='#000000' if _tinta(op.contorno, LIMITE_TRACO) else None)
+    if isinstance(op, Linha):
+        return replace(op, cor='#000000' if _tinta(op.cor, LIMITE_TRACO) else '#FFFFFF')
+    return op
+
+
+# --- ZPL ---
+# Compressão ASCII da Zebra para ^GF/~DG: G..Y repetem 1..19 vezes, g..z 20..400;
+# ',' completa a linha com 0, '!' com F e ':' repete a linha anterior
+_INVERTE = bytes(255 - i for i in range(256))
+_ESCAPES_ZPL = {ord('_'): '_5F', ord('^'): '_5E', ord('~'): '_7E'}
+
+
+def _contagem_zpl(n: int) -> str:
+    s = 'z' * (n // 400)
+    n %= 400
+    if n >= 20: s += chr(ord('g') + n // 20 - 1)
+    if n % 20: s += chr(ord('G') + n % 20 - 1)
+    return s
+
+
+def _comprimir_linha_zpl(hexa: str) -> str:
+    fim = ''
+    if hexa.endswith('00'):
+        hexa, fim = hexa.rstrip('0'), ','
+    elif hexa.endswith('FF'):
+        hexa, fim = hexa.rstrip('F'), '!'
+    partes = []
+    i = 0
+    while i < len(hexa):
+        j = i
+        while j < len(hexa) and hexa[j] == hexa[i]: j += 1
+        partes.append((_contagem_zpl(j - i) if j - i > 1 else '') + hexa[i])
+        i = j
+    return ''.join(partes) + fim
+
+
+def grafico_zpl(foto: Image.Image) -> Tuple[int, int, str]:
+    """(total de bytes, bytes por linha, dados comprimidos) de uma imagem de 1 bit"""
+    por_linha = (foto.width + 7) // 8
+    bruto = foto.tobytes().translate(_INVERTE)  # no PIL 1 = branco; no ZPL 1 = preto
+    sobra = foto.width % 8
+    mascara = (0xFF << (8 - sobra)) & 0xFF if sobra else 0xFF  # bits de preenchimento ficam brancos
+    linhas, anterior = [], None
+    for inicio in range(0, len(bruto), por_linha):
+        linha = bytearray(bruto[inicio:inicio + por_linha])
+        linha[-1] &= mascara
+        if linha == anterior:
+            linhas.append(':')
+            continue
+        anterior = linha
+        linhas.append(_comprimir_linha_zpl(linha.hex().upper()))
+    return por_linha * foto.height, por_linha, ''.join(linhas)
+
+
+def _texto_zpl(texto: str) -> str:
+    # Sem emojis (fora do BMP): a fonte residente da impressora não tem esses glifos
+    return ''.join(ch for ch in texto if ord(ch) <= 0xFFFF).strip().translate(_ESCAPES_ZPL)
+
+
+class GeradorZPL(_Raster1Bit):
+    """Etiquetas em ZPL II. Fotos e logo vão uma vez por trabalho (~DG) e cada etiqueta só as chama (^XG)"""
+    def __init__(self, largura_pt: float, altura_pt: float, dpi: int):
+        super().__init__(largura_pt, altura_pt, dpi)
+        self._graficos: Dict[Tuple, Tuple[str, str]] = {}   # (arquivo, caixa) -> (nome, ~DG)
+
+    def etiqueta(self, ops: Iterable, copias: int = 1) -> str:
+        fotos: List = []
+        vetoriais = self._separar_imagens(ops, fotos)
+        cmds = [f"^XA^CI28^PW{self.tamanho[0]}^LL{self.tamanho[1]}^LH0,0"]
+        for x, y, foto, op in fotos:
+            cmds.append(f"^FO{x},{y}^XG{self._grafico(foto, op)},1,1^FS")
+        for op in vetoriais:
+            cmds.extend(self._comandos(op))
+        if copias > 1: cmds.append(f"^PQ{copias}")
+        cmds.append("^XZ")
+        return '\n'.join(cmds) + '\n'
+
+    def cabecalho(self) -> str:
+        """Gráficos usados pelas etiquetas; vai antes delas no trabalho"""
+        return ''.join(dg for _, dg in self._graficos.values())
+
+    def rodape(self) -> str:
+        """Apaga da memória da impressora os gráficos deste trabalho"""
+        return "^XA^IDR:ETQ*.GRF^FS^XZ\n" if self._graficos else ''
+
+    def _grafico(self, foto: Image.Image, op: Imagem) -> str:
+        chave = (op.caminho, foto.size)
+        if chave not in self._graficos:
+            nome = f"R:ETQ{len(self._graficos):05d}.GRF"
+            total, por_linha, dados = grafico_zpl(foto)
+            self._graficos[chave] = (nome, f"~DG{nome},{total},{por_linha},{dados}\n")
+        return self._graficos[chave][0]
+
+    def _comandos(self, op) -> List[str]:
+        if isinstance(op, Texto):
+            if not _tinta(op.cor, LIMITE_TRACO) or not op.texto.strip(): return []
+            altura = self._dots(op.tamanho)
+            x, y = self._ponto(op.x, op.y)
+            campo = f"^A0N,{altura}^FH^FD{_texto_zpl(op.texto)}^FS"
+            if not op.centralizado: return [f"^FT{x},{y}{campo}"]
+            # Bloco centrado no ponto, tão largo quanto a etiqueta permitir
+            meia = max(1, min(x, self.tamanho[0] - x))
+            return [f"^FT{x - meia},{y}^FB{2 * meia},1,0,C{campo}"]
+        if isinstance(op, Retangulo):
+            x, y = self._ponto(op.x, op.y + op.altura)
+            largura, altura = self._dots(op.largura), self._dots(op.altura)
+            arredondamento = min(8, round(op.raio * self.escala * 16 / min(largura, altura))) if op.raio else 0
+            if _tinta(op.preenchimento, LIMITE_PREENCHIMENTO):
+                return [f"^FO{x},{y}^GB{largura},{altura},{min(largura, altura)},B,{arredondamento}^FS"]
+            if _tinta(op.contorno, LIMITE_TRACO):
+                espessura = min(self._dots(op.espessura), largura, altura)
+                return [f"^FO{x},{y}^GB{largura},{altura},{espessura},B,{arredondamento}^FS"]
+            return []
+        if isinstance(op, Linha):
+            if not _tinta(op.cor, LIMITE_TRACO): return []
+            (x1, y1), (x2, y2) = self._ponto(op.x1, op.y1), self._ponto(op.x2, op.y2)
+            espessura = self._dots(op.espessura)
+            if y1 == y2:
+                return [f"^FO{min(x1, x2)},{y1 - espessura // 2}^GB{max(abs(x2 - x1), espessura)},{espessura},{espessura}^FS"]
+            if x1 == x2:
+                return [f"^FO{x1 - espessura // 2},{min(y1, y2)}^GB{espessura},{max(abs(y2 - y1), espessura)},{espessura}^FS"]
+            # Diagonal: ^GD sobe para a direita (R) ou desce para a direita (L)
+            orientacao = 'R' if (x2 - x1) * (y2 - y1) < 0 else 'L'
+            return [f"^FO{min(x1, x2)},{min(y1, y2)}^GD{abs(x2 - x1)},{abs(y2 - y1)},{espessura},B,{orientacao}^FS"]
+        return []
@@ -0,0 +1,222 @@
+"""Biblioteca de produtos em SQLite (módulo `sqlite3` da biblioteca padrão).
+
+Cada produto salvo é uma transação que toca só as suas linhas, então o custo de
+salvar não cresce com o tamanho da biblioteca, e uma queda no meio da gravação não
+corrompe o restante. `migrar_json` importa o antigo `db_produtos.json`.
+
+Várias instâncias podem usar o mesmo arquivo: quem grava espera a vez (até
+`TEMPO_ESPERA_BANCO_S`) em vez de falhar com "database is locked", e cada leitura
+roda em uma transação, vendo uma versão consistente do banco. Em modo WAL (disco
+local) a leitura não espera pelas gravações; em compartilhamentos de rede, onde o
+WAL não funciona, o banco usa o diário de rollback comum.
+"""
+import json
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from .compartilhado import em_rede
+
+logger = logging.getLogger("FortunneApp")
+
+TEMPO_ESPERA_BANCO_S = 30.0
+
+# Chaves guardadas em colunas/tabelas próprias; o resto do formulário vai em `extras`
+_CAMPOS_PROPRIOS = ('Prazo', 'imagem', 'specs_list', 'tamanhos')
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    chave TEXT PRIMARY KEY,
+    valor TEXT
+);
+CREATE TABLE IF NOT EXISTS fornecedores (
+    id INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS produtos (
+    id INTEGER PRIMARY KEY,
+    fornecedor_id INTEGER NOT NULL REFERENCES fornecedores(id),
+    nome TEXT NOT NULL,
+    prazo TEXT,
+    imagem TEXT,
+    extras TEXT NOT NULL DEFAULT '{}',
+    atualizado_em TEXT,
+    UNIQUE (fornecedor_id, nome)
+);
+CREATE TABLE IF NOT EXISTS specs (
+    produto_id INTEGER NOT NULL REFERENCES produtos(id) ON DELETE CASCADE,
+    ordem INTEGER NOT NULL,
+    texto TEXT NOT NULL,
+    PRIMARY KEY (produto_id, ordem)
+);
+CREATE TABLE IF NOT EXISTS tamanhos (
+    produto_id INTEGER NOT NULL REFERENCES produtos(id) ON DELETE CASCADE,
+    ordem INTEGER NOT NULL,
+    tamanho TEXT,
+    medida TEXT,
+    codigo TEXT,
+    PRIMARY KEY (produto_id, ordem)
+);
+CREATE INDEX IF NOT EXISTS idx_produtos_fornecedor ON produtos(fornecedor_id);
+CREATE INDEX IF NOT EXISTS idx_produtos_nome ON produtos(nome);
+"""
+
+
+def chave_produto(dados: Dict) -> Tuple[str, str]:
+    """(fornecedor, produto) sob os quais o produto é agrupado na biblioteca"""
+    fornecedor = str(dados.get('Fornecedor', 'Sem Fornecedor') or '').strip()
+    nome_produto = str(dados.get('Produto', 'Sem Nome') or '').strip()
+    if not fornecedor: fornecedor = 'Outros'
+    return fornecedor, nome_produto
+
+
+def _montar(prazo, imagem, extras: str) -> Dict:
+    dados = json.loads(extras)
+    if prazo is not None: dados['Prazo'] = prazo
+    if imagem is not None: dados['imagem'] = imagem
+    dados['specs_list'] = []
+    dados['tamanhos'] = []
+    return dados
+
+
+class BibliotecaSQLite:
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        self._lock = threading.Lock()
+        # IMMEDIATE: a transação de gravação pega a vez logo no início, e a espera do
+        # `timeout` vale para ela (uma transação adiada que tenta gravar depois de uma
+        # leitura pode falhar na hora se outra instância gravou no meio)
+        self._conn = sqlite3.connect(caminho, timeout=TEMPO_ESPERA_BANCO_S, check_same_thread=False,
+                                     isolation_level='IMMEDIATE')
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self.em_rede = em_rede(caminho)
+        self._conn.execute("PRAGMA journal_mode = DELETE" if self.em_rede else "PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        with self._conn:
+            self._conn.executescript(_ESQUEMA)
+
+    def fechar(self):
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def _leitura(self):
+        """Consultas dentro de uma transação: todas veem a mesma versão do banco"""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                yield self._conn
+            finally:
+                self._conn.execute("COMMIT")
+
+    # --- META ---
+    def obter_meta(self, chave: str) -> Optional[str]:
+        with self._lock:
+            linha = self._conn.execute("SELECT valor FROM meta WHERE chave = ?", (chave,)).fetchone()
+        return linha[0] if linha else None
+
+    def definir_meta(self, chave: str, valor: str):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta (chave, valor) VALUES (?, ?)", (chave, valor))
+
+    # --- ESCRITA ---
+    def salvar_produto(self, dados: Dict):
+        """Insere ou atualiza um produto em uma única transação"""
+        with self._lock, self._conn:
+            self._gravar(dados)
+
+    def _gravar(self, dados: Dict):
+        fornecedor, nome_produto = chave_produto(dados)
+        cur = self._conn.cursor()
+        cur.execute("INSERT OR IGNORE INTO fornecedores (nome) VALUES (?)", (fornecedor,))
+        forn_id = cur.execute("SELECT id FROM fornecedores WHERE nome = ?", (fornecedor,)).fetchone()[0]
+
+        extras = {k: v for k, v in dados.items() if k not in _CAMPOS_PROPRIOS}
+        cur.execute(
+            """INSERT INTO produtos (fornecedor_id, nome, prazo, imagem, extras, atualizado_em)
+               VALUES (?, ?, ?, ?, ?, ?)
+               ON CONFLICT (fornecedor_id, nome) DO UPDATE SET
+                   prazo = excluded.prazo, imagem = excluded.imagem,
+                   extras = excluded.extras, atualizado_em = excluded.atualizado_em""",
+            (forn_id, nome_produto, dados.get('Prazo'), dados.get('imagem'),
+             json.dumps(extras, ensure_ascii=False), datetime.now().isoformat(timespec='seconds')))
+        prod_id = cur.execute("SELECT id FROM produtos WHERE fornecedor_id = ? AND nome = ?",
+                              (forn_id, nome_produto)).fetchone()[0]
+
+        cur.execute("DELETE FROM specs WHERE produto_id = ?", (prod_id,))
+        cur.executemany("INSERT INTO specs (produto_id, ordem, texto) VALUES (?, ?, ?)",
+                        [(prod_id, i, str(s)) for i, s in enumerate(dados.get('specs_list', []) or [])])
+        cur.execute("DELETE FROM tamanhos WHERE produto_id = ?", (prod_id,))
+        cur.executemany("INSERT INTO tamanhos (produto_id, ordem, tamanho, medida, codigo) VALUES (?, ?, ?, ?, ?)",
+                        [(prod_id, i, t.get('tamanho', ''), t.get('medida', ''), t.get('codigo', ''))
+                         for i, t in enumerate(dados.get('tamanhos', []) or [])])
+
+    # --- LEITURA ---
+    def carregar_tudo(self) -> Dict[str, Dict[str, Dict]]:
+        """Biblioteca inteira no formato {fornecedor: {produto: dados}}"""
+        with self._leitura() as conn:
+            produtos = conn.execute(
+                """SELECT p.id, f.nome, p.nome, p.prazo, p.imagem, p.extras
+                   FROM produtos p JOIN fornecedores f ON f.id = p.fornecedor_id
+                   ORDER BY f.id, p.id""").fetchall()
+            specs = conn.execute("SELECT produto_id, texto FROM specs ORDER BY produto_id, ordem").fetchall()
+            tamanhos = conn.execute(
+                "SELECT produto_id, tamanho, medida, codigo FROM tamanhos ORDER BY produto_id, ordem").fetchall()
+
+        por_id = {}
+        db: Dict[str, Dict[str, Dict]] = {}
+        for prod_id, fornecedor, nome, prazo, imagem, extras in produtos:
+            dados = _montar(prazo, imagem, extras)
+            por_id[prod_id] = dados
+            db.setdefault(fornecedor, {})[nome] = dados
+        for prod_id, texto in specs:
+            por_id[prod_id]['specs_list'].append(texto)
+        for prod_id, tamanho, medida, codigo in tamanhos:
+            por_id[prod_id]['tamanhos'].append({'tamanho': tamanho, 'medida': medida, 'codigo': codigo})
+        return db
+
+    def carregar_produto(self, fornecedor: str, nome_produto: str) -> Optional[Dict]:
+        """Um produto no mesmo formato de `carregar_tudo` (ou None)"""
+        with self._leitura() as conn:
+            linha = conn.execute(
+                """SELECT p.id, p.prazo, p.imagem, p.extras
+                   FROM produtos p JOIN fornecedores f ON f.id = p.fornecedor_id
+                   WHERE f.nome = ? AND p.nome = ?""", (fornecedor, nome_produto)).fetchone()
+            if linha is None: return None
+            prod_id = linha[0]
+            specs = conn.execute("SELECT texto FROM specs WHERE produto_id = ? ORDER BY ordem",
+                                 (prod_id,)).fetchall()
+            tamanhos = conn.execute(
+                "SELECT tamanho, medida, codigo FROM tamanhos WHERE produto_id = ? ORDER BY ordem",
+                (prod_id,)).fetchall()
+        dados = _montar(*linha[1:])
+        dados['specs_list'] = [texto for (texto,) in specs]
+        dados['tamanhos'] = [{'tamanho': t, 'medida': m, 'codigo': c} for t, m, c in tamanhos]
+        return dados
+
+    def contar(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM produtos").fetchone()[0]
+
+    # --- MIGRAÇÃO ---
+    def migrar_json(self, caminho_json: str) -> int:
+        """Importa o db_produtos.json antigo em uma única transação; devolve o nº de produtos"""
+        with open(caminho_json, 'r', encoding='utf-8') as f:
+            db = json.load(f)
+        total = 0
+        with self._lock, self._conn:
+            for fornecedor, produtos in db.items():
+                for nome_produto, dados in produtos.items():
+                    dados = dict(dados)
+                    # Registros antigos sem Fornecedor/Produto herdam as chaves do JSON
+                    dados.setdefault('Fornecedor', fornecedor)
+                    dados.setdefault('Produto', nome_produto)
+                    self._gravar(dados)
+                    total += 1
+            self._conn.execute("INSERT OR REPLACE INTO meta (chave, valor) VALUES (?, ?)",
+                               ('json_migrado', caminho_json))
+        logger.info(f"Biblioteca migrada de {caminho_json}: {total} produto(s)")
+        return total
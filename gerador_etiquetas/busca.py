@@ -0,0 +1,158 @@
+"""Índices de busca: o invertido da biblioteca de produtos (seletor de etiquetas) e o
+de prefixos do histórico (autocompletar dos campos).
+
+Cada token (fornecedor, nome do produto e specs, sem acento e em minúsculas) aponta
+para os produtos que o contêm. Um termo casa com os tokens que o contêm: os que
+começam com ele saem do vocabulário ordenado via bisect, o resto é uma varredura
+do vocabulário, bem menor que a biblioteca. Enquanto se digita, cada termo
+reaproveita os tokens já encontrados para o termo anterior (um caractere a menos).
+"""
+import re
+import heapq
+import bisect
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, List, Set, Tuple
+
+_TOKEN = re.compile(r'\w+')
+LIMITE_MEMO = 256
+
+
+def normalizar(texto) -> str:
+    """Minúsculas e sem acentos, para comparar 'Sofá' com 'sofa'"""
+    decomposto = unicodedata.normalize('NFKD', str(texto).casefold())
+    return ''.join(ch for ch in decomposto if not unicodedata.combining(ch))
+
+
+def tokenizar(texto) -> List[str]:
+    return _TOKEN.findall(normalizar(texto))
+
+
+@dataclass(frozen=True)
+class ProdutoIndexado:
+    fornecedor: str
+    nome: str
+    dados: Dict
+
+
+class IndiceBiblioteca:
+    def __init__(self, db: Dict[str, Dict[str, Dict]]):
+        self.produtos: List[ProdutoIndexado] = []
+        self.por_fornecedor: Dict[str, List[int]] = {}
+        postagens: Dict[str, Set[int]] = {}
+
+        for fornecedor, produtos in db.items():
+            ids = self.por_fornecedor.setdefault(fornecedor, [])
+            for nome, dados in produtos.items():
+                idx = len(self.produtos)
+                self.produtos.append(ProdutoIndexado(fornecedor, nome, dados))
+                ids.append(idx)
+                textos = [fornecedor, nome] + [str(s) for s in dados.get('specs_list', []) or []]
+                for texto in textos:
+                    for token in tokenizar(texto):
+                        postagens.setdefault(token, set()).add(idx)
+
+        self._postagens = postagens
+        self._vocabulario = sorted(postagens)
+        self._memo: Dict[str, List[str]] = {}
+
+    def __len__(self):
+        return len(self.produtos)
+
+    # --- TERMOS ---
+    def _prefixados(self, termo: str) -> List[str]:
+        inicio = bisect.bisect_left(self._vocabulario, termo)
+        fim = bisect.bisect_left(self._vocabulario, termo + '\U0010FFFF', inicio)
+        return self._vocabulario[inicio:fim]
+
+    def _contendo(self, termo: str) -> List[str]:
+        """Tokens que contêm o termo; parte do resultado do termo sem o último caractere"""
+        if termo in self._memo: return self._memo[termo]
+        anterior = self._memo.get(termo[:-1]) if len(termo) > 1 else None
+        candidatos = anterior if anterior is not None else self._vocabulario
+        tokens = [t for t in candidatos if termo in t]
+        if len(self._memo) >= LIMITE_MEMO: self._memo.clear()
+        self._memo[termo] = tokens
+        return tokens
+
+    def _casados(self, termo: str) -> Tuple[Set[int], Set[int]]:
+        """(ids com token começando pelo termo, ids com token que apenas contém o termo)"""
+        por_prefixo: Set[int] = set()
+        for token in self._prefixados(termo):
+            por_prefixo |= self._postagens[token]
+        por_trecho: Set[int] = set()
+        for token in self._contendo(termo):
+            por_trecho |= self._postagens[token]
+        return por_prefixo, por_trecho - por_prefixo
+
+    # --- BUSCA ---
+    def buscar(self, consulta: str) -> List[int]:
+        """Ids dos produtos que casam com todos os termos da consulta.
+
+        Vêm primeiro os que casam todos os termos pelo início de uma palavra; dentro
+        de cada grupo, na ordem da biblioteca. Consulta vazia devolve tudo.
+        """
+        termos = tokenizar(consulta)
+        if not termos: return list(range(len(self.produtos)))
+
+        todos_prefixo = None
+        resultado = None
+        for termo in termos:
+            por_prefixo, por_trecho = self._casados(termo)
+            casados = por_prefixo | por_trecho
+            resultado = casados if resultado is None else resultado & casados
+            todos_prefixo = por_prefixo if todos_prefixo is None else todos_prefixo & por_prefixo
+            if not resultado: return []
+        return sorted(resultado, key=lambda i: (i not in todos_prefixo, i))
+
+    def agrupar(self, ids: List[int]) -> Dict[str, List[int]]:
+        """Ids agrupados por fornecedor, mantendo a ordem recebida"""
+        grupos: Dict[str, List[int]] = {}
+        for idx in ids:
+            grupos.setdefault(self.produtos[idx].fornecedor, []).append(idx)
+        return grupos
+
+
+class IndicePrefixos:
+    """Valores já usados em um campo, sugeridos pelo começo do texto digitado.
+
+    Os valores ficam em uma lista ordenada pela forma normalizada; os que começam
+    com o prefixo formam uma fatia contígua, achada com bisect. Dentro dela ganham
+    os mais usados e, no empate, os usados por último. Enquanto nada é usado, as
+    consultas repetidas (abrir a lista, apagar e redigitar) saem de um memo.
+    """
+    def __init__(self):
+        self._ordenados: List[Tuple[str, str]] = []   # (normalizado, valor)
+        self.usos: Dict[str, int] = {}
+        self.ultimo: Dict[str, int] = {}              # número de sequência do último uso
+        self._memo: Dict[Tuple[str, int], List[str]] = {}
+
+    def __len__(self):
+        return len(self.usos)
+
+    def __contains__(self, valor):
+        return valor in self.usos
+
+    def usar(self, valor: str, sequencia: int, vezes: int = 1):
+        if valor not in self.usos:
+            bisect.insort(self._ordenados, (normalizar(valor), valor))
+            self.usos[valor] = 0
+        self.usos[valor] += vezes
+        self.ultimo[valor] = sequencia
+        self._memo.clear()
+
+    def sugerir(self, prefixo: str = '', limite: int = 20) -> List[str]:
+        """Até `limite` valores que começam com o prefixo (sem diferenciar acento/maiúscula)"""
+        chave = normalizar(prefixo.strip())
+        if (chave, limite) in self._memo: return list(self._memo[chave, limite])
+        inicio = bisect.bisect_left(self._ordenados, (chave,))
+        fim = bisect.bisect_left(self._ordenados, (chave + '\U0010FFFF',), inicio)
+        melhores = heapq.nlargest(limite, (valor for _, valor in self._ordenados[inicio:fim]),
+                                  key=lambda v: (self.usos[v], self.ultimo[v]))
+        if len(self._memo) >= LIMITE_MEMO: self._memo.clear()
+        self._memo[chave, limite] = melhores
+        return list(melhores)
+
+    def por_recencia(self) -> List[Tuple[str, int]]:
+        """[(valor, usos)] do uso mais antigo para o mais recente"""
+        return [(v, self.usos[v]) for v in sorted(self.usos, key=self.ultimo.__getitem__)]
@@ -0,0 +1,126 @@
+"""Linha de comando do gerador de etiquetas.
+
+    python -m gerador_etiquetas render catalogo.xlsx --tipo Sofá -o etiquetas.pdf
+    python -m gerador_etiquetas render catalogo.xlsx --folha rolo-100x150 -o etiquetas.zpl
+    python -m gerador_etiquetas modelo --tipo Mesa -o modelo_mesa.xlsx
+    python -m gerador_etiquetas servir --porta 8765 --logo logo.png --imagens fotos/
+
+Sem argumentos, abre a interface gráfica (`--medir-partida` abre, mede o tempo
+até a janela aparecer e fecha). Os comandos de linha nunca importam
+tkinter, então funcionam em servidores sem display.
+"""
+import os
+import argparse
+import logging
+from typing import List, Optional
+
+from .instrumentacao import configurar_logging, registrar_resumo
+
+logger = logging.getLogger("FortunneApp")
+
+# Chaves de `folha.FOLHAS`, repetidas aqui para o parser não importar o motor de geração
+FOLHAS_CLI = ("a4-4", "a4-6", "a4-8", "rolo-100x150")
+
+
+def _cmd_render(args) -> int:
+    from . import lote
+    from .folha import FOLHAS
+    from .pdf import Compactacao
+    etiquetas = lote.carregar_planilha(args.planilha, args.tipo)
+    if not etiquetas:
+        logger.error("Nenhuma etiqueta encontrada na planilha.")
+        return 1
+    formato = args.formato or os.path.splitext(args.saida)[1].lstrip('.').lower()
+    if formato in lote.FORMATOS_TERMICA:
+        n = lote.gerar_termica(etiquetas, args.saida, formato, args.logo, not args.sem_imagem, dpi=args.dpi,
+                               folha=FOLHAS[args.folha])
+        print(f"{args.saida}: {n} etiqueta(s), {formato.upper()} a {args.dpi} dpi")
+        return 0
+    compactacao = None
+    if args.compacto or args.qualidade_jpeg or args.dpi_imagens:
+        padrao = Compactacao()
+        compactacao = Compactacao(args.qualidade_jpeg or padrao.qualidade_jpeg, args.dpi_imagens or padrao.dpi)
+    paginas = lote.gerar_pdf(etiquetas, args.saida, args.logo, not args.sem_imagem,
+                             trabalhadores=args.trabalhadores, folha=FOLHAS[args.folha],
+                             compactacao=compactacao)
+    tamanho = lote.descrever_tamanho(lote.tamanho_pdf(args.saida), len(etiquetas))
+    print(f"{args.saida}: {len(etiquetas)} etiqueta(s), {paginas} página(s), {tamanho}")
+    return 0
+
+
+def _cmd_modelo(args) -> int:
+    from .lote import campos_do_tipo
+    from .planilha import gerar_modelo
+    gerar_modelo(args.saida, campos_do_tipo(args.tipo))
+    print(f"Modelo gerado: {args.saida}")
+    return 0
+
+
+def _cmd_servir(args) -> int:
+    from .servidor import servir
+    from .folha import FOLHAS
+    servir(args.host, args.porta, args.logo, args.trabalhadores, FOLHAS[args.folha], args.imagens)
+    return 0
+
+
+def _criar_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="gerador_etiquetas", description="Gerador de Etiquetas Fortunne")
+    parser.add_argument("--medir-partida", action="store_true",
+                        help="Abre a interface, imprime o tempo até a primeira janela e fecha")
+    sub = parser.add_subparsers(dest="comando")
+
+    p_render = sub.add_parser("render", help="Gera o PDF das etiquetas de uma planilha")
+    p_render.add_argument("planilha", help="Planilha com os produtos (.xlsx, .csv ou .parquet)")
+    p_render.add_argument("--tipo", help="Tipo de produto (padrão: o primeiro cadastrado)")
+    p_render.add_argument("-o", "--saida", default="Etiquetas_Fortunne.pdf", help="Arquivo de saída")
+    p_render.add_argument("--formato", choices=("pdf", "zpl", "png"),
+                          help="pdf, ou zpl/png (1 bit) para impressora térmica (padrão: pela extensão da saída)")
+    p_render.add_argument("--dpi", type=int, default=300,
+                          help="Resolução da impressora térmica, para zpl/png (padrão: 300)")
+    p_render.add_argument("--logo", default="", help="Imagem do logo da empresa")
+    p_render.add_argument("--sem-imagem", action="store_true", help="Não incluir as fotos dos produtos")
+    p_render.add_argument("--folha", choices=FOLHAS_CLI, default="a4-4",
+                          help="Folha/rolo: etiquetas por página e tamanho da etiqueta (padrão: a4-4; "
+                               "para zpl/png use um rolo, ex.: rolo-100x150)")
+    p_render.add_argument("--compacto", action="store_true",
+                          help="PDF menor para envio: compressão e imagens repetidas guardadas uma vez")
+    p_render.add_argument("--qualidade-jpeg", type=int, metavar="Q",
+                          help="Recomprime as fotos com esta qualidade JPEG (1-95; implica --compacto)")
+    p_render.add_argument("--dpi-imagens", type=int, metavar="DPI",
+                          help="Reduz as fotos para esta resolução (implica --compacto)")
+    p_render.add_argument("-j", "--trabalhadores", type=int, default=None,
+                          help="Renderiza em paralelo com N processos (requer pypdf)")
+    p_render.set_defaults(func=_cmd_render)
+
+    p_modelo = sub.add_parser("modelo", help="Gera a planilha modelo de um tipo de produto")
+    p_modelo.add_argument("--tipo", help="Tipo de produto (padrão: o primeiro cadastrado)")
+    p_modelo.add_argument("-o", "--saida", default="modelo.xlsx", help="Planilha de saída")
+    p_modelo.set_defaults(func=_cmd_modelo)
+
+    p_servir = sub.add_parser("servir", help="Atende pedidos de etiquetas (PDF/PNG) por HTTP local")
+    p_servir.add_argument("--host", default="127.0.0.1", help="Endereço de escuta (padrão: só esta máquina)")
+    p_servir.add_argument("--porta", type=int, default=None, help="Porta TCP (padrão: 8765)")
+    p_servir.add_argument("--logo", default="", help="Imagem do logo da empresa")
+    p_servir.add_argument("--imagens", metavar="PASTA",
+                          help="Pasta das fotos; o campo 'imagem' dos pedidos é relativo a ela (sem isso, é recusado)")
+    p_servir.add_argument("--folha", choices=FOLHAS_CLI, default="a4-4", help="Folha/rolo dos PDFs gerados")
+    p_servir.add_argument("-j", "--trabalhadores", type=int, default=2,
+                          help="Renderizações simultâneas")
+    p_servir.set_defaults(func=_cmd_servir)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _criar_parser().parse_args(argv)
+    configurar_logging()
+    if not args.comando:
+        from .interface import iniciar
+        iniciar(args.medir_partida)
+        return 0
+    try:
+        return args.func(args)
+    except Exception as e:
+        logger.error(f"Falha no comando '{args.comando}': {e}", exc_info=True)
+        return 1
+    finally:
+        registrar_resumo(args.comando)
@@ -0,0 +1,160 @@
+"""Arquivos de dados em uma pasta compartilhada por vários computadores.
+
+Quem grava pega uma trava consultiva em `<arquivo>.lock` (fcntl no Linux/macOS,
+msvcrt no Windows) e troca o arquivo de uma vez: grava um temporário na mesma
+pasta e faz `os.replace`. Quem lê não trava: cada versão do arquivo é imutável
+depois da troca, então a leitura sempre pega uma versão inteira, a antiga ou a
+nova, sem esperar por ninguém.
+
+Compartilhamentos de rede que não suportam travas continuam funcionando só com a
+troca atômica (sem proteção contra duas gravações simultâneas); isso é avisado
+uma vez no log.
+"""
+import os
+import sys
+import json
+import time
+import errno
+import logging
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Set
+
+logger = logging.getLogger("FortunneApp")
+
+TEMPO_ESPERA_TRAVA_S = 15.0
+INTERVALO_TENTATIVA_S = 0.05
+TENTATIVAS_SUBSTITUIR = 20
+# Erros de trava já pega por outro processo; os demais indicam que o sistema de arquivos não suporta
+_OCUPADO = {errno.EACCES, errno.EAGAIN, errno.EWOULDBLOCK, errno.EDEADLK}
+SISTEMAS_DE_REDE = {'cifs', 'smb3', 'smbfs', 'nfs', 'nfs4', '9p', 'fuse.sshfs', 'afpfs', 'davfs'}
+
+_sem_suporte_avisado: Set[str] = set()
+
+if sys.platform == 'win32':
+    import msvcrt
+
+    def _travar(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+
+    def _destravar(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _travar(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def _destravar(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class TravaOcupada(TimeoutError):
+    """Outra instância ficou com a trava do arquivo além do tempo de espera"""
+
+
+@contextmanager
+def trava(caminho: str, espera_s: float = TEMPO_ESPERA_TRAVA_S):
+    """Trava exclusiva de gravação de `caminho`, entre processos e computadores.
+
+    Não é reentrante: não abra a trava do mesmo arquivo duas vezes aninhadas.
+    """
+    f = open(caminho + '.lock', 'a+b')
+    travado = False
+    try:
+        limite = time.monotonic() + espera_s
+        while not travado:
+            try:
+                _travar(f)
+                travado = True
+            except OSError as e:
+                if e.errno not in _OCUPADO:
+                    _avisar_sem_suporte(caminho, e)
+                    break
+                if time.monotonic() >= limite:
+                    raise TravaOcupada(f"{caminho} está sendo gravado por outra instância") from e
+                time.sleep(INTERVALO_TENTATIVA_S)
+        yield
+    finally:
+        if travado:
+            try:
+                _destravar(f)
+            except OSError:
+                pass
+        f.close()
+
+
+def _avisar_sem_suporte(caminho: str, erro: OSError):
+    pasta = os.path.dirname(os.path.abspath(caminho))
+    if pasta in _sem_suporte_avisado: return
+    _sem_suporte_avisado.add(pasta)
+    logger.warning(f"Travas de arquivo indisponíveis em {pasta} ({erro}); gravando sem trava")
+
+
+def substituir(origem: str, destino: str):
+    """`os.replace` com novas tentativas: no Windows falha enquanto outro processo lê o destino"""
+    for tentativa in range(TENTATIVAS_SUBSTITUIR):
+        try:
+            os.replace(origem, destino)
+            return
+        except PermissionError:
+            if tentativa == TENTATIVAS_SUBSTITUIR - 1: raise
+            time.sleep(INTERVALO_TENTATIVA_S)
+
+
+def gravar_atomico(caminho: str, conteudo: bytes):
+    """Grava em um temporário da mesma pasta, sincroniza e troca pelo arquivo final"""
+    pasta = os.path.dirname(os.path.abspath(caminho))
+    fd, temporario = tempfile.mkstemp(prefix=os.path.basename(caminho) + '.', suffix='.tmp', dir=pasta)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(conteudo)
+            f.flush()
+            os.fsync(f.fileno())
+        substituir(temporario, caminho)
+    except BaseException:
+        try:
+            os.remove(temporario)
+        except OSError:
+            pass
+        raise
+
+
+def gravar_json_atomico(caminho: str, dados: Any):
+    gravar_atomico(caminho, json.dumps(dados, indent=4, ensure_ascii=False).encode('utf-8'))
+
+
+def sincronizar_arquivo(caminho: str):
+    """fsync de um arquivo pelo caminho (ignora se ele não existe mais)"""
+    try:
+        fd = os.open(caminho, os.O_WRONLY | os.O_APPEND)  # sem O_CREAT: não recria o arquivo
+    except FileNotFoundError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def em_rede(caminho: str) -> bool:
+    """True se o arquivo fica em um compartilhamento de rede (onde o WAL do SQLite não funciona)"""
+    caminho = os.path.abspath(caminho)
+    if sys.platform == 'win32':
+        if caminho.startswith('\\\\'): return True
+        import ctypes
+        DRIVE_REMOTE = 4
+        return ctypes.windll.kernel32.GetDriveTypeW(os.path.splitdrive(caminho)[0] + '\\') == DRIVE_REMOTE
+    try:
+        with open('/proc/mounts', encoding='utf-8') as f:
+            montagens = [linha.split()[1:3] for linha in f if len(linha.split()) >= 3]
+    except OSError:
+        return False
+    # Ponto de montagem mais longo que contém o caminho
+    melhor, tipo = '', ''
+    for ponto, sistema in montagens:
+        ponto = ponto.replace('\\040', ' ')
+        if (caminho == ponto or caminho.startswith(ponto.rstrip('/') + '/')) and len(ponto) > len(melhor):
+            melhor, tipo = ponto, sistema
+    return tipo in SISTEMAS_DE_REDE
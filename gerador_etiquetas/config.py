@@ -0,0 +1,82 @@
+from dataclasses import dataclass, fields, replace
+
+# Mesmas unidades do reportlab (reportlab.lib.units/pagesizes), definidas aqui para
+# que importar a configuração não carregue o reportlab antes da primeira renderização
+cm = 72 / 2.54
+mm = cm * 0.1
+A4 = (210 * mm, 297 * mm)
+
+# === CONSTANTES & CONFIGURAÇÃO ===
+@dataclass
+class EtiquetaConfig:
+    LARGURA: float = 105 * mm
+    ALTURA: float = 148.5 * mm
+    MARGEM: float = 5 * mm
+    
+    # Fontes
+    FONTE_TITULO: float = 14
+    FONTE_SUBTITULO: float = 9
+    FONTE_SPECS: float = 8
+    FONTE_TAMANHOS: float = 8
+    
+    # Cores
+    COR_FUNDO: str = '#FFFFFF'
+    COR_TEXTO: str = '#000000'
+    
+    # Boxes do meio
+    BOX_LARGURA: float = 47 * mm
+    BOX_ALTURA: float = 56 * mm
+    BOX_Y_BASE: float = 45 * mm
+    
+    # Rodapé
+    BOX_RODAPE_ALTURA: float = 28 * mm
+    BOX_RODAPE_Y: float = 12 * mm
+    
+    # Imagem
+    TITULO_Y_OFFSET: float = 12 * mm
+    IMG_MARGEM_TOPO: float = 3 * mm
+    IMG_MARGEM_BASE: float = 5 * mm
+    IMG_LARGURA_MAX: float = 85 * mm
+
+    # Escala em relação à etiqueta base (105 x 148,5 mm); usada pelas medidas fixas do layout
+    ESCALA_X: float = 1.0
+    ESCALA_Y: float = 1.0
+
+    @property
+    def escala_fonte(self) -> float:
+        return min(self.ESCALA_X, self.ESCALA_Y)
+
+    def escalada(self, largura: float, altura: float) -> "EtiquetaConfig":
+        """A mesma etiqueta redimensionada: medidas horizontais, verticais e fontes proporcionais"""
+        fx, fy = largura / self.LARGURA, altura / self.ALTURA
+        ff = min(fx, fy)
+        novos = {}
+        for campo in fields(self):
+            nome = campo.name
+            if nome in _MEDIDAS_HORIZONTAIS: novos[nome] = getattr(self, nome) * fx
+            elif nome in _MEDIDAS_VERTICAIS: novos[nome] = getattr(self, nome) * fy
+            elif nome.startswith('FONTE_'): novos[nome] = getattr(self, nome) * ff
+        novos.update(LARGURA=largura, ALTURA=altura, ESCALA_X=self.ESCALA_X * fx, ESCALA_Y=self.ESCALA_Y * fy)
+        return replace(self, **novos)
+
+
+_MEDIDAS_HORIZONTAIS = {'MARGEM', 'BOX_LARGURA', 'IMG_LARGURA_MAX'}
+_MEDIDAS_VERTICAIS = {'BOX_ALTURA', 'BOX_Y_BASE', 'BOX_RODAPE_ALTURA', 'BOX_RODAPE_Y',
+                      'TITULO_Y_OFFSET', 'IMG_MARGEM_TOPO', 'IMG_MARGEM_BASE'}
+
+DPI_IMPRESSAO = 300
+
+DEFAULT_CONFIG = {
+    "Sofá": {
+        "campos": ["Módulos", "Braços", "Almofadas", "Tecido", "Pé"],
+        "placeholders": {"Módulos": "3 Módulos", "Braços": "25cm", "Tecido": "Linho"}
+    },
+    "Mesa": {
+        "campos": ["Material", "Acabamento", "Formato", "Tampo", "Base"],
+        "placeholders": {"Material": "Madeira", "Formato": "Retangular"}
+    },
+    "Cadeira": {
+        "campos": ["Material", "Estofado", "Estrutura", "Acabamento"],
+        "placeholders": {"Material": "Madeira", "Estofado": "Tecido"}
+    }
+}
@@ -0,0 +1,234 @@
+import os
+import copy
+import json
+import sqlite3
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from datetime import datetime
+
+from .config import DEFAULT_CONFIG
+from .biblioteca import BibliotecaSQLite, chave_produto
+from .busca import IndiceBiblioteca
+from .compartilhado import gravar_json_atomico, trava
+from .historico import HistoricoAutocompletar
+from .instrumentacao import etapa
+
+logger = logging.getLogger("FortunneApp")
+
+LAYOUTS_VAZIO = {"layouts": [], "ultimo_usado": None}
+
+
+def _assinatura(*caminhos: str) -> Tuple:
+    """(mtime_ns, tamanho, inode) de cada arquivo; None para os que não existem.
+
+    Toda gravação troca o arquivo inteiro (novo inode), então a versão muda mesmo
+    que o mtime fique igual.
+    """
+    assinatura = []
+    for caminho in caminhos:
+        try:
+            st = os.stat(caminho)
+            assinatura.append((st.st_mtime_ns, st.st_size, st.st_ino))
+        except OSError:
+            assinatura.append(None)
+    return tuple(assinatura)
+
+
+# === GERENCIADOR DE ARQUIVOS E DADOS ===
+class GerenciadorDados:
+    """Acesso aos arquivos do app, com cache em memória compartilhado pelo processo.
+
+    Cada arquivo lido fica guardado junto com o mtime/tamanho; enquanto eles não
+    mudam, `carregar_*` devolve o que está em memória sem reabrir o arquivo. O
+    objeto devolvido é compartilhado e só para leitura: quem for alterá-lo faz uma
+    cópia antes (`copy.deepcopy`). Os `salvar_*` gravam no disco e atualizam o cache (write-through), e
+    edições feitas por fora são detectadas pela mudança de mtime/tamanho.
+
+    A pasta pode ser compartilhada por várias instâncias (ver `compartilhado`): as
+    gravações trocam o arquivo de uma vez, sob a trava dele, e as que alteram o
+    conteúdo atual (`salvar_layout`, `excluir_layout`) releem o arquivo já com a
+    trava, para não desfazer o que outra instância acabou de salvar.
+    """
+    ARQUIVO_CONFIG = 'produtos.json'
+    ARQUIVO_HISTORICO = 'historico.json'           # retrato compactado do histórico
+    ARQUIVO_DIARIO_HISTORICO = 'historico.jsonl'   # valores novos desde a última compactação
+    ARQUIVO_LAYOUTS = 'layouts_salvos.json'
+    ARQUIVO_DB_PRODUTOS = 'db_produtos.json'  # formato antigo, migrado para a biblioteca SQLite
+    ARQUIVO_BIBLIOTECA = 'biblioteca.sqlite3'
+
+    _biblioteca: Optional[BibliotecaSQLite] = None
+    _historico: Optional[HistoricoAutocompletar] = None
+    _cache: Dict[str, Tuple[Tuple, Any]] = {}
+    _indice: Optional[Tuple[Tuple, IndiceBiblioteca]] = None
+    _lock = threading.RLock()
+
+    # --- CACHE ---
+    @classmethod
+    def _ler_cache(cls, chave: str, assinatura: Tuple, carregar: Callable[[], Any]):
+        with cls._lock:
+            item = cls._cache.get(chave)
+            if item is None or item[0] != assinatura:
+                item = (assinatura, carregar())
+                cls._cache[chave] = item
+            return item[1]
+
+    @classmethod
+    def _ler_json(cls, caminho: str, padrao: Any):
+        def carregar():
+            try:
+                with etapa("dados.ler_json"), open(caminho, 'r', encoding='utf-8') as f: return json.load(f)
+            except (OSError, ValueError) as e:
+                logger.error(f"Erro ao ler {caminho}: {e}")
+                return copy.deepcopy(padrao)
+        return cls._ler_cache(caminho, _assinatura(caminho), carregar)
+
+    @classmethod
+    def _substituir_json(cls, caminho: str, dados: Any):
+        with etapa("dados.gravar_json"):
+            gravar_json_atomico(caminho, dados)
+        cls._cache[caminho] = (_assinatura(caminho), copy.deepcopy(dados))
+
+    @classmethod
+    def _gravar_json(cls, caminho: str, dados: Any):
+        with cls._lock, trava(caminho):
+            cls._substituir_json(caminho, dados)
+
+    @classmethod
+    def _atualizar_json(cls, caminho: str, padrao: Any, alterar: Callable[[Any], None]):
+        """Lê a versão atual, aplica `alterar` e grava, tudo sob a trava do arquivo"""
+        with cls._lock, trava(caminho):
+            dados = copy.deepcopy(cls._ler_json(caminho, padrao) if os.path.exists(caminho) else padrao)
+            alterar(dados)
+            cls._substituir_json(caminho, dados)
+
+    @classmethod
+    def limpar_cache(cls):
+        with cls._lock:
+            cls._cache.clear()
+            cls._indice = None
+
+    @classmethod
+    def fechar(cls):
+        """Fecha a biblioteca e o histórico abertos e limpa o cache (ex.: ao trocar de pasta de dados)"""
+        with cls._lock:
+            if cls._biblioteca is not None:
+                cls._biblioteca.fechar()
+                cls._biblioteca = None
+            if cls._historico is not None:
+                cls._historico.fechar()
+                cls._historico = None
+            cls.limpar_cache()
+
+    # --- ARQUIVOS JSON ---
+    @classmethod
+    def carregar_config(cls) -> Dict:
+        if not os.path.exists(cls.ARQUIVO_CONFIG):
+            cls.salvar_config(DEFAULT_CONFIG)
+            return copy.deepcopy(DEFAULT_CONFIG)
+        return cls._ler_json(cls.ARQUIVO_CONFIG, DEFAULT_CONFIG)
+
+    @classmethod
+    def salvar_config(cls, dados: Dict):
+        cls._gravar_json(cls.ARQUIVO_CONFIG, dados)
+
+    # --- HISTÓRICO DO AUTOCOMPLETAR ---
+    @classmethod
+    def historico(cls) -> HistoricoAutocompletar:
+        """Histórico em memória, montado do retrato + diário na primeira chamada"""
+        with cls._lock:
+            h = cls._historico
+            if h is None or (h.arquivo_retrato, h.arquivo_diario) != (cls.ARQUIVO_HISTORICO, cls.ARQUIVO_DIARIO_HISTORICO):
+                if h is not None: h.fechar()
+                cls._historico = HistoricoAutocompletar(cls.ARQUIVO_HISTORICO, cls.ARQUIVO_DIARIO_HISTORICO)
+            return cls._historico
+
+    @classmethod
+    def carregar_historico(cls) -> Dict:
+        return cls.historico().valores()
+
+    @classmethod
+    def salvar_historico(cls, novo_dado: Dict):
+        """Só acrescenta ao diário os valores novos; sem limite de valores por campo"""
+        cls.historico().registrar(novo_dado)
+
+    @classmethod
+    def carregar_layouts(cls) -> Dict:
+        if not os.path.exists(cls.ARQUIVO_LAYOUTS): return copy.deepcopy(LAYOUTS_VAZIO)
+        return cls._ler_json(cls.ARQUIVO_LAYOUTS, LAYOUTS_VAZIO)
+
+    @classmethod
+    def salvar_layout(cls, nome: str, posicoes: List[Dict]):
+        def alterar(data):
+            data["layouts"] = [l for l in data["layouts"] if l["nome"] != nome]
+            data["layouts"].append({
+                "nome": nome,
+                "posicoes": posicoes,
+                "data_criacao": datetime.now().strftime("%Y-%m-%d %H:%M")
+            })
+            data["layouts"] = data["layouts"][-10:]
+        cls._atualizar_json(cls.ARQUIVO_LAYOUTS, LAYOUTS_VAZIO, alterar)
+
+    @classmethod
+    def excluir_layout(cls, nome: str):
+        def alterar(data):
+            data["layouts"] = [l for l in data["layouts"] if l["nome"] != nome]
+        cls._atualizar_json(cls.ARQUIVO_LAYOUTS, LAYOUTS_VAZIO, alterar)
+
+    # --- BIBLIOTECA DE PRODUTOS ---
+    @classmethod
+    def biblioteca(cls) -> BibliotecaSQLite:
+        """Biblioteca SQLite; na primeira abertura importa o db_produtos.json antigo"""
+        with cls._lock:
+            if cls._biblioteca is None or cls._biblioteca.caminho != cls.ARQUIVO_BIBLIOTECA:
+                cls._biblioteca = BibliotecaSQLite(cls.ARQUIVO_BIBLIOTECA)
+                if os.path.exists(cls.ARQUIVO_DB_PRODUTOS) and not cls._biblioteca.obter_meta('json_migrado'):
+                    cls._biblioteca.migrar_json(cls.ARQUIVO_DB_PRODUTOS)
+            return cls._biblioteca
+
+    @classmethod
+    def _assinatura_biblioteca(cls) -> Tuple:
+        # Em modo WAL os commits vão primeiro para o arquivo -wal
+        return _assinatura(cls.ARQUIVO_BIBLIOTECA, cls.ARQUIVO_BIBLIOTECA + '-wal')
+
+    @classmethod
+    def carregar_db_produtos(cls) -> Dict:
+        try:
+            biblioteca = cls.biblioteca()
+            def carregar():
+                with etapa("dados.carregar_biblioteca"): return biblioteca.carregar_tudo()
+            return cls._ler_cache(biblioteca.caminho, cls._assinatura_biblioteca(), carregar)
+        except (sqlite3.Error, OSError, ValueError) as e:
+            logger.error(f"Erro ao carregar a biblioteca de produtos: {e}")
+            return {}
+
+    @classmethod
+    def salvar_produto_db(cls, dados: Dict):
+        with cls._lock, etapa("dados.salvar_produto"):
+            biblioteca = cls.biblioteca()
+            antes = cls._assinatura_biblioteca()
+            biblioteca.salvar_produto(dados)
+            item = cls._cache.get(biblioteca.caminho)
+            # Só reaproveita o cache se ninguém mais mexeu no banco desde a última leitura
+            if item is None or item[0] != antes:
+                cls._cache.pop(biblioteca.caminho, None)
+                return
+            # Cópia de só o que muda: o dicionário anterior pode estar com quem o leu
+            fornecedor, nome_produto = chave_produto(dados)
+            db = dict(item[1])
+            db[fornecedor] = dict(db.get(fornecedor, {}))
+            db[fornecedor][nome_produto] = biblioteca.carregar_produto(fornecedor, nome_produto)
+            cls._cache[biblioteca.caminho] = (cls._assinatura_biblioteca(), db)
+
+    @classmethod
+    def indice_biblioteca(cls) -> IndiceBiblioteca:
+        """Índice de busca da biblioteca, refeito só quando o banco muda.
+
+        O índice é compartilhado: copie os dados de um produto antes de alterá-los.
+        """
+        with cls._lock:
+            cls.biblioteca()
+            assinatura = (cls.ARQUIVO_BIBLIOTECA, cls._assinatura_biblioteca())
+            if cls._indice is None or cls._indice[0] != assinatura:
+                cls._indice = (assinatura, IndiceBiblioteca(cls.carregar_db_produtos()))
+            return cls._indice[1]
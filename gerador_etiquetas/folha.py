@@ -0,0 +1,74 @@
+"""Folhas e rolos: quantas etiquetas cabem na página e onde cada uma fica.
+
+A grade sai do tamanho da página, do tamanho da etiqueta, das margens e dos
+espaços entre etiquetas. A etiqueta é desenhada com `EtiquetaConfig.escalada`
+para o tamanho da folha escolhida, então caixas e fontes acompanham.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .config import A4, EtiquetaConfig, mm
+
+
+def _cabem(total: float, tamanho: float, margem: float, espaco: float) -> int:
+    # Tolerância para medidas que fecham exatamente a página (ex.: 2 x 105 mm no A4)
+    return max(0, int((total - 2 * margem + espaco + 1e-6) // (tamanho + espaco)))
+
+
+@dataclass(frozen=True)
+class LayoutFolha:
+    nome: str
+    pagina: Tuple[float, float]              # (largura, altura) em pontos
+    etiqueta: Tuple[float, float]
+    margem: Tuple[float, float] = (0, 0)     # (lateral, superior/inferior)
+    espaco: Tuple[float, float] = (0, 0)     # (entre colunas, entre linhas)
+
+    def __post_init__(self):
+        if self.por_folha == 0:
+            raise ValueError(f"A etiqueta não cabe na página do layout '{self.nome}'")
+
+    @property
+    def colunas(self) -> int:
+        return _cabem(self.pagina[0], self.etiqueta[0], self.margem[0], self.espaco[0])
+
+    @property
+    def linhas(self) -> int:
+        return _cabem(self.pagina[1], self.etiqueta[1], self.margem[1], self.espaco[1])
+
+    @property
+    def por_folha(self) -> int:
+        return self.colunas * self.linhas
+
+    def posicoes(self) -> List[Tuple[float, float]]:
+        """Cantos inferiores esquerdos de cada posição, em ordem de leitura (de cima para baixo)"""
+        (_, alt), (larg_e, alt_e) = self.pagina, self.etiqueta
+        (mx, my), (ex, ey) = self.margem, self.espaco
+        return [(mx + c * (larg_e + ex), alt - my - alt_e - l * (alt_e + ey))
+                for l in range(self.linhas) for c in range(self.colunas)]
+
+    def descricao_posicao(self, posicao: int) -> str:
+        linha, coluna = divmod(posicao, self.colunas)
+        return f"Linha {linha + 1}, Coluna {coluna + 1}"
+
+    def config_etiqueta(self, base: Optional[EtiquetaConfig] = None) -> EtiquetaConfig:
+        """Configuração da etiqueta (padrão ou `base`) redimensionada para esta folha"""
+        base = base or EtiquetaConfig()
+        if (base.LARGURA, base.ALTURA) == self.etiqueta: return base
+        return base.escalada(*self.etiqueta)
+
+
+FOLHAS: Dict[str, LayoutFolha] = {
+    'a4-4': LayoutFolha("A4 - 4 por folha (105 x 148,5 mm)", A4, (105 * mm, 148.5 * mm)),
+    'a4-6': LayoutFolha("A4 - 6 por folha (105 x 99 mm)", A4, (105 * mm, 99 * mm)),
+    'a4-8': LayoutFolha("A4 - 8 por folha (105 x 74,25 mm)", A4, (105 * mm, 74.25 * mm)),
+    'rolo-100x150': LayoutFolha("Rolo térmico 100 x 150 mm", (100 * mm, 150 * mm), (100 * mm, 150 * mm)),
+}
+FOLHA_PADRAO = FOLHAS['a4-4']
+
+
+def folha_por_nome(nome: str) -> LayoutFolha:
+    """Layout pela chave (`a4-6`) ou pelo nome exibido na interface"""
+    if nome in FOLHAS: return FOLHAS[nome]
+    for folha in FOLHAS.values():
+        if folha.nome == nome: return folha
+    raise ValueError(f"Layout de folha desconhecido: {nome!r}")
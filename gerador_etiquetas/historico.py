@@ -0,0 +1,291 @@
+"""Histórico do autocompletar em diário só de acréscimo.
+
+Cada uso de um valor vira uma linha JSON no fim de `historico.jsonl`; salvar não
+relê nem regrava nada, então o custo não cresce com o tamanho do histórico (que
+não tem limite por campo). O estado completo fica em memória, um `IndicePrefixos`
+por campo, montado na abertura a partir do retrato compactado (`historico.json`)
+e das linhas do diário. No retrato, cada campo é uma lista do uso mais antigo ao
+mais recente, de `[valor, usos]` ou só `valor` (formato antigo, um uso).
+
+Quando o diário passa de `LIMITE_LINHAS_DIARIO`, ele só é renomeado para
+`historico.jsonl.compactando.<id>` (o próximo uso cria um diário novo); uma thread
+monta o retrato a partir do disco (retrato + diários renomeados) e o grava. Uma
+queda no meio disso não perde nada: os diários renomeados só são apagados depois
+do retrato gravado, e os que sobram de uma queda entram na compactação seguinte
+(se a queda for entre os dois passos, os usos contam duas vezes, o que só mexe na
+ordem das sugestões).
+
+Várias instâncias podem dividir o mesmo diário (pasta compartilhada): acréscimos e
+compactação acontecem sob a trava do diário, e antes de acrescentar cada instância
+lê as linhas que as outras gravaram. Cada diário começa com um cabeçalho com um
+id próprio; se o id mudou, outra instância compactou e o estado é remontado.
+"""
+import os
+import glob
+import json
+import time
+import itertools
+import uuid
+import atexit
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .busca import IndicePrefixos
+from .compartilhado import gravar_json_atomico, sincronizar_arquivo, substituir, trava
+from .instrumentacao import etapa
+
+logger = logging.getLogger("FortunneApp")
+
+LIMITE_LINHAS_DIARIO = 500
+INTERVALO_FSYNC_S = 1.0
+SUFIXO_COMPACTANDO = '.compactando'
+COMPACTACAO_ABANDONADA_S = 120  # diário em compactação há mais tempo que isso é sobra de uma queda
+LIMITE_SUGESTOES = 20
+
+
+def _valores_validos(novo_dado: Dict):
+    for campo, valor in novo_dado.items():
+        if valor and isinstance(valor, str) and valor.strip():
+            yield campo, valor
+
+
+def _mtime(caminho: str) -> float:
+    try:
+        return os.path.getmtime(caminho)
+    except OSError:
+        return 0.0
+
+
+def _ler_retrato(caminho: str, usar: Callable):
+    """Aplica o retrato compactado: `[valor, usos]` ou só `valor` (formato antigo, um uso)"""
+    if not os.path.exists(caminho): return
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            for campo, itens in json.load(f).items():
+                for item in itens:
+                    valor, usos = (item, 1) if isinstance(item, str) else item
+                    usar(campo, valor, usos)
+    except (OSError, ValueError, TypeError, AttributeError) as e:
+        logger.error(f"Erro ao ler {caminho}: {e}")
+
+
+def _ler_diario(caminho: str, usar: Callable, inicio: int = 0) -> Tuple[int, int]:
+    """Aplica as linhas completas a partir de `inicio`; devolve (posição final, linhas lidas)"""
+    posicao, linhas = inicio, 0
+    try:
+        with open(caminho, 'rb') as f:
+            f.seek(inicio)
+            for linha in f:
+                if not linha.endswith(b'\n'): break  # ainda sendo gravada por outra instância
+                posicao += len(linha)
+                linhas += 1
+                try:
+                    registro = json.loads(linha)
+                    usar(registro['c'], registro['v'])
+                except (ValueError, KeyError, TypeError):
+                    continue  # cabeçalho, ou linha cortada por uma queda durante a gravação
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.error(f"Erro ao ler {caminho}: {e}")
+    return posicao, linhas
+
+
+def _id_diario(caminho: str) -> Optional[str]:
+    """Id do cabeçalho do diário; None se ele não existe, '' se não tem cabeçalho"""
+    try:
+        with open(caminho, 'rb') as f:
+            primeira = f.readline()
+    except FileNotFoundError:
+        return None
+    try:
+        return str(json.loads(primeira).get('diario', ''))
+    except (ValueError, AttributeError):
+        return ''
+
+
+class HistoricoAutocompletar:
+    def __init__(self, arquivo_retrato: str, arquivo_diario: str,
+                 limite_linhas: int = LIMITE_LINHAS_DIARIO, intervalo_fsync: float = INTERVALO_FSYNC_S):
+        self.arquivo_retrato = arquivo_retrato
+        self.arquivo_diario = arquivo_diario
+        self.limite_linhas = limite_linhas
+        self.intervalo_fsync = intervalo_fsync
+        self._campos: Dict[str, IndicePrefixos] = {}
+        self._sequencia = 0
+        self._lock = threading.Lock()
+        self._id: Optional[str] = None   # diário acompanhado e até onde ele já foi lido
+        self._posicao = 0
+        self._linhas_diario = 0
+        self._fsync_agendado: Optional[threading.Timer] = None
+        self._compactacao: Optional[threading.Thread] = None
+        with self._lock, etapa("historico.abrir"):
+            self._carregar()
+        atexit.register(self.fechar)
+
+    # --- LEITURA ---
+    def __contains__(self, campo):
+        return campo in self._campos
+
+    def valores(self) -> Dict[str, List[str]]:
+        """{campo: [valores em ordem de inclusão]}"""
+        with self._lock:
+            return {campo: list(indice.usos) for campo, indice in self._campos.items()}
+
+    def sugerir(self, campo: str, prefixo: str = '', limite: int = LIMITE_SUGESTOES) -> List[str]:
+        """Valores do campo que começam com o prefixo, dos mais usados para os menos"""
+        with self._lock:
+            indice = self._campos.get(campo)
+            return indice.sugerir(prefixo, limite) if indice else []
+
+    def atualizar(self):
+        """Lê o que as outras instâncias gravaram desde a última vez (sem esperar por elas)"""
+        with self._lock:
+            self._alcancar()
+
+    def _usar(self, campo: str, valor: str, vezes: int = 1) -> bool:
+        """Conta um uso; True se o valor é novo no campo"""
+        indice = self._campos.get(campo)
+        if indice is None: indice = self._campos[campo] = IndicePrefixos()
+        novo = valor not in indice
+        self._sequencia += 1
+        indice.usar(valor, self._sequencia, vezes)
+        return novo
+
+    def _carregar(self):
+        """Monta o estado do zero: retrato, diários em compactação e diário atual"""
+        self._campos, self._sequencia = {}, 0
+        _ler_retrato(self.arquivo_retrato, self._usar)
+        for antigo in self._compactando():
+            _ler_diario(antigo, self._usar)
+        self._id = _id_diario(self.arquivo_diario)
+        self._posicao, self._linhas_diario = _ler_diario(self.arquivo_diario, self._usar)
+
+    def _compactando(self) -> List[str]:
+        """Diários já trocados e ainda não incorporados ao retrato, do mais antigo ao mais novo"""
+        # Sem sufixo: sobra do formato anterior, com um único diário em compactação
+        return sorted(glob.glob(glob.escape(self.arquivo_diario + SUFIXO_COMPACTANDO) + '*'), key=_mtime)
+
+    def _alcancar(self):
+        """Aplica as linhas novas do diário; se ele foi trocado por outra instância, remonta tudo"""
+        atual = _id_diario(self.arquivo_diario)
+        if atual is None and self._id is None: return
+        if atual != self._id:  # inclui o diário acompanhado ter sumido (compactado por outra instância)
+            self._carregar()
+            return
+        self._posicao, linhas = _ler_diario(self.arquivo_diario, self._usar, self._posicao)
+        self._linhas_diario += linhas
+
+    # --- ESCRITA ---
+    def registrar(self, novo_dado: Dict) -> int:
+        """Conta um uso de cada valor preenchido e o acrescenta ao diário; devolve quantos eram novos"""
+        valores = list(_valores_validos(novo_dado))
+        if not valores: return 0
+        with self._lock, trava(self.arquivo_diario):
+            self._alcancar()
+            novos = sum(self._usar(campo, valor) for campo, valor in valores)
+            self._acrescentar(''.join(json.dumps({'c': campo, 'v': valor}, ensure_ascii=False) + '\n'
+                                      for campo, valor in valores).encode('utf-8'))
+            self._linhas_diario += len(valores)
+            if self._linhas_diario >= self.limite_linhas and self._compactacao is None:
+                self._iniciar_compactacao()
+            self._agendar_fsync()
+        return novos
+
+    def _acrescentar(self, conteudo: bytes):
+        """Grava no fim do diário (chamado com a trava); cria o diário com cabeçalho se preciso"""
+        with open(self.arquivo_diario, 'a+b') as f:
+            f.seek(0, os.SEEK_END)
+            tamanho = f.tell()
+            if tamanho == 0:
+                self._id = uuid.uuid4().hex
+                conteudo = json.dumps({'diario': self._id}).encode('utf-8') + b'\n' + conteudo
+            else:
+                # Completa uma última linha que ficou pela metade antes de acrescentar
+                f.seek(tamanho - 1)
+                if f.read(1) != b'\n': conteudo = b'\n' + conteudo
+            f.write(conteudo)
+        self._posicao = tamanho + len(conteudo)
+
+    def _agendar_fsync(self):
+        """Várias gravações seguidas dividem um único fsync"""
+        if self._fsync_agendado is not None: return
+        self._fsync_agendado = threading.Timer(self.intervalo_fsync, self.sincronizar)
+        self._fsync_agendado.daemon = True
+        self._fsync_agendado.start()
+
+    def sincronizar(self):
+        with self._lock:
+            self._fsync_agendado = None
+            try:
+                sincronizar_arquivo(self.arquivo_diario)
+            except OSError as e:
+                logger.error(f"Erro ao sincronizar {self.arquivo_diario}: {e}")
+
+    # --- COMPACTAÇÃO ---
+    def _iniciar_compactacao(self):
+        """Renomeia o diário e deixa o retrato para uma thread (chamado com a trava).
+
+        Aqui só acontece o rename: reler, sincronizar e gravar o retrato ficam fora
+        da trava e fora da thread que salvou (a da interface).
+        """
+        antigos = self._compactando()
+        agora = time.time()
+        if any(agora - _mtime(a) < COMPACTACAO_ABANDONADA_S for a in antigos):
+            return  # outra instância está compactando
+        novo = f"{self.arquivo_diario}{SUFIXO_COMPACTANDO}.{uuid.uuid4().hex[:12]}"
+        substituir(self.arquivo_diario, novo)
+        os.utime(novo)  # marca o início da compactação (o mtime era o do último uso)
+        self._id, self._posicao, self._linhas_diario = None, 0, 0
+        self._compactacao = threading.Thread(target=self._compactar, args=(antigos + [novo],),
+                                             name="historico-compactar", daemon=True)
+        self._compactacao.start()
+
+    def _compactar(self, diarios: List[str]):
+        """Grava o retrato montado do disco (retrato atual + `diarios`) e apaga os diários"""
+        try:
+            with etapa("historico.compactar", diarios=len(diarios)):
+                campos: Dict[str, IndicePrefixos] = {}
+                sequencia = itertools.count(1)
+                def usar(campo, valor, vezes=1):
+                    campos.setdefault(campo, IndicePrefixos()).usar(valor, next(sequencia), vezes)
+                _ler_retrato(self.arquivo_retrato, usar)
+                for diario in diarios:
+                    sincronizar_arquivo(diario)
+                    _ler_diario(diario, usar)
+                gravar_json_atomico(self.arquivo_retrato, {campo: indice.por_recencia()
+                                                           for campo, indice in campos.items()})
+                with trava(self.arquivo_diario):
+                    for diario in diarios:
+                        try:
+                            os.remove(diario)
+                        except FileNotFoundError:
+                            pass
+        except OSError as e:
+            logger.error(f"Erro ao compactar o histórico: {e}")
+        finally:
+            with self._lock:
+                self._compactacao = None
+
+    def compactar(self):
+        """Compacta agora (depois da compactação em andamento, se houver) e espera terminar"""
+        tarefa = self._compactacao
+        if tarefa is not None: tarefa.join()
+        with self._lock, trava(self.arquivo_diario):
+            if self._compactacao is None and os.path.exists(self.arquivo_diario):
+                self._iniciar_compactacao()
+            tarefa = self._compactacao
+        if tarefa is not None: tarefa.join()
+
+    def fechar(self):
+        tarefa = self._compactacao
+        if tarefa is not None: tarefa.join()
+        with self._lock:
+            if self._fsync_agendado is not None:
+                self._fsync_agendado.cancel()
+                self._fsync_agendado = None
+            try:
+                sincronizar_arquivo(self.arquivo_diario)
+            except OSError:
+                pass
@@ -0,0 +1,203 @@
+"""Pré-processamento das fotos dos produtos.
+
+Cada foto é decodificada uma única vez, tem a orientação EXIF aplicada e é reduzida
+para a resolução de impressão da área de imagem da etiqueta (a da folha em uso:
+um rolo 100x150 tem área bem maior que a etiqueta A4). O resultado fica em um
+cache em disco (LRU por data de uso), com chave = hash do conteúdo + tamanho alvo,
+e o renderizador desenha o arquivo já reduzido no lugar da foto original.
+"""
+import os
+import math
+import time
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+
+from PIL import Image, ImageOps
+
+from .config import EtiquetaConfig, DPI_IMPRESSAO
+from .instrumentacao import etapa
+
+logger = logging.getLogger("FortunneApp")
+
+DIRETORIO_CACHE = 'cache_imagens'
+LIMITE_CACHE_BYTES = 512 * 1024 * 1024
+QUALIDADE_JPEG = 90
+CARENCIA_DESPEJO_S = 60  # arquivos usados/criados há menos que isso não são despejados
+
+
+def tamanho_alvo(cfg: EtiquetaConfig, dpi: int = DPI_IMPRESSAO) -> Tuple[int, int]:
+    """Tamanho em pixels da área de imagem da etiqueta na resolução de impressão"""
+    altura_pt = (cfg.ALTURA - cfg.TITULO_Y_OFFSET - cfg.IMG_MARGEM_TOPO) - \
+                (cfg.BOX_Y_BASE + cfg.BOX_ALTURA + cfg.IMG_MARGEM_BASE)
+    return (math.ceil(cfg.IMG_LARGURA_MAX / 72 * dpi), math.ceil(altura_pt / 72 * dpi))
+
+
+def _hash_arquivo(caminho: str) -> str:
+    h = hashlib.sha1()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+class CacheImagens:
+    def __init__(self, diretorio: str = DIRETORIO_CACHE, alvo: Optional[Tuple[int, int]] = None,
+                 limite_bytes: int = LIMITE_CACHE_BYTES, trabalhadores: int = 4,
+                 qualidade: int = QUALIDADE_JPEG):
+        self.diretorio = diretorio
+        self.alvo = alvo or tamanho_alvo(EtiquetaConfig())
+        self.qualidade = qualidade
+        self.limite_bytes = limite_bytes
+        self.trabalhadores = trabalhadores
+        self._hashes: Dict[str, Tuple[int, int, str]] = {}
+        self._em_andamento: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._total_bytes: Optional[int] = None
+
+    def obter(self, caminho: str) -> Optional[str]:
+        """Caminho da versão reduzida da imagem, processando-a se ainda não estiver no cache"""
+        if not caminho or not os.path.exists(caminho):
+            return None
+        try:
+            destino_base = self._chave(caminho)
+        except OSError as e:
+            logger.warning(f"Imagem ilegível {caminho}: {e}")
+            return None
+
+        while True:
+            existente = self._procurar(destino_base)
+            if existente:
+                self._tocar(existente)
+                return existente
+            with self._lock:
+                evento = self._em_andamento.get(destino_base)
+                if evento is None:
+                    evento = threading.Event()
+                    self._em_andamento[destino_base] = evento
+                    dono = True
+                else:
+                    dono = False
+            if not dono:
+                evento.wait()
+                continue
+            try:
+                with etapa("imagens.reduzir"):
+                    return self._processar(caminho, destino_base)
+            except Exception as e:
+                logger.warning(f"Falha ao preparar imagem {caminho}: {e}")
+                return None
+            finally:
+                with self._lock:
+                    del self._em_andamento[destino_base]
+                evento.set()
+
+    def prefetch(self, caminhos: Iterable[str]):
+        """Agenda o processamento das imagens em segundo plano; devolve os futures"""
+        unicos = {c for c in caminhos if c}
+        if not unicos:
+            return []
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.trabalhadores, thread_name_prefix="imagens")
+        return [self._pool.submit(self.obter, c) for c in sorted(unicos)]
+
+    def _chave(self, caminho: str) -> str:
+        st = os.stat(caminho)
+        memo = self._hashes.get(caminho)
+        if memo and memo[0] == st.st_mtime_ns and memo[1] == st.st_size:
+            digest = memo[2]
+        else:
+            digest = _hash_arquivo(caminho)
+            self._hashes[caminho] = (st.st_mtime_ns, st.st_size, digest)
+        largura, altura = self.alvo
+        sufixo = "" if self.qualidade == QUALIDADE_JPEG else f"_q{self.qualidade}"
+        return os.path.join(self.diretorio, f"{digest}_{largura}x{altura}{sufixo}")
+
+    def _procurar(self, destino_base: str) -> Optional[str]:
+        for ext in ('.jpg', '.png'):
+            if os.path.exists(destino_base + ext):
+                return destino_base + ext
+        return None
+
+    def _tocar(self, caminho: str):
+        try:
+            os.utime(caminho)
+        except OSError:
+            pass
+
+    def _processar(self, caminho: str, destino_base: str) -> str:
+        with Image.open(caminho) as original:
+            img = ImageOps.exif_transpose(original)
+            img.thumbnail(self.alvo, Image.Resampling.LANCZOS)
+            tem_alpha = img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info)
+
+            os.makedirs(self.diretorio, exist_ok=True)
+            destino = destino_base + ('.png' if tem_alpha else '.jpg')
+            temporario = f"{destino}.{os.getpid()}.{threading.get_ident()}.tmp"
+            if tem_alpha:
+                img.save(temporario, 'PNG', optimize=True)
+            else:
+                img.convert('RGB').save(temporario, 'JPEG', quality=self.qualidade, optimize=True)
+        os.replace(temporario, destino)
+        self._registrar(os.path.getsize(destino))
+        return destino
+
+    def _registrar(self, novos_bytes: int):
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(e.stat().st_size for e in os.scandir(self.diretorio) if e.is_file())
+            else:
+                self._total_bytes += novos_bytes
+            if self._total_bytes > self.limite_bytes:
+                self._despejar()
+
+    def _despejar(self):
+        """Remove os arquivos menos usados até o cache voltar a 90% do limite.
+
+        A pasta é compartilhada por processos: os recentes (um `.tmp` ainda sendo
+        gravado, ou um arquivo que `obter()` acabou de devolver a um renderizador
+        que ainda não o abriu) ficam, mesmo que o cache passe do limite por um tempo.
+        """
+        entradas = sorted((e for e in os.scandir(self.diretorio) if e.is_file()), key=lambda e: e.stat().st_mtime)
+        total = sum(e.stat().st_size for e in entradas)
+        recente = time.time() - CARENCIA_DESPEJO_S
+        for e in entradas:
+            if total <= self.limite_bytes * 0.9: break
+            if e.stat().st_mtime >= recente: break  # em ordem de uso: daqui em diante, todos recentes
+            try:
+                tamanho = e.stat().st_size
+                os.remove(e.path)
+                total -= tamanho
+            except OSError:
+                pass
+        self._total_bytes = total
+
+
+_caches: Dict[Tuple, CacheImagens] = {}
+_lock_caches = threading.Lock()
+
+
+def cache_compartilhado(diretorio: str = DIRETORIO_CACHE, alvo: Optional[Tuple[int, int]] = None,
+                        qualidade: int = QUALIDADE_JPEG) -> CacheImagens:
+    """Um cache por (pasta, tamanho alvo, qualidade), compartilhado pelo processo"""
+    alvo = tuple(alvo or tamanho_alvo(EtiquetaConfig()))
+    with _lock_caches:
+        cache = _caches.get((diretorio, alvo, qualidade))
+        if cache is None:
+            cache = _caches[diretorio, alvo, qualidade] = CacheImagens(diretorio, alvo, qualidade=qualidade)
+        return cache
+
+
+def cache_padrao(cfg: Optional[EtiquetaConfig] = None) -> CacheImagens:
+    """Cache das fotos na resolução de impressão da área de imagem de `cfg` (padrão: etiqueta A4)"""
+    return cache_compartilhado(alvo=tamanho_alvo(cfg or EtiquetaConfig()))
+
+
+def cache_reduzido(dpi: int = DPI_IMPRESSAO, qualidade: int = QUALIDADE_JPEG,
+                   cfg: Optional[EtiquetaConfig] = None) -> CacheImagens:
+    """Cache com as fotos em outra resolução/qualidade (mesma pasta, outra chave)"""
+    return cache_compartilhado(alvo=tamanho_alvo(cfg or EtiquetaConfig(), dpi), qualidade=qualidade)
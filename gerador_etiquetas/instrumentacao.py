@@ -0,0 +1,197 @@
+"""Tempos por etapa e log estruturado sem bloquear quem escreve.
+
+- `etapa("nome")`: context manager que mede um trecho e acumula a duração no
+  registro global; `resumo_etapas()` devolve total e percentis de cada etapa.
+- `configurar_logging`: os registros vão para uma fila (`QueueHandler`) e uma
+  thread própria (`QueueListener`) os grava no console e em um arquivo JSON-lines
+  com rotação, então a thread da interface/renderização nunca espera pelo disco.
+
+    with etapa("planilha.ler"):
+        lista = ler_planilha(caminho, campos)
+    ...
+    registrar_resumo("render")  # loga o resumo da execução e zera o registro
+"""
+import json
+import math
+import time
+import queue
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, List, Optional
+
+logger = logging.getLogger("FortunneApp")
+
+ARQUIVO_LOG = 'app.jsonl'
+TAMANHO_MAX_LOG = 5 * 2**20
+BACKUPS_LOG = 3
+
+# Atributos que todo LogRecord tem; o resto veio de `extra=` e vai para o JSON
+_ATRIBUTOS_PADRAO = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+# === TEMPOS POR ETAPA ===
+class RegistroEtapas:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._duracoes: Dict[str, List[float]] = {}
+
+    def registrar(self, nome: str, segundos: float):
+        with self._lock:
+            self._duracoes.setdefault(nome, []).append(segundos)
+
+    def limpar(self):
+        with self._lock:
+            self._duracoes.clear()
+
+    def extrair(self) -> Dict[str, List[float]]:
+        """Durações medidas até aqui, zerando o registro (para mandar a outro processo)"""
+        with self._lock:
+            duracoes, self._duracoes = self._duracoes, {}
+        return duracoes
+
+    def incorporar(self, duracoes: Dict[str, List[float]]):
+        """Junta durações medidas em outro processo (vindas de `extrair`)"""
+        with self._lock:
+            for nome, valores in duracoes.items():
+                self._duracoes.setdefault(nome, []).extend(valores)
+
+    def resumo(self) -> Dict[str, Dict[str, float]]:
+        """{etapa: {n, total_ms, media_ms, p50_ms, p90_ms, p99_ms, max_ms}}, da etapa mais cara para a mais barata"""
+        with self._lock:
+            duracoes = {nome: sorted(valores) for nome, valores in self._duracoes.items()}
+        resumo = {}
+        for nome, valores in sorted(duracoes.items(), key=lambda item: -sum(item[1])):
+            total = sum(valores)
+            resumo[nome] = {
+                "n": len(valores),
+                "total_ms": round(total * 1000, 3),
+                "media_ms": round(total * 1000 / len(valores), 3),
+                "p50_ms": round(_percentil(valores, 50) * 1000, 3),
+                "p90_ms": round(_percentil(valores, 90) * 1000, 3),
+                "p99_ms": round(_percentil(valores, 99) * 1000, 3),
+                "max_ms": round(valores[-1] * 1000, 3),
+            }
+        return resumo
+
+
+def _percentil(ordenados: List[float], p: float) -> float:
+    """Percentil pelo método nearest-rank (lista já ordenada, não vazia)"""
+    return ordenados[max(0, math.ceil(p / 100 * len(ordenados)) - 1)]
+
+
+registro = RegistroEtapas()
+
+
+@contextmanager
+def etapa(nome: str, **campos):
+    """Mede o bloco; com o log em DEBUG, também registra cada ocorrência"""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        duracao = time.perf_counter() - inicio
+        registro.registrar(nome, duracao)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"{nome}: {duracao * 1000:.2f} ms",
+                         extra={"etapa": nome, "duracao_ms": round(duracao * 1000, 3), **campos})
+
+
+def resumo_etapas() -> Dict[str, Dict[str, float]]:
+    return registro.resumo()
+
+
+def registrar_resumo(execucao: str, limpar: bool = True) -> Dict[str, Dict[str, float]]:
+    """Loga o resumo das etapas medidas desde o último resumo (e zera o registro)"""
+    resumo = registro.resumo()
+    if limpar: registro.limpar()
+    if not resumo: return resumo
+    linhas = [f"{nome}: n={r['n']} total={r['total_ms']:.1f}ms p50={r['p50_ms']:.2f} "
+              f"p90={r['p90_ms']:.2f} p99={r['p99_ms']:.2f} max={r['max_ms']:.2f}"
+              for nome, r in resumo.items()]
+    logger.info(f"Resumo de etapas ({execucao}):\n  " + "\n  ".join(linhas),
+                extra={"execucao": execucao, "etapas": resumo})
+    return resumo
+
+
+# === LOG ESTRUTURADO ===
+class FormatadorJSON(logging.Formatter):
+    """Um objeto JSON por linha, com os campos passados em `extra=`"""
+    def format(self, record: logging.LogRecord) -> str:
+        dados = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        for chave, valor in vars(record).items():
+            if chave not in _ATRIBUTOS_PADRAO and chave not in dados:
+                dados[chave] = valor
+        if record.exc_info:
+            dados["excecao"] = self.formatException(record.exc_info)
+        return json.dumps(dados, ensure_ascii=False, default=str)
+
+
+_ouvinte: Optional[QueueListener] = None
+
+
+def configurar_logging(arquivo: str = ARQUIVO_LOG, nivel: int = logging.INFO):
+    """Configura o log da aplicação; chamado pelos pontos de entrada, nunca na importação"""
+    global _ouvinte
+    if _ouvinte is not None: return
+
+    arquivo_handler = RotatingFileHandler(arquivo, maxBytes=TAMANHO_MAX_LOG, backupCount=BACKUPS_LOG,
+                                          encoding='utf-8', delay=True)
+    arquivo_handler.setFormatter(FormatadorJSON())
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+
+    fila: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    _ouvinte = QueueListener(fila, arquivo_handler, console, respect_handler_level=True)
+    _ouvinte.start()
+    atexit.register(encerrar_logging)
+
+    raiz = logging.getLogger()
+    raiz.setLevel(nivel)
+    raiz.addHandler(_HandlerFila(fila))
+
+
+def iniciar_processo_trabalhador(nivel: int = logging.INFO):
+    """Inicializador dos processos trabalhadores: registro de etapas e log próprios.
+
+    Com fork, o filho herda as etapas já medidas pelo pai e o `_HandlerFila`, cuja
+    fila ninguém esvazia no filho; os dois são descartados e o log vai direto para
+    o console (stderr). Com spawn, só configura o console.
+    """
+    global _ouvinte
+    _ouvinte = None
+    registro.limpar()
+    raiz = logging.getLogger()
+    for handler in list(raiz.handlers):
+        raiz.removeHandler(handler)
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    raiz.addHandler(console)
+    raiz.setLevel(nivel)
+
+
+def encerrar_logging():
+    """Esvazia a fila e para a thread de escrita do log"""
+    global _ouvinte
+    if _ouvinte is None: return
+    _ouvinte.stop()
+    _ouvinte = None
+
+
+class _HandlerFila(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # O QueueHandler padrão formata a mensagem e descarta exc_info; aqui o registro
+        # segue inteiro (só com a mensagem já resolvida) para os formatadores do outro lado
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        return record
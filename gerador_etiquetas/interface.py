@@ -0,0 +1,1010 @@
+import tkinter as tk
+from tkinter import filedialog, messagebox, ttk, simpledialog
+from PIL import ImageTk
+import os
+import copy
+import time
+import logging
+from typing import Dict, Optional
+
+from .dados import GerenciadorDados
+from .folha import FOLHAS, FOLHA_PADRAO, folha_por_nome
+from .pdf import COMPACTACAO_ENVIO, GeradorPDF
+from .preview import MiniaturasLote, PreviewAoVivo
+from . import partida
+from .instrumentacao import registrar_resumo
+from .tarefas import Progresso, Tarefa, saida_temporaria, saidas_temporarias
+
+# planilha (pandas) e lote (canvas do reportlab) são importados só quando usados,
+# para a janela abrir sem carregá-los
+
+logger = logging.getLogger("FortunneApp")
+
+ATRASO_PREVIEW_MS = 300
+ATRASO_BUSCA_MS = 150
+LIMITE_RESULTADOS_ABERTOS = 300 # acima disso os fornecedores do resultado vêm fechados
+AREA_GRADE_POSICOES = (560, 440) # espaço (px) da grade de posições na janela de configuração
+INTERVALO_PROGRESSO_MS = 100
+ATRASO_JANELA_PROGRESSO_MS = 400 # tarefas mais rápidas que isso nem abrem a janela de progresso
+LARGURA_MINIATURA = 120
+INTERVALO_MINIATURAS_MS = 60
+TIPOS_SAIDA = [("PDF", "*.pdf"), ("ZPL (impressora térmica)", "*.zpl"), ("PNG 1 bit (impressora térmica)", "*.png")]
+TECLAS_NAVEGACAO = {'Up', 'Down', 'Return', 'KP_Enter', 'Escape', 'Tab'} # não refiltram as sugestões do autocompletar
+
+# === GRADE DE MINIATURAS ===
+class GradeMiniaturas(tk.Frame):
+    """Grade rolável com a miniatura de cada etiqueta do lote.
+
+    Todas as células são desenhadas na hora (retângulo e legenda), mas só as
+    linhas visíveis pedem miniatura ao pool; as que saem da tela são canceladas
+    e as imagens longe da área visível são liberadas.
+    """
+    def __init__(self, parent, dados_lista, miniaturas: MiniaturasLote, ao_escolher=None,
+                 largura: int = LARGURA_MINIATURA):
+        super().__init__(parent)
+        self.dados_lista = dados_lista
+        self.miniaturas = miniaturas
+        self.ao_escolher = ao_escolher
+        self.largura = largura
+        cfg = miniaturas.gerador.cfg
+        self.altura = int(largura * cfg.ALTURA / cfg.LARGURA)
+        self.celula = (largura + 16, self.altura + 34)
+        self.selecionado: Optional[int] = None
+        self._colunas = 1
+        self._fotos: Dict[int, object] = {}        # índice -> PhotoImage em exibição
+        self._esperando: Dict[str, set] = {}       # chave da miniatura -> índices que a aguardam
+        self._verificacao = None
+
+        self.canvas = tk.Canvas(self, bg="#ecf0f1", highlightthickness=0)
+        self.barra = ttk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._ao_rolar)
+        self.barra.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.canvas.bind("<Configure>", self._redesenhar)
+        self.canvas.bind("<Button-1>", self._clicar)
+        self.canvas.bind("<Double-Button-1>", self._escolher)
+        self.canvas.bind("<MouseWheel>", lambda e: self.canvas.yview_scroll(int(-e.delta / 120), "units"))
+        self.canvas.bind("<Button-4>", lambda e: self.canvas.yview_scroll(-1, "units"))
+        self.canvas.bind("<Button-5>", lambda e: self.canvas.yview_scroll(1, "units"))
+        self.bind("<Destroy>", self._ao_destruir)
+
+    def _posicao(self, i):
+        linha, coluna = divmod(i, self._colunas)
+        return coluna * self.celula[0] + 8, linha * self.celula[1] + 8
+
+    def _redesenhar(self, event=None):
+        self._colunas = max(1, self.canvas.winfo_width() // self.celula[0])
+        self.canvas.delete("all")
+        self._fotos.clear()
+        for i, dados in enumerate(self.dados_lista):
+            x, y = self._posicao(i)
+            self.canvas.create_rectangle(x, y, x + self.largura, y + self.altura, fill="white",
+                                         outline="#bdc3c7", tags=(f"borda{i}",))
+            legenda = f"[{i+1}] {dados.get('Produto', '')}"
+            self.canvas.create_text(x + self.largura / 2, y + self.altura + 4, text=legenda, anchor="n",
+                                    width=self.largura, font=("Arial", 8), fill="#2c3e50")
+        linhas = -(-len(self.dados_lista) // self._colunas)
+        self.canvas.configure(scrollregion=(0, 0, self._colunas * self.celula[0], linhas * self.celula[1] + 8))
+        if self.selecionado is not None: self._marcar(self.selecionado)
+        self._pedir_visiveis()
+
+    def _ao_rolar(self, primeiro, ultimo):
+        self.barra.set(primeiro, ultimo)
+        self._pedir_visiveis()
+
+    def _visiveis(self, margem: int = 0) -> range:
+        topo, base = self.canvas.canvasy(0), self.canvas.canvasy(self.canvas.winfo_height())
+        primeira = max(0, int(topo // self.celula[1]) - margem)
+        ultima = int(base // self.celula[1]) + 1 + margem
+        return range(primeira * self._colunas, min(len(self.dados_lista), ultima * self._colunas))
+
+    def _pedir_visiveis(self):
+        visiveis = self._visiveis()
+        esperando: Dict[str, set] = {}
+        for i in visiveis:
+            if i in self._fotos: continue
+            chave, img = self.miniaturas.obter(self.dados_lista[i], self.largura)
+            if img is not None: self._mostrar(i, img)
+            else: esperando.setdefault(chave, set()).add(i)
+        self.miniaturas.cancelar(k for k in self._esperando if k not in esperando)
+        self._esperando = esperando
+        # Libera as imagens longe da área visível (o cache do pool continua com elas)
+        perto = self._visiveis(margem=3)
+        for i in [i for i in self._fotos if i not in perto]:
+            self.canvas.delete(f"mini{i}")
+            del self._fotos[i]
+        if self._esperando and self._verificacao is None:
+            self._verificacao = self.after(INTERVALO_MINIATURAS_MS, self._verificar)
+
+    def _verificar(self):
+        self._verificacao = None
+        for chave in list(self._esperando):
+            img = self.miniaturas.pronta(chave)
+            if img is not None:
+                for i in self._esperando.pop(chave): self._mostrar(i, img)
+            elif not self.miniaturas.pendente(chave):
+                del self._esperando[chave]  # falhou: fica só a legenda
+        if self._esperando: self._verificacao = self.after(INTERVALO_MINIATURAS_MS, self._verificar)
+
+    def _mostrar(self, i, img):
+        foto = ImageTk.PhotoImage(img)
+        x, y = self._posicao(i)
+        self.canvas.create_image(x + self.largura / 2, y + self.altura / 2, image=foto, tags=(f"mini{i}",))
+        self._fotos[i] = foto
+
+    def _indice_em(self, event) -> Optional[int]:
+        cx, cy = self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)
+        coluna, linha = int(cx // self.celula[0]), int(cy // self.celula[1])
+        i = linha * self._colunas + coluna
+        return i if coluna < self._colunas and 0 <= i < len(self.dados_lista) else None
+
+    def _marcar(self, i):
+        self.canvas.itemconfigure("selecao", outline="#bdc3c7", width=1)
+        self.canvas.dtag("selecao", "selecao")
+        self.canvas.addtag_withtag("selecao", f"borda{i}")
+        self.canvas.itemconfigure("selecao", outline="#27ae60", width=4)
+
+    def _clicar(self, event):
+        i = self._indice_em(event)
+        if i is None: return
+        self.selecionado = i
+        self._marcar(i)
+
+    def _escolher(self, event):
+        self._clicar(event)
+        if self.selecionado is not None and self.ao_escolher: self.ao_escolher(self.selecionado)
+
+    def _ao_destruir(self, event):
+        if event.widget is not self: return
+        if self._verificacao is not None: self.after_cancel(self._verificacao)
+        self.miniaturas.cancelar(list(self._esperando))
+
+
+# === JANELA DE CONFIGURAÇÃO DE POSIÇÕES ===
+class JanelaConfiguracaoPosicoes(tk.Toplevel):
+    def __init__(self, parent, dados_lista, gerador, logo_path, usar_img, callback_confirmar):
+        super().__init__(parent)
+        self.title("🎯 Configuração de Posições das Etiquetas")
+        self.geometry("1000x750")
+        self.resizable(False, False)
+        
+        self.dados_lista = dados_lista
+        self.gerador = gerador
+        self.folha = gerador.folha
+        self.logo_path = logo_path
+        self.usar_img = usar_img
+        self.callback = callback_confirmar
+        
+        self.mapeamento_etiquetas = {}
+        self.incluir_restantes = tk.BooleanVar(value=True)
+        self.layouts_salvos = GerenciadorDados.carregar_layouts()
+        # Miniaturas do lote, compartilhadas pelos diálogos de seleção desta janela
+        self.miniaturas = MiniaturasLote(gerador, logo_path, usar_img)
+        self.bind("<Destroy>", lambda e: self.miniaturas.encerrar() if e.widget is self else None)
+        
+        self._criar_interface()
+        
+    def _criar_interface(self):
+        header = tk.Frame(self, bg="#2c3e50", height=70)
+        header.pack(fill="x")
+        tk.Label(header, text="🎯 Configure onde cada etiqueta será impressa", 
+                font=("Arial", 16, "bold"), bg="#2c3e50", fg="white").pack(pady=20)
+        
+        main = tk.Frame(self, padx=20, pady=20, bg="#ecf0f1")
+        main.pack(fill="both", expand=True)
+        
+        left_panel = tk.Frame(main, bg="#ecf0f1")
+        left_panel.pack(side="left", fill="both", expand=True, padx=(0, 10))
+        
+        info_frame = tk.Frame(left_panel, bg="#d5dbdb", relief="ridge", bd=2, padx=15, pady=10)
+        info_frame.pack(fill="x", pady=(0, 15))
+        tk.Label(info_frame, text="Clique em cada posição e selecione qual etiqueta colocar",
+                font=("Arial", 10), bg="#d5dbdb", fg="#555").pack(anchor="w")
+        tk.Label(info_frame, text=f"Lote com {len(self.dados_lista)} etiqueta(s) - a 1ª folha segue este mapeamento",
+                font=("Arial", 9), bg="#d5dbdb", fg="#555").pack(anchor="w")
+        tk.Checkbutton(info_frame, text="✓ Completar com as demais etiquetas em novas folhas",
+                      variable=self.incluir_restantes, bg="#d5dbdb").pack(anchor="w")
+        
+        grid_frame = tk.LabelFrame(left_panel, text=f"📄 {self.folha.nome} - {self.folha.por_folha} Posições",
+                                   font=("Arial", 11, "bold"), padx=20, pady=20, bg="white")
+        grid_frame.pack(fill="both", expand=True)
+        
+        self.frames_posicao = []
+        self.labels_posicao = []
+        
+        # Cada posição mantém a proporção da etiqueta e a grade inteira cabe na área disponível
+        colunas, linhas = self.folha.colunas, self.folha.linhas
+        larg_etq, alt_etq = self.folha.etiqueta
+        escala = min(AREA_GRADE_POSICOES[0] / (colunas * larg_etq), AREA_GRADE_POSICOES[1] / (linhas * alt_etq))
+        larg_px, alt_px = int(larg_etq * escala) - 10, int(alt_etq * escala) - 10
+        compacto = alt_px < 110
+        # Miniatura da etiqueta escolhida no espaço que sobra entre o título e o botão
+        largura_mini = min(larg_px - 20, int((alt_px - 130) * larg_etq / alt_etq))
+        self.largura_miniatura_posicao = largura_mini if largura_mini >= 40 else None
+        self._posicoes_esperando: Dict[int, str] = {}
+        self._fotos_posicao: Dict[int, object] = {}
+        
+        for i in range(self.folha.por_folha):
+            row, col = divmod(i, colunas)
+            frame_pos = tk.Frame(grid_frame, relief="solid", bd=3, bg="#ecf0f1", cursor="hand2", width=larg_px, height=alt_px)
+            frame_pos.grid(row=row, column=col, padx=5, pady=5, sticky="nsew")
+            frame_pos.pack_propagate(False)
+            
+            tk.Label(frame_pos, text=f"🔲 {i+1}", font=("Arial", 10 if compacto else 14, "bold"), bg="#ecf0f1", fg="#34495e").pack(pady=(4, 0))
+            if not compacto:
+                tk.Label(frame_pos, text=self.folha.descricao_posicao(i), font=("Arial", 8), bg="#ecf0f1", fg="#7f8c8d").pack()
+            
+            label_selecionada = tk.Label(frame_pos, text="[Vazio]", font=("Arial", 8 if compacto else 9, "bold"), bg="#ecf0f1", fg="#95a5a6", wraplength=larg_px - 20)
+            label_selecionada.pack(pady=(2 if compacto else 10, 2))
+            
+            btn = tk.Button(frame_pos, text="📌 Selecionar" if compacto else "📌 Selecionar Etiqueta", command=lambda p=i: self._selecionar_etiqueta(p),
+                           bg="#3498db", fg="white", font=("Arial", 8, "bold"), cursor="hand2")
+            btn.pack(pady=(2, 4))
+            
+            self.frames_posicao.append(frame_pos)
+            self.labels_posicao.append(label_selecionada)
+        
+        for i in range(linhas): grid_frame.grid_rowconfigure(i, weight=1)
+        for i in range(colunas): grid_frame.grid_columnconfigure(i, weight=1)
+        
+        right_panel = tk.Frame(main, bg="#ecf0f1", width=300)
+        right_panel.pack(side="right", fill="y")
+        right_panel.pack_propagate(False)
+        
+        layout_frame = tk.LabelFrame(right_panel, text="💾 Layouts Salvos", font=("Arial", 10, "bold"), padx=10, pady=10)
+        layout_frame.pack(fill="both", expand=True, pady=(0, 10))
+        
+        list_frame = tk.Frame(layout_frame)
+        list_frame.pack(fill="both", expand=True, pady=5)
+        scroll_layouts = ttk.Scrollbar(list_frame)
+        scroll_layouts.pack(side="right", fill="y")
+        self.lista_layouts = tk.Listbox(list_frame, font=("Arial", 9), yscrollcommand=scroll_layouts.set, height=10)
+        self.lista_layouts.pack(side="left", fill="both", expand=True)
+        scroll_layouts.config(command=self.lista_layouts.yview)
+        
+        tk.Button(layout_frame, text="📂 Carregar", command=self._carregar_layout_selecionado, bg="#3498db", fg="white").pack(fill="x", pady=2)
+        tk.Button(layout_frame, text="💾 Salvar", command=self._salvar_layout_atual, bg="#27ae60", fg="white").pack(fill="x", pady=2)
+        tk.Button(layout_frame, text="🗑️ Excluir", command=self._excluir_layout_selecionado, bg="#e74c3c", fg="white").pack(fill="x", pady=2)
+        
+        action_frame = tk.Frame(self, bg="#ecf0f1", padx=20, pady=15)
+        action_frame.pack(fill="x", side="bottom")
+        tk.Button(action_frame, text="🔄 Limpar", command=self._limpar_mapeamento, bg="#95a5a6", fg="white").pack(side="left", padx=5)
+        tk.Button(action_frame, text="✅ GERAR PDF", command=self._confirmar, bg="#27ae60", fg="white", font=("Arial", 12, "bold"), height=2, width=18).pack(side="right", padx=5)
+        tk.Button(action_frame, text="⚡ GERAR TUDO (Automático)", command=self._confirmar_automatico, bg="#2980b9", fg="white", font=("Arial", 12, "bold"), height=2).pack(side="right", padx=5)
+        
+        self._atualizar_lista_layouts()
+
+    def _atualizar_lista_layouts(self):
+        self.lista_layouts.delete(0, tk.END)
+        for layout in self.layouts_salvos.get("layouts", []):
+            self.lista_layouts.insert(tk.END, f"{layout['nome']} ({layout['data_criacao']})")
+
+    def _selecionar_etiqueta(self, posicao):
+        dialogo = tk.Toplevel(self)
+        dialogo.title(f"Configurar Posição {posicao + 1}")
+        dialogo.geometry("750x600")
+        dialogo.transient(self)
+        dialogo.grab_set()
+        
+        abas = ttk.Notebook(dialogo)
+        abas.pack(fill="both", expand=True, padx=10, pady=10)
+        
+        tab_atual = tk.Frame(abas)
+        abas.add(tab_atual, text="📋 Lista Atual")
+        grade_atual = GradeMiniaturas(tab_atual, self.dados_lista, self.miniaturas, ao_escolher=lambda i: confirmar())
+        grade_atual.pack(fill="both", expand=True, padx=5, pady=5)
+
+        tab_db = tk.Frame(abas)
+        abas.add(tab_db, text="🗄️ Biblioteca Salva")
+
+        frame_busca = tk.Frame(tab_db)
+        frame_busca.pack(fill="x", padx=5, pady=(5, 0))
+        tk.Label(frame_busca, text="🔍 Buscar:").pack(side="left")
+        var_busca = tk.StringVar()
+        tk.Entry(frame_busca, textvariable=var_busca).pack(side="left", fill="x", expand=True, padx=5)
+        lbl_total = tk.Label(frame_busca, fg="#7f8c8d")
+        lbl_total.pack(side="right")
+
+        frame_tree = tk.Frame(tab_db)
+        frame_tree.pack(fill="both", expand=True)
+        tree = ttk.Treeview(frame_tree, columns=("Prazo",), show='tree headings')
+        tree.heading("#0", text="Fornecedor / Produto")
+        tree.heading("Prazo", text="Prazo")
+        tree.column("#0", width=400)
+        
+        scroll_db = ttk.Scrollbar(frame_tree, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=scroll_db.set)
+        tree.pack(side="left", fill="both", expand=True)
+        scroll_db.pack(side="right", fill="y")
+        
+        # Só os fornecedores entram na árvore; os produtos são inseridos ao expandir
+        indice = GerenciadorDados.indice_biblioteca()
+        mapa_temp = {}
+        pendentes = {}
+        agendado = [None]
+
+        def inserir_produtos(id_forn, ids):
+            for idx in ids:
+                produto = indice.produtos[idx]
+                id_item = tree.insert(id_forn, "end", text=produto.nome, values=(produto.dados.get("Prazo", ""),))
+                mapa_temp[id_item] = idx
+
+        def inserir_fornecedor(fornecedor, ids, aberto):
+            id_forn = tree.insert("", "end", text=f"{fornecedor} ({len(ids)})", open=aberto)
+            if aberto:
+                inserir_produtos(id_forn, ids)
+            else:
+                pendentes[id_forn] = ids
+                tree.insert(id_forn, "end", text="...") # filho provisório, só para exibir a seta
+
+        def ao_expandir(event=None):
+            id_forn = tree.focus()
+            ids = pendentes.pop(id_forn, None)
+            if ids is None: return
+            tree.delete(*tree.get_children(id_forn))
+            inserir_produtos(id_forn, ids)
+
+        def filtrar():
+            agendado[0] = None
+            tree.delete(*tree.get_children())
+            mapa_temp.clear()
+            pendentes.clear()
+            consulta = var_busca.get()
+            if not consulta.strip():
+                for fornecedor, ids in indice.por_fornecedor.items():
+                    inserir_fornecedor(fornecedor, ids, False)
+                lbl_total.config(text=f"{len(indice)} produto(s)")
+                return
+            ids = indice.buscar(consulta)
+            abertos = 0
+            for fornecedor, ids_forn in indice.agrupar(ids).items():
+                aberto = abertos + len(ids_forn) <= LIMITE_RESULTADOS_ABERTOS
+                if aberto: abertos += len(ids_forn)
+                inserir_fornecedor(fornecedor, ids_forn, aberto)
+            lbl_total.config(text=f"{len(ids)} de {len(indice)} produto(s)")
+
+        def agendar_filtro(*args):
+            if agendado[0]: dialogo.after_cancel(agendado[0])
+            agendado[0] = dialogo.after(ATRASO_BUSCA_MS, filtrar)
+
+        tree.bind("<<TreeviewOpen>>", ao_expandir)
+        var_busca.trace_add("write", agendar_filtro)
+        filtrar()
+
+        def confirmar():
+            aba = abas.index("current")
+            if aba == 0:
+                idx = grade_atual.selecionado
+                if idx is None: return
+                self.mapeamento_etiquetas[posicao] = idx
+                self._atualizar_visual_posicao(posicao, idx)
+            else:
+                sel = tree.selection()
+                if not sel: return
+                item_id = sel[0]
+                if item_id not in mapa_temp:
+                    messagebox.showwarning("Atenção", "Selecione um produto, não o fornecedor.")
+                    return
+                
+                dados_db = copy.deepcopy(indice.produtos[mapa_temp[item_id]].dados)
+                self.dados_lista.append(dados_db)
+                novo_idx = len(self.dados_lista) - 1
+                self.mapeamento_etiquetas[posicao] = novo_idx
+                self._atualizar_visual_posicao(posicao, novo_idx)
+            dialogo.destroy()
+
+        tk.Button(dialogo, text="✅ CONFIRMAR SELEÇÃO", command=confirmar,
+                  bg="#27ae60", fg="white", font=("Arial", 12, "bold"), height=2).pack(fill="x", padx=10, pady=10)
+
+    def _atualizar_visual_posicao(self, posicao, idx_etiqueta):
+        self._posicoes_esperando.pop(posicao, None)
+        self._fotos_posicao.pop(posicao, None)
+        if idx_etiqueta is not None:
+            produto = self.dados_lista[idx_etiqueta].get('Produto', 'Sem nome')
+            self.labels_posicao[posicao].config(text=f"[{idx_etiqueta + 1}]\n{produto[:30]}...", fg="#2c3e50", image="")
+            self.frames_posicao[posicao].config(bg="#d5f4e6", bd=3, relief="solid")
+            if self.largura_miniatura_posicao:
+                chave, img = self.miniaturas.obter(self.dados_lista[idx_etiqueta], self.largura_miniatura_posicao)
+                if img is not None: self._mostrar_miniatura_posicao(posicao, img)
+                else:
+                    if not self._posicoes_esperando: self.after(INTERVALO_MINIATURAS_MS, self._verificar_miniaturas_posicao)
+                    self._posicoes_esperando[posicao] = chave
+        else:
+            self.labels_posicao[posicao].config(text="[Vazio]", fg="#95a5a6", image="")
+            self.frames_posicao[posicao].config(bg="#ecf0f1", bd=3, relief="solid")
+
+    def _verificar_miniaturas_posicao(self):
+        if not self.winfo_exists(): return
+        for posicao, chave in list(self._posicoes_esperando.items()):
+            img = self.miniaturas.pronta(chave)
+            if img is not None:
+                del self._posicoes_esperando[posicao]
+                self._mostrar_miniatura_posicao(posicao, img)
+            elif not self.miniaturas.pendente(chave):
+                del self._posicoes_esperando[posicao]
+        if self._posicoes_esperando: self.after(INTERVALO_MINIATURAS_MS, self._verificar_miniaturas_posicao)
+
+    def _mostrar_miniatura_posicao(self, posicao, img):
+        foto = ImageTk.PhotoImage(img)
+        self._fotos_posicao[posicao] = foto
+        self.labels_posicao[posicao].config(image=foto, compound="top")
+
+    def _carregar_layout_selecionado(self):
+        sel = self.lista_layouts.curselection()
+        if not sel: return
+        idx = sel[0]
+        layout = self.layouts_salvos["layouts"][idx]
+        self.mapeamento_etiquetas.clear()
+        for i, config in enumerate(layout["posicoes"][:self.folha.por_folha]):
+            if config.get("ativa") and config.get("etiqueta_idx") is not None:
+                etq_idx = config["etiqueta_idx"]
+                if etq_idx < len(self.dados_lista):
+                    self.mapeamento_etiquetas[i] = etq_idx
+                    self._atualizar_visual_posicao(i, etq_idx)
+                else: self._atualizar_visual_posicao(i, None)
+            else: self._atualizar_visual_posicao(i, None)
+        messagebox.showinfo("Sucesso", f"Layout '{layout['nome']}' carregado!")
+
+    def _salvar_layout_atual(self):
+        if not self.mapeamento_etiquetas: return
+        nome = simpledialog.askstring("Salvar", "Nome do layout:", parent=self)
+        if nome:
+            posicoes_config = []
+            for i in range(self.folha.por_folha):
+                if i in self.mapeamento_etiquetas:
+                    posicoes_config.append({"ativa": True, "etiqueta_idx": self.mapeamento_etiquetas[i]})
+                else:
+                    posicoes_config.append({"ativa": False, "etiqueta_idx": None})
+            GerenciadorDados.salvar_layout(nome.strip(), posicoes_config)
+            self.layouts_salvos = GerenciadorDados.carregar_layouts()
+            self._atualizar_lista_layouts()
+
+    def _excluir_layout_selecionado(self):
+        sel = self.lista_layouts.curselection()
+        if not sel: return
+        idx = sel[0]
+        nome = self.layouts_salvos["layouts"][idx]["nome"]
+        if messagebox.askyesno("Confirmar", f"Excluir '{nome}'?"):
+            GerenciadorDados.excluir_layout(nome)
+            self.layouts_salvos = GerenciadorDados.carregar_layouts()
+            self._atualizar_lista_layouts()
+
+    def _limpar_mapeamento(self):
+        self.mapeamento_etiquetas.clear()
+        for i in range(self.folha.por_folha): self._atualizar_visual_posicao(i, None)
+
+    def _confirmar(self):
+        if not self.mapeamento_etiquetas:
+            messagebox.showwarning("Atenção", "Configure pelo menos uma posição!")
+            return
+        self.destroy()
+        self.callback(self.mapeamento_etiquetas, self.incluir_restantes.get())
+
+    def _confirmar_automatico(self):
+        """Ignora o mapeamento e distribui todo o lote em quantas folhas forem necessárias"""
+        self.destroy()
+        self.callback({}, True)
+
+# === JANELA EDITOR DE CONFIGURAÇÃO ===
+class EditorConfiguracao(tk.Toplevel):
+    def __init__(self, parent, callback_atualizar):
+        super().__init__(parent)
+        self.title("⚙️ Editor de Tipos de Produtos")
+        self.geometry("650x500")
+        self.callback = callback_atualizar
+        self.config = copy.deepcopy(GerenciadorDados.carregar_config())  # editada aqui; o cache é só leitura
+        
+        frame_esq = tk.Frame(self, bg="#ecf0f1")
+        frame_esq.pack(side="left", fill="y", padx=10, pady=10)
+        tk.Label(frame_esq, text="Tipos Cadastrados", font=("Arial", 11, "bold"), bg="#ecf0f1").pack(pady=5)
+        self.lista_tipos = tk.Listbox(frame_esq, width=25, height=20, font=("Arial", 9))
+        self.lista_tipos.pack(pady=5)
+        self.lista_tipos.bind('<<ListboxSelect>>', self._carregar_campos)
+        tk.Button(frame_esq, text="➕ Novo Tipo", command=self._adicionar_tipo, bg="#2ecc71", fg="white").pack(fill="x", pady=2)
+        tk.Button(frame_esq, text="🗑️ Excluir Tipo", command=self._remover_tipo, bg="#e74c3c", fg="white").pack(fill="x", pady=2)
+
+        self.frame_dir = tk.LabelFrame(self, text="✏️ Campos do Produto", padx=15, pady=15, font=("Arial", 10, "bold"))
+        self.frame_dir.pack(side="right", fill="both", expand=True, padx=10, pady=10)
+        self.txt_campos = tk.Text(self.frame_dir, height=18, width=35, font=("Arial", 10))
+        self.txt_campos.pack(fill="both", expand=True, pady=5)
+        tk.Button(self.frame_dir, text="💾 SALVAR ALTERAÇÕES", command=self._salvar_tudo, bg="#27ae60", fg="white", height=2).pack(fill="x", pady=10)
+        self._atualizar_lista()
+
+    def _atualizar_lista(self):
+        self.lista_tipos.delete(0, tk.END)
+        for tipo in self.config: self.lista_tipos.insert(tk.END, tipo)
+
+    def _carregar_campos(self, event):
+        sel = self.lista_tipos.curselection()
+        if not sel: return
+        tipo = self.lista_tipos.get(sel)
+        campos = self.config[tipo].get("campos", [])
+        self.txt_campos.delete("1.0", tk.END)
+        self.txt_campos.insert("1.0", "\n".join(campos))
+
+    def _adicionar_tipo(self):
+        novo = simpledialog.askstring("Novo", "Nome do tipo:")
+        if novo and novo.strip():
+            if novo in self.config: return
+            self.config[novo] = {"campos": ["Campo 1"], "placeholders": {}}
+            self._atualizar_lista()
+
+    def _remover_tipo(self):
+        sel = self.lista_tipos.curselection()
+        if sel:
+            tipo = self.lista_tipos.get(sel)
+            if messagebox.askyesno("Confirmar", f"Excluir '{tipo}'?"):
+                del self.config[tipo]
+                self._atualizar_lista()
+                self.txt_campos.delete("1.0", tk.END)
+
+    def _salvar_tudo(self):
+        sel = self.lista_tipos.curselection()
+        if sel:
+            tipo = self.lista_tipos.get(sel)
+            texto = self.txt_campos.get("1.0", tk.END).strip()
+            self.config[tipo]['campos'] = [x.strip() for x in texto.split('\n') if x.strip()]
+        GerenciadorDados.salvar_config(self.config)
+        self.callback()
+        self.destroy()
+
+# === JANELA DE PROGRESSO ===
+def _formatar_duracao(segundos: float) -> str:
+    segundos = int(round(segundos))
+    if segundos < 60: return f"{segundos} s"
+    return f"{segundos // 60} min {segundos % 60:02d} s"
+
+
+class JanelaProgresso(tk.Toplevel):
+    """Acompanha uma tarefa em segundo plano; não é modal, a janela principal continua editável"""
+    def __init__(self, parent, titulo, tarefa: Tarefa):
+        super().__init__(parent)
+        self.title(titulo)
+        self.resizable(False, False)
+        self.tarefa = tarefa
+        self.protocol("WM_DELETE_WINDOW", self._cancelar)
+
+        frame = tk.Frame(self, padx=20, pady=15)
+        frame.pack(fill="both", expand=True)
+        self.lbl_etapa = tk.Label(frame, text="Iniciando...", font=("Arial", 10, "bold"), anchor="w")
+        self.lbl_etapa.pack(fill="x")
+        self.barra = ttk.Progressbar(frame, length=320, mode="indeterminate")
+        self.barra.pack(pady=8)
+        self.barra.start(15)
+        self.lbl_restante = tk.Label(frame, text="", fg="#555", anchor="w")
+        self.lbl_restante.pack(fill="x")
+        self.btn_cancelar = tk.Button(frame, text="Cancelar", command=self._cancelar, bg="#c0392b", fg="white")
+        self.btn_cancelar.pack(pady=(8, 0))
+
+    def atualizar(self, progresso: Progresso):
+        if progresso.total:
+            if str(self.barra['mode']) != "determinate":
+                self.barra.stop()
+                self.barra.config(mode="determinate")
+            self.barra.config(maximum=progresso.total, value=progresso.feitos)
+            self.lbl_etapa.config(text=f"{progresso.etapa}: {progresso.feitos} de {progresso.total}")
+        else:
+            if str(self.barra['mode']) != "indeterminate":
+                self.barra.config(mode="indeterminate")
+                self.barra.start(15)
+            self.lbl_etapa.config(text=f"{progresso.etapa}: {progresso.feitos}")
+        restante = progresso.restante_s
+        self.lbl_restante.config(text="" if restante is None else f"Tempo restante: ~{_formatar_duracao(restante)}")
+
+    def _cancelar(self):
+        self.tarefa.cancelar()
+        self.btn_cancelar.config(state="disabled", text="Cancelando...")
+
+
+# === APLICAÇÃO PRINCIPAL ===
+class AppFortunne:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Fortunne Label System V12.0 - Final Edition")
+        self.root.geometry("950x1000")
+        
+        style = ttk.Style()
+        style.theme_use('clam')
+        
+        self.config_produtos = GerenciadorDados.carregar_config()
+        self.historico = GerenciadorDados.historico()
+        
+        self.path_logo = tk.StringVar()
+        self.path_manual_img = tk.StringVar()
+        self.path_excel = tk.StringVar()
+        self.tipo_produto = tk.StringVar()
+        self.nome_pdf = tk.StringVar(value="Etiquetas_Fortunne")
+        self.usar_img = tk.BooleanVar(value=True)
+        self.quantidade = tk.IntVar(value=1)
+        self.nome_folha = tk.StringVar(value=FOLHA_PADRAO.nome)
+        self.compactar = tk.BooleanVar(value=False)
+
+        # Preview ao vivo (renderiza em segundo plano após uma pausa na digitação)
+        self.preview = PreviewAoVivo()
+        self._after_preview = None
+        self._verificando_preview = False
+        for var in (self.path_logo, self.path_manual_img, self.usar_img):
+            var.trace_add('write', self._agendar_preview)
+        self.nome_folha.trace_add('write', self._trocar_folha)
+
+        self._init_ui()
+
+    def _init_ui(self):
+        top = tk.Frame(self.root, bg="#2c3e50", height=70)
+        top.pack(fill="x")
+        tk.Label(top, text="🏢 FORTUNNE", font=("Helvetica", 20, "bold"), bg="#2c3e50", fg="white").pack(side="left", padx=20, pady=15)
+        tk.Button(top, text="⚙️ Configurar Tipos", command=self._abrir_editor_config, bg="#34495e", fg="white").place(relx=0.85, rely=0.25)
+
+        main = tk.Frame(self.root, bg="#ecf0f1")
+        main.pack(fill="both", expand=True, padx=15, pady=15)
+        
+        canvas = tk.Canvas(main, bg="#ecf0f1")
+        scroll = ttk.Scrollbar(main, orient="vertical", command=canvas.yview)
+        self.conteudo = tk.Frame(canvas, bg="#ecf0f1")
+        self.conteudo.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
+        canvas.create_window((0, 0), window=self.conteudo, anchor="nw")
+        canvas.configure(yscrollcommand=scroll.set)
+        canvas.pack(side="left", fill="both", expand=True)
+        scroll.pack(side="right", fill="y")
+
+        self._montar_formulario()
+
+    def _montar_formulario(self):
+        # Arquivos GLOBAIS
+        fr_files = tk.LabelFrame(self.conteudo, text="📂 Configuração Global", font=("Arial", 11, "bold"), bg="#fff", padx=10, pady=10)
+        fr_files.pack(fill="x", padx=5, pady=8)
+        self._input_file(fr_files, "Logo Empresa:", self.path_logo)
+        tk.Checkbutton(fr_files, text="✓ Incluir imagem nas etiquetas", variable=self.usar_img, bg="#fff").pack(anchor="w")
+
+        # Tabs
+        self.tabs = ttk.Notebook(self.conteudo)
+        self.tabs.pack(fill="both", expand=True, padx=5, pady=10)
+        self._tab_manual()
+        self._tab_excel()
+
+        # Gerar
+        fr_action = tk.LabelFrame(self.conteudo, text="🚀 Geração", font=("Arial", 11, "bold"), bg="#fff", padx=15, pady=15)
+        fr_action.pack(fill="x", padx=5, pady=10)
+        tk.Label(fr_action, text="Nome arquivo:", bg="#fff").pack(side="left")
+        tk.Entry(fr_action, textvariable=self.nome_pdf, width=30).pack(side="left", padx=5)
+        tk.Label(fr_action, text="Folha:", bg="#fff").pack(side="left", padx=(10, 0))
+        ttk.Combobox(fr_action, textvariable=self.nome_folha, values=[f.nome for f in FOLHAS.values()],
+                     state="readonly", width=32).pack(side="left", padx=5)
+        tk.Checkbutton(fr_action, text="PDF compacto (envio)", variable=self.compactar, bg="#fff").pack(side="left", padx=5)
+        
+        btn_cont = tk.Frame(fr_action, bg="#fff")
+        btn_cont.pack(side="right", fill="x")
+        tk.Button(btn_cont, text="👁️ Preview", command=self.visualizar_preview, bg="#9b59b6", fg="white").pack(side="left", padx=5)
+        tk.Button(btn_cont, text="🎯 GERAR PDF", command=self.configurar_posicoes, bg="#2980b9", fg="white", height=2).pack(side="left", padx=5)
+
+    def _input_file(self, parent, label, var):
+        f = tk.Frame(parent, bg="#fff")
+        f.pack(fill="x", pady=2)
+        tk.Label(f, text=label, width=15, anchor="w", bg="#fff").pack(side="left")
+        tk.Entry(f, textvariable=var, state="readonly").pack(side="left", fill="x", expand=True)
+        tk.Button(f, text="📁", command=lambda: self._buscar_arq(var)).pack(side="right")
+
+    def _buscar_arq(self, var):
+        f = filedialog.askopenfilename(filetypes=[("Imagens/Planilhas", "*.png *.jpg *.jpeg *.xlsx *.csv *.parquet")])
+        if f: var.set(f)
+
+    def _tab_manual(self):
+        f_man = tk.Frame(self.tabs, bg="#fff")
+        self.tabs.add(f_man, text="✏️ Cadastro Manual")
+        
+        fr_sel = tk.Frame(f_man, pady=15, bg="#fff")
+        fr_sel.pack(fill="x")
+        tk.Label(fr_sel, text="Tipo:", bg="#fff").pack(side="left", padx=10)
+        chaves = list(self.config_produtos.keys())
+        self.combo_tipo = ttk.Combobox(fr_sel, textvariable=self.tipo_produto, values=chaves, state="readonly")
+        self.combo_tipo.pack(side="left", padx=5)
+        self.combo_tipo.bind("<<ComboboxSelected>>", self._render_form)
+        if chaves: self.combo_tipo.current(0)
+        
+        tk.Label(fr_sel, text="Qtd cópias:", bg="#fff").pack(side="left", padx=10)
+        tk.Spinbox(fr_sel, from_=1, to=100, textvariable=self.quantidade, width=5).pack(side="left")
+
+        fr_prev = tk.LabelFrame(f_man, text="👁️ Preview ao vivo", bg="#fff", padx=5, pady=5)
+        fr_prev.pack(side="right", fill="y", padx=(0, 10))
+        self.lbl_preview = tk.Label(fr_prev, text="Preencha o nome do produto", bg="#fff", fg="#95a5a6")
+        self.lbl_preview.pack()
+
+        canvas_form = tk.Canvas(f_man, bg="#fff")
+        scroll_form = ttk.Scrollbar(f_man, orient="vertical", command=canvas_form.yview)
+        self.container_campos = tk.Frame(canvas_form, bg="#fff")
+        self.container_campos.bind("<Configure>", lambda e: canvas_form.configure(scrollregion=canvas_form.bbox("all")))
+        canvas_form.create_window((0, 0), window=self.container_campos, anchor="nw")
+        canvas_form.configure(yscrollcommand=scroll_form.set)
+        canvas_form.pack(side="left", fill="both", expand=True, padx=10)
+        scroll_form.pack(side="right", fill="y")
+        
+        self.vars_campos = {}
+        self.vars_tamanhos = []
+        
+        fr_bot = tk.Frame(f_man, bg="#fff", pady=10)
+        fr_bot.pack(fill="x", side="bottom")
+        tk.Button(fr_bot, text="💾 SALVAR NA BIBLIOTECA", command=self._salvar_na_biblioteca, 
+                  bg="#e67e22", fg="white", font=("Arial", 10, "bold"), height=2).pack(fill="x", padx=20)
+
+        if chaves: self._render_form()
+
+    def _salvar_na_biblioteca(self):
+        dados = self._coletar_manual()
+        if not dados:
+            messagebox.showwarning("Atenção", "Preencha os dados (Nome, Fornecedor)!")
+            return
+        GerenciadorDados.salvar_produto_db(dados)
+        GerenciadorDados.salvar_historico(dados)
+        messagebox.showinfo("Salvo", f"Produto '{dados['Produto']}' salvo!\nImagem vinculada: {'Sim' if dados.get('imagem') else 'Não'}")
+
+    def _render_form(self, event=None):
+        for w in self.container_campos.winfo_children(): w.destroy()
+        tipo = self.tipo_produto.get()
+        cfg = self.config_produtos.get(tipo, {})
+        campos = cfg.get("campos", [])
+        placeholders = cfg.get("placeholders", {})
+        
+        self.vars_campos = {}
+        self.vars_tamanhos = []
+        self.historico.atualizar()  # valores salvos por outras instâncias na pasta compartilhada
+        
+        fr_img = tk.LabelFrame(self.container_campos, text="📸 Imagem deste Produto", bg="#f9f9f9", padx=5, pady=5)
+        fr_img.grid(row=0, column=0, columnspan=2, sticky="ew", pady=5)
+        self._input_file(fr_img, "Arquivo:", self.path_manual_img)
+
+        self._criar_input(self.container_campos, "Produto", "Nome", 1)
+        for i, c in enumerate(campos):
+            self._criar_input(self.container_campos, c, placeholders.get(c, ""), i+2, auto=True)
+        
+        last = len(campos) + 2
+        self._criar_input(self.container_campos, "Fornecedor", "Nome", last, auto=True)
+        self._criar_input(self.container_campos, "Prazo", "Dias", last+1)
+        
+        fr = tk.LabelFrame(self.container_campos, text="Tamanhos", bg="#fff")
+        fr.grid(row=last+2, column=0, columnspan=2, sticky="ew", pady=10)
+        tk.Label(fr, text="Tam / Med / Cod", bg="#fff").pack()
+        for i in range(5):
+            f = tk.Frame(fr, bg="#fff")
+            f.pack()
+            l = []
+            for j in range(3):
+                v = tk.StringVar()
+                tk.Entry(f, textvariable=v, width=15).pack(side="left")
+                l.append(v)
+            self.vars_tamanhos.append(l)
+
+        for var in list(self.vars_campos.values()) + [v for l in self.vars_tamanhos for v in l]:
+            var.trace_add('write', self._agendar_preview)
+        self._agendar_preview()
+
+    def _folha(self):
+        return folha_por_nome(self.nome_folha.get())
+
+    def _trocar_folha(self, *_):
+        """O tamanho da etiqueta muda com a folha; o preview ao vivo passa a usar o novo tamanho"""
+        self.preview.trocar_gerador(GeradorPDF(folha=self._folha()))
+        self._agendar_preview()
+
+    def _agendar_preview(self, *_):
+        """Debounce: só renderiza quando o formulário fica parado por um instante"""
+        if self._after_preview: self.root.after_cancel(self._after_preview)
+        self._after_preview = self.root.after(ATRASO_PREVIEW_MS, self._atualizar_preview)
+
+    def _atualizar_preview(self):
+        self._after_preview = None
+        dados = self._coletar_manual()
+        if not dados:
+            self._mostrar_preview(None)
+            return
+        img = self.preview.solicitar(dados, self.path_logo.get(), self.usar_img.get())
+        if img is not None:
+            self._mostrar_preview(img)
+        elif not self._verificando_preview:
+            self._verificando_preview = True
+            self.root.after(40, self._verificar_preview)
+
+    def _verificar_preview(self):
+        """Busca o resultado da thread de preview sem bloquear o loop do Tk"""
+        img = self.preview.resultado()
+        if img is not None: self._mostrar_preview(img)
+        if self.preview.ocupado:
+            self.root.after(40, self._verificar_preview)
+        else:
+            self._verificando_preview = False
+
+    def _mostrar_preview(self, img):
+        if img is None:
+            self.lbl_preview.config(image="", text="Preencha o nome do produto")
+            self.lbl_preview.image = None
+            return
+        ph = ImageTk.PhotoImage(img)
+        self.lbl_preview.config(image=ph, text="")
+        self.lbl_preview.image = ph
+
+    def _criar_input(self, parent, label, ph, row, auto=False):
+        tk.Label(parent, text=label, bg="#fff").grid(row=row, column=0, sticky="w", pady=2)
+        if auto and label in self.historico:
+            var = tk.StringVar()
+            combo = ttk.Combobox(parent, textvariable=var, values=self.historico.sugerir(label))
+            # A lista é refeita ao digitar e ao abrir, com os valores mais usados que começam com o texto
+            combo.configure(postcommand=lambda: self._filtrar_sugestoes(combo, label))
+            combo.bind('<KeyRelease>', lambda e: self._filtrar_sugestoes(combo, label, e))
+            combo.grid(row=row, column=1, sticky="ew")
+        else:
+            var = tk.StringVar()
+            tk.Entry(parent, textvariable=var).grid(row=row, column=1, sticky="ew")
+        self.vars_campos[label] = var
+
+    def _filtrar_sugestoes(self, combo, label, event=None):
+        if event is not None and event.keysym in TECLAS_NAVEGACAO: return
+        combo.configure(values=self.historico.sugerir(label, combo.get()))
+
+    def _coletar_manual(self) -> Optional[Dict]:
+        dados = {}
+        for campo, var in self.vars_campos.items():
+            dados[campo] = var.get().strip()
+        
+        if not dados.get('Produto'): return None
+        
+        dados['imagem'] = self.path_manual_img.get()
+        
+        tipo = self.tipo_produto.get()
+        campos = self.config_produtos.get(tipo, {}).get('campos', [])
+        dados['specs_list'] = [f"{c}: {dados[c]}" for c in campos if c in dados and dados[c]]
+        
+        tams = []
+        for l in self.vars_tamanhos:
+            t, m, c = l[0].get(), l[1].get(), l[2].get()
+            if t or m or c: tams.append({'tamanho': t, 'medida': m, 'codigo': c})
+        dados['tamanhos'] = tams
+        return dados
+
+    def _tab_excel(self):
+        f_xl = tk.Frame(self.tabs, bg="#fff")
+        self.tabs.add(f_xl, text="📊 Excel")
+        
+        tk.Label(f_xl, text="Tipo:", bg="#fff").pack()
+        self.combo_tipo_excel = ttk.Combobox(f_xl, values=list(self.config_produtos.keys()))
+        self.combo_tipo_excel.pack()
+        if self.config_produtos: self.combo_tipo_excel.current(0)
+        
+        tk.Button(f_xl, text="Gerar Modelo", command=self._gerar_template_excel).pack(pady=5)
+        
+        tk.Label(f_xl, text="Arquivo:", bg="#fff").pack()
+        fr = tk.Frame(f_xl, bg="#fff")
+        fr.pack()
+        tk.Entry(fr, textvariable=self.path_excel).pack(side="left")
+        tk.Button(fr, text="...", command=lambda: self._buscar_arq(self.path_excel)).pack(side="left")
+
+    def _gerar_template_excel(self):
+        tipo = self.combo_tipo_excel.get()
+        if not tipo: return
+        campos = self.config_produtos[tipo]['campos']
+        f = filedialog.asksaveasfilename(defaultextension=".xlsx")
+        if f: 
+            from .planilha import gerar_modelo
+            gerar_modelo(f, campos)
+            messagebox.showinfo("Sucesso", "Modelo gerado!")
+
+    def _executar_tarefa(self, titulo, funcao, ao_concluir) -> Tarefa:
+        """Roda `funcao(tarefa)` em uma thread; `ao_concluir(resultado)` é chamado no loop do Tk"""
+        tarefa = Tarefa(funcao, nome=titulo).iniciar()
+        inicio = time.monotonic()
+        janela, ultimo = None, None
+
+        def verificar():
+            nonlocal janela, ultimo
+            eventos = tarefa.eventos()
+            if eventos: ultimo = eventos[-1]
+            if not tarefa.concluida:
+                if janela is None and time.monotonic() - inicio >= ATRASO_JANELA_PROGRESSO_MS / 1000:
+                    janela = JanelaProgresso(self.root, titulo, tarefa)
+                if janela is not None and ultimo is not None: janela.atualizar(ultimo)
+                self.root.after(INTERVALO_PROGRESSO_MS, verificar)
+                return
+            if janela is not None: janela.destroy()
+            if tarefa.erro is not None:
+                messagebox.showerror("Erro", str(tarefa.erro))
+            elif not tarefa.cancelada:
+                ao_concluir(tarefa.resultado)
+
+        self.root.after(INTERVALO_PROGRESSO_MS, verificar)
+        return tarefa
+
+    def _ler_excel(self, ao_concluir):
+        """Lê a planilha em segundo plano e entrega a lista de etiquetas a `ao_concluir`"""
+        caminho, tipo, config = self.path_excel.get(), self.combo_tipo_excel.get(), self.config_produtos
+
+        def ler(tarefa):
+            from . import lote
+            return lote.carregar_planilha(caminho, tipo, config, progresso=tarefa.informar)
+        self._executar_tarefa("Lendo planilha", ler, ao_concluir)
+
+    def visualizar_preview(self):
+        dados = self._coletar_manual()
+        if not dados: return
+        logo, usar_img = self.path_logo.get(), self.usar_img.get()
+        folha = self._folha()
+        self._executar_tarefa("Preview", lambda t: GeradorPDF(folha=folha).gerar_preview(dados, logo, usar_img),
+                              self._abrir_janela_preview)
+
+    def _abrir_janela_preview(self, img):
+        if not img: return
+        win = tk.Toplevel(self.root)
+        win.title("Preview")
+        ph = ImageTk.PhotoImage(img)
+        lbl = tk.Label(win, image=ph)
+        lbl.image = ph
+        lbl.pack()
+
+    def configurar_posicoes(self):
+        if self.tabs.index("current") == 0:
+            d = self._coletar_manual()
+            if not d: return
+            self._abrir_posicoes([d] * self.quantidade.get())
+        else:
+            self._ler_excel(self._abrir_posicoes)
+
+    def _abrir_posicoes(self, lista):
+        if not lista: return
+        gen = GeradorPDF(folha=self._folha(), compactacao=COMPACTACAO_ENVIO if self.compactar.get() else None)
+        gen.preparar_imagens(lista, self.usar_img.get())
+        JanelaConfiguracaoPosicoes(self.root, lista, gen, self.path_logo.get(), self.usar_img.get(), 
+                                   lambda m, restantes: self._gerar_pdf_final(lista, m, gen, restantes))
+
+    def _gerar_pdf_final(self, lista, mapeamento, gen, incluir_restantes=True):
+        f = filedialog.asksaveasfilename(defaultextension=".pdf", filetypes=TIPOS_SAIDA)
+        if not f: return
+        logo, usar_img = self.path_logo.get(), self.usar_img.get()
+        formato = os.path.splitext(f)[1].lstrip('.').lower()
+
+        def gerar(tarefa):
+            from . import lote
+            try:
+                if formato == 'png':
+                    # Um arquivo por etiqueta (nome-0001.png...); só vão para a pasta quando todos ficam prontos
+                    with saidas_temporarias(f) as temporario:
+                        return lote.gerar_termica(lista, temporario, 'png', logo, usar_img, mapeamento=mapeamento,
+                                                  incluir_restantes=incluir_restantes, gerador=gen,
+                                                  progresso=tarefa.informar)
+                # Gera em um arquivo temporário: cancelar ou falhar não deixa um arquivo pela metade
+                with saida_temporaria(f) as temporario:
+                    if formato == 'zpl':
+                        return lote.gerar_termica(lista, temporario, 'zpl', logo, usar_img, mapeamento=mapeamento,
+                                                  incluir_restantes=incluir_restantes, gerador=gen,
+                                                  progresso=tarefa.informar)
+                    return lote.gerar_pdf(lista, temporario, logo, usar_img, mapeamento, incluir_restantes,
+                                          gen, progresso=tarefa.informar)
+            finally:
+                registrar_resumo("gerar_pdf")
+        def concluido(quantidade):
+            from . import lote
+            if formato in lote.FORMATOS_TERMICA:
+                messagebox.showinfo("Sucesso", f"{formato.upper()} Gerado!\n{quantidade} etiqueta(s)")
+                return
+            tamanho = lote.descrever_tamanho(lote.tamanho_pdf(f), len(lista))
+            messagebox.showinfo("Sucesso", f"PDF Gerado!\n{quantidade} página(s)\n{tamanho}")
+        self._executar_tarefa("Gerando etiquetas", gerar, concluido)
+
+    def _abrir_editor_config(self):
+        EditorConfiguracao(self.root, lambda: [self._init_ui()])
+
+
+def iniciar(medir_partida: bool = False):
+    """Abre a janela principal; com `medir_partida`, fecha assim que ela aparece e imprime os tempos"""
+    partida.marcar("imports")
+    root = tk.Tk()
+    AppFortunne(root)
+    partida.marcar("widgets")
+
+    def janela_pronta():
+        root.update_idletasks()
+        partida.marcar("primeira janela")
+        relatorio = partida.relatorio()
+        logger.info(relatorio)
+        if medir_partida:
+            print(relatorio)
+            root.destroy()
+
+    root.after_idle(janela_pronta)
+    root.mainloop()
@@ -0,0 +1,195 @@
+"""Layout da etiqueta como lista de operações de desenho.
+
+As funções daqui só calculam geometria e texto; quem desenha são os backends
+(`backends.py`): um para o canvas do reportlab (PDF) e outro direto em PIL
+(preview). Coordenadas em pontos, com origem no canto inferior esquerdo da etiqueta.
+"""
+import os
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from .config import EtiquetaConfig, mm
+from .texto import ajustar_fonte, quebrar_linhas
+
+COR_BORDA = '#CCCCCC'
+# Campos de `dados` lidos por `operacoes_variaveis` (a foto entra já resolvida)
+CAMPOS_LAYOUT = ('Produto', 'Fornecedor', 'Prazo', 'specs_list', 'tamanhos')
+
+
+@dataclass(frozen=True)
+class Retangulo:
+    x: float
+    y: float
+    largura: float
+    altura: float
+    preenchimento: Optional[str] = None
+    contorno: Optional[str] = None
+    espessura: float = 0.5
+    raio: float = 0
+
+
+@dataclass(frozen=True)
+class Linha:
+    x1: float
+    y1: float
+    x2: float
+    y2: float
+    cor: str
+    espessura: float
+
+
+@dataclass(frozen=True)
+class Texto:
+    x: float
+    y: float
+    texto: str
+    fonte: str
+    tamanho: float
+    cor: str
+    centralizado: bool = False
+
+
+@dataclass(frozen=True)
+class Imagem:
+    """Imagem encaixada (proporção preservada, centralizada) na caixa dada.
+
+    Se o arquivo não puder ser desenhado, o backend usa as operações de `substituto`.
+    """
+    caminho: str
+    x: float
+    y: float
+    largura: float
+    altura: float
+    substituto: Tuple = ()
+
+
+def _unidades(cfg: EtiquetaConfig) -> Tuple[float, float, float]:
+    """mm horizontal, mm vertical e fator das fontes na escala da etiqueta (ver `EtiquetaConfig.escalada`)"""
+    return cfg.ESCALA_X * mm, cfg.ESCALA_Y * mm, cfg.escala_fonte
+
+
+def area_imagem(cfg: EtiquetaConfig) -> Tuple[float, float, float, float]:
+    """(x, y, largura, altura) da área da foto do produto"""
+    titulo_y = cfg.ALTURA - cfg.TITULO_Y_OFFSET
+    img_limite_superior = titulo_y - cfg.IMG_MARGEM_TOPO
+    img_limite_inferior = cfg.BOX_Y_BASE + cfg.BOX_ALTURA + cfg.IMG_MARGEM_BASE
+    img_x = (cfg.LARGURA - cfg.IMG_LARGURA_MAX) / 2
+    return img_x, img_limite_inferior, cfg.IMG_LARGURA_MAX, img_limite_superior - img_limite_inferior
+
+
+def operacoes_estaticas(cfg: EtiquetaConfig, logo_path: Optional[str]) -> List:
+    """Moldura comum a todas as etiquetas: fundo, bordas, caixas, títulos e logo"""
+    ux, uy, f = _unidades(cfg)
+    ops = [
+        Retangulo(0, 0, cfg.LARGURA, cfg.ALTURA, preenchimento=cfg.COR_FUNDO),
+        Retangulo(0, 0, cfg.LARGURA, cfg.ALTURA, contorno=COR_BORDA, espessura=0.5),
+    ]
+
+    # --- BOXES DO MEIO ---
+    by = cfg.BOX_Y_BASE
+    for bx, titulo in ((cfg.MARGEM, "Especificações"), (53*ux, "Tamanhos")):
+        ops.append(Retangulo(bx, by, cfg.BOX_LARGURA, cfg.BOX_ALTURA, contorno=COR_BORDA, espessura=0.8, raio=2*mm*f))
+        ops.append(Texto(bx + cfg.BOX_LARGURA/2, by + cfg.BOX_ALTURA - 7*uy, titulo,
+                         "Helvetica-Bold", cfg.FONTE_SUBTITULO, cfg.COR_TEXTO, centralizado=True))
+        ops.append(Linha(bx+2*ux, by+cfg.BOX_ALTURA-10*uy, bx+cfg.BOX_LARGURA-2*ux, by+cfg.BOX_ALTURA-10*uy,
+                         COR_BORDA, 0.8))
+
+    # --- RODAPÉ ---
+    by_rod = cfg.BOX_RODAPE_Y
+    ops.append(Retangulo(cfg.MARGEM, by_rod, cfg.BOX_LARGURA, cfg.BOX_RODAPE_ALTURA,
+                         contorno=COR_BORDA, espessura=0.8, raio=2*mm*f))
+    if logo_path:
+        ops.append(Imagem(logo_path, cfg.LARGURA - 43*ux, by_rod + 2*uy, 38*ux, 24*uy))
+    return ops
+
+
+def operacoes_variaveis(cfg: EtiquetaConfig, dados: dict, imagem: Optional[str]) -> List:
+    """Conteúdo próprio da etiqueta; `imagem` é o arquivo já resolvido (ou None)"""
+    ux, uy, f = _unidades(cfg)
+    ops = []
+
+    # --- TÍTULO AUTO-AJUSTÁVEL ---
+    titulo = str(dados.get('Produto', ''))
+    largura_max_titulo = cfg.LARGURA - 10*ux # Margem de segurança
+    tamanho_fonte = ajustar_fonte(titulo, "Helvetica-Bold", cfg.FONTE_TITULO, largura_max_titulo, 8*f)
+    ops.append(Texto(cfg.LARGURA/2, cfg.ALTURA - cfg.TITULO_Y_OFFSET, titulo,
+                     "Helvetica-Bold", tamanho_fonte, cfg.COR_TEXTO, centralizado=True))
+
+    # --- ÁREA DA IMAGEM ---
+    img_x, img_y, img_larg, img_alt = area_imagem(cfg)
+    placeholder = _placeholder_imagem(cfg, img_x, img_y, img_larg, img_alt)
+    if imagem:
+        ops.append(Imagem(imagem, img_x, img_y, img_larg, img_alt, substituto=placeholder))
+    else:
+        ops.extend(placeholder)
+
+    # --- BOXES DO MEIO ---
+    by = cfg.BOX_Y_BASE
+    ops.extend(_box_specs(cfg, cfg.MARGEM, by, dados.get('specs_list', [])))
+    ops.extend(_box_tamanhos(cfg, 53*ux, by, dados.get('tamanhos', [])))
+
+    # --- RODAPÉ ---
+    bx = cfg.MARGEM
+    by_rod = cfg.BOX_RODAPE_Y
+
+    # Fornecedor (com quebra de linha se necessário)
+    fornecedor = str(dados.get('Fornecedor', ''))
+    y_forn = by_rod + 20*uy
+    for linha in quebrar_linhas(fornecedor, "Helvetica-Bold", cfg.FONTE_SUBTITULO, cfg.BOX_LARGURA - 4*ux):
+        ops.append(Texto(bx+3*ux, y_forn, linha, "Helvetica-Bold", cfg.FONTE_SUBTITULO, cfg.COR_TEXTO))
+        y_forn -= 4*uy
+
+    # Prazo
+    ops.append(Texto(bx+3*ux, by_rod+5*uy, str(dados.get('Prazo', '')), "Helvetica", 7*f, cfg.COR_TEXTO))
+    return ops
+
+
+def resolver_imagem(dados: dict, usar_img: bool, imagens=None) -> Optional[str]:
+    """Arquivo a desenhar na área de foto: a versão reduzida do cache, se houver"""
+    img_path = dados.get('imagem', '')
+    if not (usar_img and img_path and os.path.exists(img_path)):
+        return None
+    return (imagens.obter(img_path) if imagens else None) or img_path
+
+
+def _placeholder_imagem(cfg, x, y, largura, altura) -> Tuple:
+    return (
+        Retangulo(x, y, largura, altura, preenchimento='#F9F9F9', contorno='#DDDDDD', espessura=0.5),
+        Texto(cfg.LARGURA/2, y + altura/2, "📷 Sem imagem", "Helvetica", 9*cfg.escala_fonte, '#BBBBBB', centralizado=True),
+    )
+
+
+def _box_specs(cfg, x, y, linhas) -> List:
+    """Especificações com quebra de linha (Word Wrap)"""
+    ux, uy, _ = _unidades(cfg)
+    ops = []
+    cur_y = y + cfg.BOX_ALTURA - 14*uy
+    largura_util = cfg.BOX_LARGURA - 4*ux # Margem interna
+
+    for linha in linhas:
+        if not linha or not str(linha).strip(): continue
+
+        # Quebra o texto em várias linhas se ultrapassar a largura
+        for sub_linha in quebrar_linhas(f"• {linha}", "Helvetica", cfg.FONTE_SPECS, largura_util):
+            # Verifica se ainda cabe no box verticalmente
+            if cur_y < y + 2*uy: break
+            ops.append(Texto(x+2*ux, cur_y, sub_linha, "Helvetica", cfg.FONTE_SPECS, cfg.COR_TEXTO))
+            cur_y -= 3.5*uy
+    return ops
+
+
+def _box_tamanhos(cfg, x, y, tamanhos) -> List:
+    """Tamanhos centralizados, com a fonte reduzida até caber"""
+    ux, uy, f = _unidades(cfg)
+    ops = []
+    centro_box = x + cfg.BOX_LARGURA/2
+    cur_y = y + cfg.BOX_ALTURA - 14*uy
+    largura_util = cfg.BOX_LARGURA - 2*ux
+
+    for t in tamanhos:
+        partes = [t.get(k) for k in ('tamanho', 'medida', 'codigo') if t.get(k)]
+        txt = " - ".join(partes)
+        fonte_atual = ajustar_fonte(txt, "Helvetica", cfg.FONTE_TAMANHOS, largura_util, 5*f)
+        ops.append(Texto(centro_box, cur_y, txt, "Helvetica", fonte_atual, cfg.COR_TEXTO, centralizado=True))
+        cur_y -= 3.5*uy
+    return ops
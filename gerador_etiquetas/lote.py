@@ -0,0 +1,165 @@
+"""API de geração em lote, sem dependência de interface gráfica.
+
+Exemplo:
+    from gerador_etiquetas import lote
+    from gerador_etiquetas.folha import FOLHAS
+    etiquetas = lote.carregar_planilha('catalogo.xlsx', tipo='Sofá')
+    lote.gerar_pdf(etiquetas, 'etiquetas.pdf', logo_path='logo.png')
+    lote.gerar_termica(etiquetas, 'etiquetas.zpl', folha=FOLHAS['rolo-100x150'])
+"""
+import os
+import json
+import logging
+from typing import Callable, Dict, List, Optional
+
+from .config import DPI_IMPRESSAO
+from .dados import GerenciadorDados
+from .imagens import cache_padrao
+from .instrumentacao import etapa
+from .folha import LayoutFolha
+from .pdf import Compactacao, GeradorPDF, planejar_paginas
+
+logger = logging.getLogger("FortunneApp")
+
+ETAPA_PLANILHA = "Linhas lidas"
+ETAPA_TERMICA = "Etiquetas"
+FORMATOS_TERMICA = ('zpl', 'png')
+LINHAS_POR_AVISO = 500
+
+# Callback de progresso: progresso(etapa, feitos, total ou None). Pode levantar uma
+# exceção (ex.: tarefas.Cancelado) para interromper a operação no próximo aviso.
+Progresso = Optional[Callable[[str, int, Optional[int]], None]]
+
+
+def campos_do_tipo(tipo: Optional[str], config_produtos: Optional[Dict] = None) -> List[str]:
+    """Campos de especificação configurados para o tipo (ou para o primeiro tipo cadastrado)"""
+    if config_produtos is None:
+        config_produtos = GerenciadorDados.carregar_config()
+    if not tipo:
+        tipo = next(iter(config_produtos), None)
+    if tipo not in config_produtos:
+        raise ValueError(f"Tipo de produto desconhecido: {tipo!r}")
+    return config_produtos[tipo].get('campos', [])
+
+
+def carregar_planilha(caminho: str, tipo: Optional[str] = None,
+                      config_produtos: Optional[Dict] = None, progresso: Progresso = None) -> List[Dict]:
+    """Lê a planilha e devolve a lista de etiquetas do tipo informado"""
+    from .planilha import iterar_planilha
+    lista = []
+    with etapa("planilha.ler"):
+        for d in iterar_planilha(caminho, campos_do_tipo(tipo, config_produtos)):
+            lista.append(d)
+            if progresso and len(lista) % LINHAS_POR_AVISO == 0: progresso(ETAPA_PLANILHA, len(lista), None)
+    if progresso and len(lista) % LINHAS_POR_AVISO: progresso(ETAPA_PLANILHA, len(lista), None)
+    cache_padrao().prefetch(d.get('imagem', '') for d in lista)
+    return lista
+
+
+def tamanho_pdf(destino) -> Optional[int]:
+    """Bytes gravados em `destino` (caminho ou arquivo binário já escrito)"""
+    try:
+        if isinstance(destino, (str, os.PathLike)): return os.path.getsize(destino)
+        return destino.tell()
+    except (OSError, AttributeError, ValueError):
+        return None
+
+
+def descrever_tamanho(n_bytes: Optional[int], etiquetas: int) -> str:
+    """'1.2 MB, 3.4 KB/etiqueta'"""
+    if n_bytes is None: return "tamanho desconhecido"
+    total = f"{n_bytes / 2**20:.1f} MB" if n_bytes >= 2**20 else f"{n_bytes / 1024:.0f} KB"
+    return f"{total}, {n_bytes / max(etiquetas, 1) / 1024:.1f} KB/etiqueta"
+
+
+def gerar_pdf(lista: List[Dict], destino, logo_path: str = '', usar_img: bool = True,
+              mapeamento: Optional[Dict[int, int]] = None, incluir_restantes: bool = True,
+              gerador: Optional[GeradorPDF] = None, trabalhadores: Optional[int] = None,
+              progresso: Progresso = None, folha: Optional[LayoutFolha] = None,
+              compactacao: Optional[Compactacao] = None) -> int:
+    """Gera o PDF do lote em `destino` (caminho ou arquivo binário) e devolve o nº de páginas.
+
+    A folha (grade de etiquetas) e a compactação vêm dos argumentos ou do `gerador`;
+    o padrão é A4 com 4, sem compactação.
+    Com `trabalhadores` (>= 1) o lote é renderizado em fatias por processos separados.
+    """
+    gen = gerador or GeradorPDF(folha=folha, compactacao=compactacao)
+    if trabalhadores:
+        from .paralelo import gerar_pdf_paralelo
+        paginas = gerar_pdf_paralelo(lista, destino, logo_path, usar_img, mapeamento, incluir_restantes,
+                                     trabalhadores, progresso=progresso, folha=gen.folha,
+                                     compactacao=gen.compactacao, imagens=gen.imagens)
+    else:
+        gen.preparar_imagens(lista, usar_img)
+        c = gen.criar_canvas(destino)
+        with etapa("pdf.paginas"):
+            paginas = gen.gerar_paginas(c, lista, logo_path, usar_img, mapeamento, incluir_restantes,
+                                        progresso=progresso)
+        with etapa("pdf.salvar"):
+            c.save()
+        logger.info(f"PDF gerado: {destino} ({len(lista)} etiqueta(s), {paginas} página(s))")
+    logger.info(f"Tamanho do PDF: {descrever_tamanho(tamanho_pdf(destino), len(lista))}"
+                + (" (compacto)" if gen.compactacao else ""))
+    return paginas
+
+
+def gerar_termica(lista: List[Dict], destino, formato: str = 'zpl', logo_path: str = '', usar_img: bool = True,
+                  dpi: int = DPI_IMPRESSAO, mapeamento: Optional[Dict[int, int]] = None,
+                  incluir_restantes: bool = True, gerador: Optional[GeradorPDF] = None,
+                  progresso: Progresso = None, folha: Optional[LayoutFolha] = None) -> int:
+    """Gera o lote para impressora térmica e devolve o nº de etiquetas impressas.
+
+    `formato` 'zpl' grava um único trabalho ZPL em `destino` (caminho ou arquivo
+    binário); 'png' grava um PNG de 1 bit por etiqueta (`destino`, ou `nome-0001.png`,
+    `nome-0002.png`... quando há mais de uma). A etiqueta tem o tamanho da folha
+    (use um rolo, ex.: 'rolo-100x150') e as posições seguem a ordem do PDF.
+    """
+    from .backends import GeradorZPL, RenderizadorMonocromatico
+    if formato not in FORMATOS_TERMICA: raise ValueError(f"Formato desconhecido: {formato!r}")
+    gen = gerador or GeradorPDF(folha=folha)
+    paginas = planejar_paginas(len(lista), mapeamento, incluir_restantes, gen.folha.por_folha)
+    ordem = [idx for pagina in paginas for _, idx in sorted(pagina)]
+    gen.preparar_imagens([lista[i] for i in ordem], usar_img)
+
+    # Etiquetas idênticas (cópias do modo manual) são montadas uma vez
+    chaves = [json.dumps(lista[i], sort_keys=True, ensure_ascii=False, default=str) for i in ordem]
+    montadas: Dict[str, object] = {}
+    def montar(n: int, renderizar):
+        if chaves[n] not in montadas:
+            with etapa("termica.etiqueta", formato=formato):
+                montadas[chaves[n]] = renderizar(gen.operacoes(lista[ordem[n]], logo_path, usar_img))
+        if progresso: progresso(ETAPA_TERMICA, n + 1, len(ordem))
+        return montadas[chaves[n]]
+
+    if formato == 'zpl':
+        zpl = GeradorZPL(gen.cfg.LARGURA, gen.cfg.ALTURA, dpi)
+        corpo = []
+        n = 0
+        while n < len(ordem):
+            # Sequência de etiquetas iguais vira uma só com ^PQ (quantidade)
+            fim = n + 1
+            while fim < len(ordem) and chaves[fim] == chaves[n]: fim += 1
+            ops = montar(n, list)
+            if progresso and fim - n > 1: progresso(ETAPA_TERMICA, fim, len(ordem))
+            corpo.append(zpl.etiqueta(ops, copias=fim - n))
+            n = fim
+        conteudo = (zpl.cabecalho() + ''.join(corpo) + zpl.rodape()).encode('utf-8')
+        with etapa("termica.salvar"):
+            if isinstance(destino, (str, os.PathLike)):
+                with open(destino, 'wb') as f:
+                    f.write(conteudo)
+            else:
+                destino.write(conteudo)
+        logger.info(f"ZPL gerado: {destino} ({len(ordem)} etiqueta(s), {dpi} dpi, "
+                    f"{descrever_tamanho(len(conteudo), len(ordem))})")
+        return len(ordem)
+
+    renderizador = RenderizadorMonocromatico(gen.cfg.LARGURA, gen.cfg.ALTURA, dpi)
+    base, extensao = os.path.splitext(os.fspath(destino))
+    for n in range(len(ordem)):
+        img = montar(n, renderizador.renderizar)
+        caminho = destino if len(ordem) == 1 else f"{base}-{n + 1:04d}{extensao or '.png'}"
+        with etapa("termica.salvar"):
+            img.save(caminho, format='PNG', dpi=(dpi, dpi), optimize=True)
+    logger.info(f"PNG gerado: {destino} ({len(ordem)} arquivo(s) de {renderizador.tamanho[0]}x{renderizador.tamanho[1]}, {dpi} dpi)")
+    return len(ordem)
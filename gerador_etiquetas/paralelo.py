@@ -0,0 +1,145 @@
+"""Renderização paralela de lotes grandes.
+
+O lote é planejado em páginas, as páginas são fatiadas em blocos de tamanho fixo
+e cada fatia é desenhada em um processo separado. As fatias são unidas na ordem
+original. Como o fatiamento depende só de `paginas_por_fatia` (nunca do número de
+processos) e os canvases usam `invariant=1`, o PDF final é idêntico byte a byte
+para qualquer quantidade de trabalhadores.
+"""
+import io
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from .folha import FOLHA_PADRAO, LayoutFolha
+from .imagens import CacheImagens, cache_compartilhado
+from .instrumentacao import etapa, iniciar_processo_trabalhador, registro
+from .pdf import ETAPA_PAGINAS, Compactacao, GeradorPDF, planejar_paginas
+
+# Tenta importar pypdf (necessário para unir as fatias)
+try:
+    from pypdf import PdfWriter, PdfReader
+    HAS_PYPDF = True
+except ImportError:
+    HAS_PYPDF = False
+
+logger = logging.getLogger("FortunneApp")
+
+PAGINAS_POR_FATIA = 25
+
+
+def _fatiar(lista: List[Dict], paginas: List[List[Tuple[int, int]]],
+            paginas_por_fatia: int) -> List[Tuple[List[Dict], List[List[Tuple[int, int]]]]]:
+    """Divide as páginas em fatias, levando só as etiquetas usadas por cada fatia (reindexadas)"""
+    fatias = []
+    for inicio in range(0, len(paginas), paginas_por_fatia):
+        bloco = paginas[inicio:inicio + paginas_por_fatia]
+        etiquetas, novos_idx = [], {}
+        reindexado = []
+        for pagina in bloco:
+            nova = []
+            for pos, idx in pagina:
+                if idx not in novos_idx:
+                    novos_idx[idx] = len(etiquetas)
+                    etiquetas.append(lista[idx])
+                nova.append((pos, novos_idx[idx]))
+            reindexado.append(nova)
+        fatias.append((etiquetas, reindexado))
+    return fatias
+
+
+def _renderizar_fatia(etiquetas, paginas, logo_path, usar_img, folha=FOLHA_PADRAO, compactacao=None,
+                      imagens: Optional[Tuple] = None) -> bytes:
+    """Executado no processo trabalhador: desenha uma fatia e devolve o PDF em bytes.
+
+    `imagens` é (pasta, alvo, qualidade) do cache de fotos do processo principal.
+    """
+    buffer = io.BytesIO()
+    gen = GeradorPDF(cache_compartilhado(*imagens) if imagens else None, folha=folha, compactacao=compactacao)
+    c = gen.criar_canvas(buffer, invariant=1)
+    gen.desenhar_paginas(c, etiquetas, paginas, logo_path, usar_img)
+    c.save()
+    return buffer.getvalue()
+
+
+def _renderizar_fatia_trabalhador(*args) -> Tuple[bytes, Dict[str, List[float]]]:
+    """`_renderizar_fatia` em um processo trabalhador: devolve também as etapas medidas nele"""
+    pdf = _renderizar_fatia(*args)
+    return pdf, registro.extrair()
+
+
+def _unir_fatias(pdfs: List[bytes], destino, deduplicar: bool = False):
+    writer = PdfWriter()
+    for dados in pdfs:
+        writer.append(PdfReader(io.BytesIO(dados)))
+    if deduplicar:
+        # Cada fatia traz sua cópia da moldura, do logo e das fotos repetidas; une as idênticas
+        writer.compress_identical_objects(remove_identicals=True, remove_orphans=True)
+    if isinstance(destino, (str, os.PathLike)):
+        with open(destino, 'wb') as f:
+            writer.write(f)
+    else:
+        writer.write(destino)
+
+
+def gerar_pdf_paralelo(lista: List[Dict], destino, logo_path: str = '', usar_img: bool = True,
+                       mapeamento: Optional[Dict[int, int]] = None, incluir_restantes: bool = True,
+                       trabalhadores: Optional[int] = None,
+                       paginas_por_fatia: int = PAGINAS_POR_FATIA, progresso=None,
+                       folha: Optional[LayoutFolha] = None, compactacao: Optional[Compactacao] = None,
+                       imagens: Optional[CacheImagens] = None) -> int:
+    """Gera o PDF do lote em vários processos e devolve o nº de páginas.
+
+    `progresso(etapa, feitos, total)` é chamado a cada fatia pronta, em ordem.
+    `imagens` é o cache de fotos a usar (pasta, tamanho e qualidade valem também
+    para os trabalhadores); o padrão é o da folha e da compactação.
+    """
+    if not HAS_PYPDF:
+        raise RuntimeError("Instale pypdf para usar a geração paralela.")
+
+    folha = folha or FOLHA_PADRAO
+    # Reduz as fotos antes de repartir o lote: os trabalhadores só leem do cache em disco
+    with etapa("imagens.preparar_lote"):
+        gen = GeradorPDF(imagens, folha=folha, compactacao=compactacao)
+        for futuro in gen.preparar_imagens(lista, usar_img):
+            futuro.result()
+    cache = (gen.imagens.diretorio, gen.imagens.alvo, gen.imagens.qualidade)
+
+    paginas = planejar_paginas(len(lista), mapeamento, incluir_restantes, folha.por_folha)
+    fatias = _fatiar(lista, paginas, max(1, paginas_por_fatia))
+    trabalhadores = min(trabalhadores or os.cpu_count() or 1, len(fatias)) or 1
+
+    pdfs: List[bytes] = []
+    prontas = 0
+
+    def fatia_pronta(pdf: bytes, paginas_fatia):
+        nonlocal prontas
+        pdfs.append(pdf)
+        prontas += len(paginas_fatia)
+        if progresso: progresso(ETAPA_PAGINAS, prontas, len(paginas))
+
+    with etapa("pdf.fatias", fatias=len(fatias), trabalhadores=trabalhadores):
+        if trabalhadores == 1:
+            for e, p in fatias:
+                fatia_pronta(_renderizar_fatia(e, p, logo_path, usar_img, folha, compactacao, cache), p)
+        else:
+            pool = ProcessPoolExecutor(max_workers=trabalhadores, initializer=iniciar_processo_trabalhador,
+                                       initargs=(logging.getLogger().getEffectiveLevel(),))
+            try:
+                futuros = [pool.submit(_renderizar_fatia_trabalhador, e, p, logo_path, usar_img, folha, compactacao, cache)
+                           for e, p in fatias]
+                for futuro, (_, p) in zip(futuros, fatias):
+                    pdf, duracoes = futuro.result()
+                    # As etapas dos trabalhadores entram no resumo da execução, ao lado das do pai
+                    registro.incorporar(duracoes)
+                    fatia_pronta(pdf, p)
+            finally:
+                # Num cancelamento (exceção do callback), as fatias ainda na fila são descartadas
+                pool.shutdown(wait=True, cancel_futures=True)
+
+    with etapa("pdf.unir_fatias"):
+        _unir_fatias(pdfs, destino, deduplicar=compactacao is not None)
+    logger.info(f"PDF gerado: {destino} ({len(lista)} etiqueta(s), {len(paginas)} página(s), "
+                f"{len(fatias)} fatia(s), {trabalhadores} processo(s))")
+    return len(paginas)
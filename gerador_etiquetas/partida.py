@@ -0,0 +1,72 @@
+"""Tempo de partida do aplicativo, até a primeira janela aparecer.
+
+`__main__` importa este módulo antes de qualquer outro, então `INICIO` marca o
+começo do código Python. O tempo antes disso (carregar o interpretador e, no
+executável do PyInstaller, o bootloader) vem de `segundos_desde_criacao`, que
+pergunta ao sistema quando o processo foi criado.
+
+    python -m gerador_etiquetas --medir-partida
+"""
+import os
+import sys
+import time
+from typing import List, Optional, Tuple
+
+INICIO = time.perf_counter()
+_marcas: List[Tuple[str, float]] = []
+
+
+def marcar(etapa: str):
+    _marcas.append((etapa, time.perf_counter()))
+
+
+def segundos_desde_criacao() -> Optional[float]:
+    """Segundos desde a criação do processo (None se o sistema não informar)"""
+    try:
+        if sys.platform == 'win32':
+            return _desde_criacao_windows()
+        if os.path.exists('/proc/self/stat'):
+            return _desde_criacao_linux()
+    except (OSError, ValueError, AttributeError):
+        pass
+    return None
+
+
+def _desde_criacao_windows() -> float:
+    import ctypes
+    from ctypes import wintypes
+    criacao, saida, kernel, usuario, agora = (wintypes.FILETIME() for _ in range(5))
+    k32 = ctypes.windll.kernel32
+    if not k32.GetProcessTimes(k32.GetCurrentProcess(), ctypes.byref(criacao), ctypes.byref(saida),
+                               ctypes.byref(kernel), ctypes.byref(usuario)):
+        raise OSError("GetProcessTimes falhou")
+    k32.GetSystemTimeAsFileTime(ctypes.byref(agora))
+
+    def para_int(ft):  # FILETIME em unidades de 100 ns
+        return (ft.dwHighDateTime << 32) | ft.dwLowDateTime
+    return (para_int(agora) - para_int(criacao)) / 1e7
+
+
+def _desde_criacao_linux() -> float:
+    with open('/proc/self/stat') as f:
+        # O nome do processo (2º campo) pode ter espaços; os campos seguintes vêm depois do ')'
+        campos = f.read().rsplit(')', 1)[1].split()
+    inicio_ticks = int(campos[19])  # starttime, 22º campo
+    with open('/proc/uptime') as f:
+        uptime = float(f.read().split()[0])
+    return uptime - inicio_ticks / os.sysconf('SC_CLK_TCK')
+
+
+def relatorio() -> str:
+    """Tempos de cada etapa desde o início do código Python, e o total desde a criação do processo"""
+    partes = []
+    anterior = INICIO
+    for etapa, instante in _marcas:
+        partes.append(f"{etapa} +{(instante - anterior) * 1000:.0f} ms")
+        anterior = instante
+    total_python = (anterior - INICIO) * 1000
+    texto = f"Partida: {total_python:.0f} ms desde o início do Python ({', '.join(partes)})"
+    desde_criacao = segundos_desde_criacao()
+    if desde_criacao is not None:
+        texto += f"; {desde_criacao * 1000:.0f} ms desde a criação do processo"
+    return texto
@@ -0,0 +1,194 @@
+import os
+import json
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .config import DPI_IMPRESSAO, EtiquetaConfig
+from .folha import FOLHA_PADRAO, LayoutFolha
+from .imagens import QUALIDADE_JPEG, CacheImagens, cache_padrao, cache_reduzido
+from .layout import CAMPOS_LAYOUT, operacoes_estaticas, operacoes_variaveis, resolver_imagem
+from .backends import desenhar_reportlab, RenderizadorPIL
+from .instrumentacao import etapa
+
+logger = logging.getLogger("FortunneApp")
+
+ETAPA_PAGINAS = "Páginas desenhadas"  # nome da etapa passado aos callbacks de progresso
+
+# === IMPOSIÇÃO AUTOMÁTICA ===
+def planejar_paginas(total: int, mapeamento: Optional[Dict[int, int]] = None,
+                     incluir_restantes: bool = True,
+                     por_pagina: int = FOLHA_PADRAO.por_folha) -> List[List[Tuple[int, int]]]:
+    """Distribui as etiquetas em páginas, devolvendo [(posição, índice), ...] por página.
+
+    O mapeamento manual (posição -> índice) define a primeira folha; as etiquetas
+    que ele não usa seguem, em ordem, para as folhas seguintes. Um mapeamento sem
+    nenhuma posição válida é ignorado (com aviso no log), em vez de gerar um PDF vazio.
+    """
+    paginas = []
+    usados = set()
+    if mapeamento:
+        primeira = [(pos, idx) for pos, idx in sorted(mapeamento.items())
+                    if 0 <= pos < por_pagina and 0 <= idx < total]
+        if primeira:
+            paginas.append(primeira)
+            usados = {idx for _, idx in primeira}
+        else:
+            logger.warning(f"Mapeamento de posições sem nenhuma posição válida ({mapeamento}); "
+                           "usando a distribuição automática")
+            mapeamento = None
+
+    if not mapeamento or incluir_restantes:
+        restantes = [i for i in range(total) if i not in usados]
+        for inicio in range(0, len(restantes), por_pagina):
+            paginas.append(list(enumerate(restantes[inicio:inicio + por_pagina])))
+    return paginas
+
+def impressao_digital(moldura: str, dados: Dict, imagem: Optional[str]) -> str:
+    """Hash do que aparece na etiqueta: moldura (config + logo), campos usados e foto.
+
+    A foto entra pelo arquivo resolvido e pela data/tamanho do original (o cache de
+    imagens atualiza a data das cópias reduzidas a cada uso, então ela não serve).
+    """
+    foto = None
+    if imagem:
+        try:
+            st = os.stat(dados.get('imagem') or imagem)
+            foto = [imagem, st.st_mtime_ns, st.st_size]
+        except OSError:
+            foto = [imagem]
+    conteudo = json.dumps([moldura, {k: dados.get(k) for k in CAMPOS_LAYOUT}, foto],
+                          sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.md5(conteudo.encode('utf-8')).hexdigest()[:16]
+
+# === SAÍDA COMPACTA ===
+@dataclass(frozen=True)
+class Compactacao:
+    """PDF menor para envio: streams comprimidos, cada imagem uma vez só e fotos na qualidade/DPI dados.
+
+    Fotos e logo passam pelo cache de imagens, cujos arquivos são nomeados pelo hash do
+    conteúdo: a mesma imagem vinda de caminhos diferentes vira um único objeto no PDF.
+    """
+    qualidade_jpeg: int = QUALIDADE_JPEG
+    dpi: int = DPI_IMPRESSAO
+
+    def __post_init__(self):
+        if not 1 <= self.qualidade_jpeg <= 95: raise ValueError("Qualidade JPEG deve estar entre 1 e 95")
+        if self.dpi < 36: raise ValueError("DPI das imagens deve ser pelo menos 36")
+
+    def cache(self, cfg: Optional[EtiquetaConfig] = None) -> CacheImagens:
+        return cache_reduzido(self.dpi, self.qualidade_jpeg, cfg)
+
+
+COMPACTACAO_ENVIO = Compactacao(qualidade_jpeg=75, dpi=150)
+
+# === MOTOR DE GERAÇÃO PDF ===
+class GeradorPDF:
+    def __init__(self, imagens: Optional[CacheImagens] = None, folha: Optional[LayoutFolha] = None,
+                 compactacao: Optional[Compactacao] = None):
+        self.folha = folha or FOLHA_PADRAO
+        self.cfg = self.folha.config_etiqueta()
+        self.compactacao = compactacao
+        # Fotos reduzidas para a área de imagem desta folha (o tamanho entra na chave do cache)
+        self.imagens = imagens or (compactacao.cache(self.cfg) if compactacao else cache_padrao(self.cfg))
+
+    def criar_canvas(self, destino, **opcoes):
+        """Canvas do reportlab no tamanho da folha (com compressão de página no modo compacto)"""
+        from reportlab.pdfgen import canvas
+        if self.compactacao: opcoes.setdefault('pageCompression', 1)
+        return canvas.Canvas(destino, pagesize=self.folha.pagina, **opcoes)
+
+    def preparar_imagens(self, lista, usar_img=True):
+        """Começa a reduzir as fotos do lote em segundo plano; devolve os futures"""
+        if not usar_img: return []
+        return self.imagens.prefetch(d.get('imagem', '') for d in lista)
+
+    def posicoes_folha(self) -> List[Tuple[float, float]]:
+        """Cantos inferiores esquerdos das posições da folha, em ordem de leitura"""
+        return self.folha.posicoes()
+
+    def gerar_paginas(self, c, lista, logo_path, usar_img, mapeamento=None,
+                      incluir_restantes=True, progresso=None) -> int:
+        """Imprime o lote inteiro no canvas, abrindo quantas páginas forem necessárias"""
+        paginas = planejar_paginas(len(lista), mapeamento, incluir_restantes, self.folha.por_folha)
+        self.desenhar_paginas(c, lista, paginas, logo_path, usar_img, progresso)
+        return len(paginas)
+
+    def desenhar_paginas(self, c, lista, paginas, logo_path, usar_img, progresso=None):
+        """Desenha páginas já planejadas ([(posição, índice), ...] por página).
+
+        `progresso(etapa, feitos, total)` é chamado a cada página pronta.
+        """
+        posicoes = self.posicoes_folha()
+        for n, pagina in enumerate(paginas, 1):
+            for pos, idx in pagina:
+                x, y = posicoes[pos]
+                self.desenhar_layout(c, x, y, lista[idx], logo_path, usar_img)
+            c.showPage()
+            if progresso: progresso(ETAPA_PAGINAS, n, len(paginas))
+
+    def desenhar_layout(self, c, x, y, dados, logo_path, usar_img):
+        """Desenha uma etiqueta individual, reaproveitando o form de etiquetas idênticas"""
+        nome_forma = self._forma_etiqueta(c, dados, logo_path, usar_img)
+        c.saveState()
+        c.translate(x, y)
+        c.doForm(nome_forma)
+        c.restoreState()
+
+    def _forma_etiqueta(self, c, dados, logo_path, usar_img) -> str:
+        """Nome do form XObject com a etiqueta inteira, criando-o na primeira vez.
+
+        Cópias do modo manual e produtos repetidos na planilha têm a mesma impressão
+        digital: a etiqueta é desenhada uma vez e as demais posições só a referenciam.
+        """
+        moldura = self._forma_estatica(c, logo_path)
+        with etapa("imagens.obter"):
+            imagem = resolver_imagem(dados, usar_img, self.imagens)
+        nome = "Etiqueta_" + impressao_digital(moldura, dados, imagem)
+        if not c.hasForm(nome):
+            with etapa("pdf.layout"):
+                ops = operacoes_variaveis(self.cfg, dados, imagem)
+            with etapa("pdf.desenhar_etiqueta"):
+                c.beginForm(nome, 0, 0, self.cfg.LARGURA, self.cfg.ALTURA)
+                c.doForm(moldura)
+                desenhar_reportlab(c, ops)
+                c.endForm()
+        return nome
+
+    def _forma_estatica(self, c, logo_path) -> str:
+        """Nome do form XObject com a moldura fixa da etiqueta, criando-o na primeira vez.
+
+        Fundo, bordas, caixas, títulos das caixas e logo não mudam entre etiquetas com a
+        mesma configuração e logo; são desenhados uma vez por documento e reaproveitados.
+        """
+        logo = self._logo_valido(logo_path)
+        assinatura = repr((self.cfg, os.path.abspath(logo) if logo else None,
+                           os.path.getmtime(logo) if logo else None))
+        nome = "Moldura_" + hashlib.md5(assinatura.encode('utf-8')).hexdigest()[:12]
+        if not c.hasForm(nome):
+            # Assinatura pelo logo original; o reduzido do cache tem a data mudada a cada uso
+            if logo and self.compactacao: logo = self.imagens.obter(logo) or logo
+            c.beginForm(nome, 0, 0, self.cfg.LARGURA, self.cfg.ALTURA)
+            desenhar_reportlab(c, operacoes_estaticas(self.cfg, logo))
+            c.endForm()
+        return nome
+
+    def _logo_valido(self, logo_path) -> Optional[str]:
+        return logo_path if logo_path and os.path.exists(logo_path) else None
+
+    def operacoes(self, dados, logo_path, usar_img) -> List:
+        """Todas as operações de desenho da etiqueta, na origem"""
+        imagem = resolver_imagem(dados, usar_img, self.imagens)
+        return (operacoes_estaticas(self.cfg, self._logo_valido(logo_path)) +
+                operacoes_variaveis(self.cfg, dados, imagem))
+
+    def gerar_preview(self, dados, logo_path, usar_img, width=400):
+        """Rasteriza a etiqueta direto em PIL, na largura pedida (em pixels)"""
+        try:
+            renderizador = RenderizadorPIL(self.cfg.LARGURA, self.cfg.ALTURA, width)
+            with etapa("preview.renderizar"):
+                return renderizador.renderizar(self.operacoes(dados, logo_path, usar_img))
+        except Exception as e:
+            logger.error(f"Erro ao gerar preview: {e}")
+            return None
@@ -0,0 +1,147 @@
+"""Leitura de planilhas de produtos (.xlsx, .csv, .parquet) e geração do modelo.
+
+A conversão em etiquetas é feita por coluna, sobre blocos de linhas: `iterar_planilha`
+lê o arquivo aos poucos (openpyxl em modo somente leitura, `chunksize` do CSV,
+lotes do Parquet) e devolve as etiquetas uma a uma, sem carregar a planilha
+inteira. Tamanhos vêm de quantos grupos `TamN`/`MedN`/`CodN` existirem.
+"""
+import os
+import re
+import csv
+from itertools import islice
+from typing import Dict, Iterator, List
+
+import pandas as pd
+
+from .instrumentacao import etapa
+
+LINHAS_POR_BLOCO = 5000
+GRUPOS_TAMANHO_MODELO = 3
+
+_COLUNA_TAMANHO = re.compile(r'^Tam(\d+)$')
+
+
+# === LEITURA ===
+def ler_planilha(caminho: str, campos: List[str]) -> List[Dict]:
+    """Converte cada linha da planilha em um dicionário de etiqueta"""
+    return list(iterar_planilha(caminho, campos))
+
+
+def iterar_planilha(caminho: str, campos: List[str], linhas_por_bloco: int = LINHAS_POR_BLOCO) -> Iterator[Dict]:
+    """Etiquetas da planilha, lidas em blocos de `linhas_por_bloco` linhas"""
+    blocos = _ler_blocos(caminho, linhas_por_bloco)
+    while True:
+        with etapa("planilha.ler_bloco"):
+            bloco = next(blocos, None)
+        if bloco is None: return
+        with etapa("planilha.converter", linhas=len(bloco)):
+            etiquetas = converter_bloco(bloco, campos)
+        yield from etiquetas
+
+
+def _ler_blocos(caminho: str, linhas_por_bloco: int) -> Iterator[pd.DataFrame]:
+    # Tudo é lido como objeto/texto: códigos não viram float ("123.0") nem perdem zeros à esquerda
+    ext = os.path.splitext(caminho)[1].lower()
+    if ext in ('.csv', '.txt'):
+        yield from pd.read_csv(caminho, sep=_delimitador(caminho), dtype=str, encoding='utf-8-sig',
+                               chunksize=linhas_por_bloco)
+    elif ext == '.parquet':
+        import pyarrow.parquet as pq
+        for lote in pq.ParquetFile(caminho).iter_batches(batch_size=linhas_por_bloco):
+            yield pd.DataFrame(lote.to_pydict(), dtype=object)
+    elif ext in ('.xlsx', '.xlsm'):
+        yield from _blocos_xlsx(caminho, linhas_por_bloco)
+    else:
+        yield pd.read_excel(caminho, dtype=object)
+
+
+def _blocos_xlsx(caminho: str, linhas_por_bloco: int) -> Iterator[pd.DataFrame]:
+    from openpyxl import load_workbook
+    wb = load_workbook(caminho, read_only=True, data_only=True)
+    try:
+        linhas = wb.worksheets[0].iter_rows(values_only=True)
+        cabecalho = next(linhas, None)
+        if cabecalho is None: return
+        colunas = _nomes_colunas(cabecalho)
+        n = len(colunas)
+        while True:
+            # Sem a dimensão da planilha no arquivo, o openpyxl corta as células vazias do fim da linha
+            bloco = [tuple(linha[:n]) + (None,) * (n - len(linha)) for linha in islice(linhas, linhas_por_bloco)]
+            if not bloco: break
+            yield pd.DataFrame(bloco, columns=colunas, dtype=object)
+    finally:
+        wb.close()
+
+
+def _nomes_colunas(cabecalho) -> List[str]:
+    """Mesmos nomes que o pandas daria: 'Unnamed: i' para vazios e '.1', '.2'... nos repetidos"""
+    colunas, vistos = [], {}
+    for i, c in enumerate(cabecalho):
+        nome = str(c) if c is not None else f"Unnamed: {i}"
+        if nome in vistos:
+            vistos[nome] += 1
+            nome = f"{nome}.{vistos[nome]}"
+        else:
+            vistos[nome] = 0
+        colunas.append(nome)
+    return colunas
+
+
+def _delimitador(caminho: str) -> str:
+    """Vírgula ou ponto e vírgula (o Excel em português exporta CSV com ';')"""
+    with open(caminho, 'r', encoding='utf-8-sig', newline='') as f:
+        amostra = f.read(64 * 1024)
+    try:
+        return csv.Sniffer().sniff(amostra, delimiters=',;\t|').delimiter
+    except csv.Error:
+        return ','
+
+
+# === CONVERSÃO ===
+def _texto(df: pd.DataFrame, coluna: str) -> pd.Series:
+    """Coluna convertida para texto, com '' nas células vazias (ou ausentes)"""
+    if coluna not in df.columns: return pd.Series('', index=df.index, dtype=object)
+    serie = df[coluna]
+    return serie.astype(str).where(serie.notna(), '')
+
+
+def grupos_tamanho(colunas) -> List[int]:
+    """Números N dos grupos TamN presentes, em ordem"""
+    return sorted(int(m.group(1)) for m in map(_COLUNA_TAMANHO.match, map(str, colunas)) if m)
+
+
+def converter_bloco(df: pd.DataFrame, campos: List[str]) -> List[Dict]:
+    """Etiquetas de um bloco de linhas; linhas sem Produto são ignoradas"""
+    if 'Produto' not in df.columns: return []
+    df = df[df['Produto'].notna()]
+    if df.empty: return []
+
+    produtos = df['Produto'].astype(str).to_numpy()
+    fornecedores = _texto(df, 'Fornecedor').to_numpy()
+    prazos = _texto(df, 'Prazo').to_numpy()
+    imagens = _texto(df, 'Imagem').to_numpy()
+
+    # Cada spec vira "Campo: valor" de uma vez para a coluna inteira; '' onde está vazia
+    specs = [(f"{c}: " + _texto(df, c)).where(df[c].notna(), '').to_numpy()
+             for c in campos if c in df.columns]
+    grupos = [(_texto(df, f'Tam{n}').to_numpy(), _texto(df, f'Med{n}').to_numpy(), _texto(df, f'Cod{n}').to_numpy(),
+               df[f'Tam{n}'].notna().to_numpy())
+              for n in grupos_tamanho(df.columns)]
+
+    lista = []
+    for i in range(len(df)):
+        d = {'Produto': produtos[i], 'Fornecedor': fornecedores[i], 'Prazo': prazos[i]}
+        d['specs_list'] = [col[i] for col in specs if col[i]]
+        d['tamanhos'] = [{'tamanho': tam[i], 'medida': med[i], 'codigo': cod[i]}
+                         for tam, med, cod, presente in grupos if presente[i]]
+        if imagens[i]: d['imagem'] = imagens[i]
+        lista.append(d)
+    return lista
+
+
+# === MODELO ===
+def gerar_modelo(caminho: str, campos: List[str], grupos: int = GRUPOS_TAMANHO_MODELO):
+    """Grava uma planilha vazia com as colunas esperadas para o tipo de produto"""
+    tamanhos = [f'{prefixo}{n}' for n in range(1, grupos + 1) for prefixo in ('Tam', 'Med', 'Cod')]
+    cols = ['Produto', 'Fornecedor', 'Prazo'] + campos + tamanhos + ['Imagem']
+    pd.DataFrame(columns=cols).to_excel(caminho, index=False)
@@ -0,0 +1,174 @@
+"""Preview ao vivo e miniaturas do lote: renderização em segundo plano com cache.
+
+Não depende de Tk. A interface chama `solicitar()` (depois do debounce) e consulta
+`resultado()` periodicamente via `root.after`; só o pedido mais recente é entregue.
+`MiniaturasLote` faz o mesmo para a grade de miniaturas da janela de posições.
+"""
+import os
+import json
+import queue
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from .pdf import GeradorPDF
+
+logger = logging.getLogger("FortunneApp")
+
+TAMANHO_CACHE_PREVIEW = 64
+TAMANHO_CACHE_MINIATURAS = 512
+TRABALHADORES_MINIATURAS = 2
+
+
+def _assinatura_arquivo(caminho: str):
+    try:
+        st = os.stat(caminho)
+        return [caminho, st.st_mtime_ns, st.st_size]
+    except (OSError, TypeError, ValueError):
+        return [caminho]
+
+
+def chave_preview(dados: Dict, logo_path: str, usar_img: bool, largura: int) -> str:
+    """Hash do formulário + logo + opção de imagem (inclui a data dos arquivos usados)"""
+    conteudo = json.dumps([dados, _assinatura_arquivo(dados.get('imagem', '')),
+                           _assinatura_arquivo(logo_path), bool(usar_img), largura],
+                          sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(conteudo.encode('utf-8')).hexdigest()
+
+
+class PreviewAoVivo:
+    def __init__(self, gerador: Optional[GeradorPDF] = None, largura: int = 320,
+                 tamanho_cache: int = TAMANHO_CACHE_PREVIEW):
+        self.gerador = gerador or GeradorPDF()
+        self.largura = largura
+        self.tamanho_cache = tamanho_cache
+        self._cache: "OrderedDict[str, object]" = OrderedDict()
+        self._resultados: "queue.Queue[Tuple[int, object]]" = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="preview")
+        self._lock = threading.Lock()
+        self._geracao = 0
+        self._pendente: Optional[Future] = None
+
+    def solicitar(self, dados: Dict, logo_path: str, usar_img: bool):
+        """Devolve a imagem na hora se estiver no cache; senão agenda a renderização e devolve None"""
+        chave = chave_preview(dados, logo_path, usar_img, self.largura)
+        with self._lock:
+            self._geracao += 1
+            geracao = self._geracao
+            if self._pendente is not None:
+                self._pendente.cancel()
+                self._pendente = None
+            img = self._cache.get(chave)
+            if img is not None:
+                self._cache.move_to_end(chave)
+                return img
+            self._pendente = self._executor.submit(self._renderizar, geracao, chave, dict(dados), logo_path, usar_img)
+        return None
+
+    def resultado(self):
+        """Imagem do pedido mais recente, se já ficou pronta (descarta as obsoletas)"""
+        ultimo = None
+        while True:
+            try:
+                geracao, img = self._resultados.get_nowait()
+            except queue.Empty:
+                break
+            if geracao == self._geracao:
+                ultimo = img
+        return ultimo
+
+    @property
+    def ocupado(self) -> bool:
+        pendente = self._pendente
+        return (pendente is not None and not pendente.done()) or not self._resultados.empty()
+
+    def trocar_gerador(self, gerador: GeradorPDF):
+        """Passa a renderizar com outro gerador (ex.: outra folha); descarta o cache e pedidos em curso"""
+        with self._lock:
+            self.gerador = gerador
+            self._cache.clear()
+            self._geracao += 1
+
+    def encerrar(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _renderizar(self, geracao, chave, dados, logo_path, usar_img):
+        if geracao != self._geracao:
+            return
+        gerador = self.gerador
+        img = gerador.gerar_preview(dados, logo_path, usar_img, width=self.largura)
+        if img is None:
+            return
+        with self._lock:
+            if gerador is not self.gerador: return  # trocado durante a renderização
+            self._cache[chave] = img
+            self._cache.move_to_end(chave)
+            while len(self._cache) > self.tamanho_cache:
+                self._cache.popitem(last=False)
+        if geracao == self._geracao:
+            self._resultados.put((geracao, img))
+
+
+class MiniaturasLote:
+    """Miniaturas das etiquetas de um lote, renderizadas sob demanda em um pool.
+
+    A interface pede só as que estão visíveis (`obter`) e consulta depois
+    (`pronta`); as que saíram da tela podem ser canceladas antes de começar.
+    O cache é limitado e indexado pelo conteúdo da etiqueta (`chave_preview`),
+    então etiquetas repetidas no lote são renderizadas uma vez só.
+    """
+    def __init__(self, gerador: GeradorPDF, logo_path: str, usar_img: bool,
+                 trabalhadores: int = TRABALHADORES_MINIATURAS, tamanho_cache: int = TAMANHO_CACHE_MINIATURAS):
+        self.gerador = gerador
+        self.logo_path = logo_path
+        self.usar_img = usar_img
+        self.tamanho_cache = tamanho_cache
+        self._cache: "OrderedDict[str, object]" = OrderedDict()
+        self._pendentes: Dict[str, Future] = {}
+        self._executor = ThreadPoolExecutor(max_workers=trabalhadores, thread_name_prefix="miniaturas")
+        self._lock = threading.Lock()
+
+    def obter(self, dados: Dict, largura: int) -> Tuple[str, Optional[object]]:
+        """(chave, imagem) se já estiver no cache; senão agenda a renderização e devolve (chave, None)"""
+        chave = chave_preview(dados, self.logo_path, self.usar_img, largura)
+        with self._lock:
+            img = self._cache.get(chave)
+            if img is not None:
+                self._cache.move_to_end(chave)
+            elif chave not in self._pendentes:
+                self._pendentes[chave] = self._executor.submit(self._renderizar, chave, dict(dados), largura)
+        return chave, img
+
+    def pronta(self, chave: str):
+        with self._lock:
+            return self._cache.get(chave)
+
+    def pendente(self, chave: str) -> bool:
+        """Ainda na fila ou renderizando (False também para as que falharam ou foram canceladas)"""
+        with self._lock:
+            return chave in self._pendentes
+
+    def cancelar(self, chaves):
+        """Tira da fila as que ainda não começaram (as em andamento terminam e vão para o cache)"""
+        with self._lock:
+            for chave in chaves:
+                futuro = self._pendentes.get(chave)
+                if futuro is not None and futuro.cancel(): del self._pendentes[chave]
+
+    def encerrar(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _renderizar(self, chave, dados, largura):
+        img = None
+        try:
+            img = self.gerador.gerar_preview(dados, self.logo_path, self.usar_img, width=largura)
+        finally:
+            with self._lock:
+                self._pendentes.pop(chave, None)
+                if img is not None:
+                    self._cache[chave] = img
+                    while len(self._cache) > self.tamanho_cache:
+                        self._cache.popitem(last=False)
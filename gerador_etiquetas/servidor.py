@@ -0,0 +1,287 @@
+"""Serviço HTTP local de etiquetas, para outros sistemas (ERP, estação de expedição).
+
+Um único processo de vida longa: fontes, medidas de texto e fotos reduzidas ficam
+em cache entre pedidos (a moldura é um form do próprio PDF, então é desenhada uma
+vez por documento), e a renderização roda em um pool de threads limitado. Pedidos
+além da capacidade da fila recebem 503 na hora.
+
+    python -m gerador_etiquetas servir --porta 8765 --logo logo.png --imagens fotos/
+
+    POST /pdf       corpo: etiqueta (formato de `_coletar_manual`) ou lista delas
+                    ?copias=N  ?imagem=0  -> application/pdf
+    POST /preview   corpo: uma etiqueta; ?largura=400  ?imagem=0  -> image/png
+    GET  /saude     -> {"status": "ok", ...}
+
+O campo `imagem` das etiquetas só é aceito com `--imagens`: é um caminho relativo
+a essa pasta e precisa ser um arquivo comum de até `TAMANHO_MAX_IMAGEM` bytes.
+"""
+import io
+import os
+import json
+import stat
+import time
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from .folha import LayoutFolha
+from .instrumentacao import etapa
+from .pdf import GeradorPDF
+from .preview import chave_preview
+
+logger = logging.getLogger("FortunneApp")
+
+PORTA_PADRAO = 8765
+TAMANHO_MAX_CORPO = 8 * 2**20
+PEDIDOS_POR_TRABALHADOR = 4   # fila máxima = trabalhadores x isto
+TEMPO_MAX_PEDIDO_S = 120
+MAX_ETIQUETAS_PEDIDO = 2000   # etiquetas x cópias em um único pedido
+LARGURA_MAX_PREVIEW = 2000
+TAMANHO_CACHE_PNG = 256
+TAMANHO_MAX_IMAGEM = 32 * 2**20
+
+
+class PedidoInvalido(ValueError):
+    """Corpo ou parâmetros do pedido inválidos (vira HTTP 400)"""
+
+
+def resolver_imagem_pedido(caminho: str, pasta_imagens: Optional[str]) -> str:
+    """Caminho real da foto pedida: arquivo comum, dentro de `pasta_imagens` e de tamanho limitado.
+
+    Sem isso um pedido leria qualquer arquivo da máquina para dentro do PDF, ou
+    prenderia um trabalhador para sempre apontando para /dev/zero ou um FIFO.
+    """
+    if not caminho: return ''
+    if not pasta_imagens: raise PedidoInvalido("este serviço não aceita 'imagem' (inicie com --imagens PASTA)")
+    raiz = os.path.realpath(pasta_imagens)
+    real = os.path.realpath(os.path.join(raiz, caminho))
+    try:
+        dentro = os.path.commonpath([raiz, real]) == raiz
+    except ValueError:  # outro drive no Windows
+        dentro = False
+    if not dentro: raise PedidoInvalido("'imagem' fora da pasta de imagens")
+    try:
+        st = os.stat(real)
+    except OSError:
+        raise PedidoInvalido("'imagem' não encontrada")
+    if not stat.S_ISREG(st.st_mode): raise PedidoInvalido("'imagem' deve ser um arquivo comum")
+    if st.st_size > TAMANHO_MAX_IMAGEM: raise PedidoInvalido("'imagem' grande demais")
+    return real
+
+
+def validar_etiqueta(dados, pasta_imagens: Optional[str] = None) -> Dict:
+    """Confere o formato de uma etiqueta recebida (o mesmo de `_coletar_manual`).
+
+    Devolve uma cópia com `imagem` trocado pelo caminho real (ver `resolver_imagem_pedido`).
+    """
+    if not isinstance(dados, dict):
+        raise PedidoInvalido("cada etiqueta deve ser um objeto JSON")
+    if not isinstance(dados.get('Produto'), str) or not dados['Produto'].strip():
+        raise PedidoInvalido("campo 'Produto' obrigatório")
+    for campo in ('Fornecedor', 'Prazo', 'imagem'):
+        if not isinstance(dados.get(campo, ''), str):
+            raise PedidoInvalido(f"campo '{campo}' deve ser texto")
+    specs = dados.get('specs_list', [])
+    if not isinstance(specs, list) or not all(isinstance(s, str) for s in specs):
+        raise PedidoInvalido("'specs_list' deve ser uma lista de textos")
+    tamanhos = dados.get('tamanhos', [])
+    if not isinstance(tamanhos, list) or not all(isinstance(t, dict) for t in tamanhos):
+        raise PedidoInvalido("'tamanhos' deve ser uma lista de objetos")
+    for tamanho in tamanhos:
+        for campo in ('tamanho', 'medida', 'codigo'):
+            if not isinstance(tamanho.get(campo, ''), str):
+                raise PedidoInvalido(f"campo '{campo}' de 'tamanhos' deve ser texto")
+    return dict(dados, imagem=resolver_imagem_pedido(dados.get('imagem', ''), pasta_imagens))
+
+
+class ServicoEtiquetas:
+    """Renderização compartilhada pelos pedidos: pool limitado e caches quentes"""
+    def __init__(self, logo_path: str = '', trabalhadores: int = 2,
+                 tamanho_cache_png: int = TAMANHO_CACHE_PNG, folha: Optional[LayoutFolha] = None,
+                 pasta_imagens: Optional[str] = None):
+        self.logo_path = logo_path
+        self.pasta_imagens = pasta_imagens
+        self.trabalhadores = max(1, trabalhadores)
+        self.gerador = GeradorPDF(folha=folha)
+        self._pool = ThreadPoolExecutor(max_workers=self.trabalhadores, thread_name_prefix="render")
+        self._vagas = threading.BoundedSemaphore(self.trabalhadores * PEDIDOS_POR_TRABALHADOR)
+        self._cache_png: "OrderedDict[str, bytes]" = OrderedDict()
+        self._tamanho_cache_png = tamanho_cache_png
+        self._lock = threading.Lock()
+        self.inicio = time.time()
+        self.atendidos = 0
+
+    def aquecer(self):
+        """Carrega reportlab, fontes e a moldura antes do primeiro pedido"""
+        exemplo = {'Produto': 'Aquecimento', 'Fornecedor': '', 'Prazo': '',
+                   'specs_list': ['Tecido: Linho'], 'tamanhos': [{'tamanho': 'P', 'medida': '1 m', 'codigo': '0'}]}
+        self._gerar_pdf([exemplo], False)
+        self._gerar_png(exemplo, False, 200)
+
+    def pdf(self, etiquetas: List[Dict], usar_img: bool = True) -> Optional[bytes]:
+        return self._executar(self._gerar_pdf, etiquetas, usar_img)
+
+    def png(self, dados: Dict, usar_img: bool = True, largura: int = 400) -> Optional[bytes]:
+        return self._executar(self._gerar_png, dados, usar_img, largura)
+
+    def estado(self) -> Dict:
+        return {"status": "ok", "folha": self.gerador.folha.nome, "trabalhadores": self.trabalhadores, "atendidos": self.atendidos,
+                "ativo_ha_s": round(time.time() - self.inicio, 1), "previews_em_cache": len(self._cache_png)}
+
+    def encerrar(self):
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def _executar(self, funcao, *args) -> Optional[bytes]:
+        """Roda no pool; None se a fila estiver cheia"""
+        if not self._vagas.acquire(blocking=False): return None
+        try:
+            futuro = self._pool.submit(funcao, *args)
+        except BaseException:
+            self._vagas.release()
+            raise
+        # A vaga só volta quando o trabalho termina: um pedido que estourou o tempo
+        # continua ocupando o pool e não pode abrir espaço para outro
+        futuro.add_done_callback(lambda _: self._vagas.release())
+        resultado = futuro.result(timeout=TEMPO_MAX_PEDIDO_S)
+        with self._lock:
+            self.atendidos += 1
+        return resultado
+
+    def _gerar_pdf(self, etiquetas: List[Dict], usar_img: bool) -> bytes:
+        from . import lote
+        buffer = io.BytesIO()
+        with etapa("servidor.pdf", etiquetas=len(etiquetas)):
+            lote.gerar_pdf(etiquetas, buffer, self.logo_path, usar_img, gerador=self.gerador)
+        return buffer.getvalue()
+
+    def _gerar_png(self, dados: Dict, usar_img: bool, largura: int) -> bytes:
+        chave = chave_preview(dados, self.logo_path, usar_img, largura)
+        with self._lock:
+            png = self._cache_png.get(chave)
+            if png is not None:
+                self._cache_png.move_to_end(chave)
+                return png
+        with etapa("servidor.preview"):
+            img = self.gerador.gerar_preview(dados, self.logo_path, usar_img, width=largura)
+            if img is None: raise RuntimeError("falha ao renderizar o preview")
+            buffer = io.BytesIO()
+            img.save(buffer, format='PNG')
+        png = buffer.getvalue()
+        with self._lock:
+            self._cache_png[chave] = png
+            while len(self._cache_png) > self._tamanho_cache_png:
+                self._cache_png.popitem(last=False)
+        return png
+
+
+class _Manipulador(BaseHTTPRequestHandler):
+    servico: ServicoEtiquetas  # definido em `criar_servidor`
+    protocol_version = "HTTP/1.1"  # conexões persistentes: o cliente não reabre TCP a cada etiqueta
+
+    def do_GET(self):
+        self._corpo_lido = False
+        if urlsplit(self.path).path != '/saude':
+            return self._erro(HTTPStatus.NOT_FOUND, "rota desconhecida")
+        self._responder(HTTPStatus.OK, 'application/json', json.dumps(self.servico.estado()).encode('utf-8'))
+
+    def do_POST(self):
+        self._corpo_lido = False
+        url = urlsplit(self.path)
+        parametros = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            corpo = self._ler_json()
+            usar_img = parametros.get('imagem', '1') not in ('0', 'false', 'nao')
+            if url.path == '/pdf':
+                etiquetas = corpo if isinstance(corpo, list) else [corpo]
+                if not etiquetas: raise PedidoInvalido("nenhuma etiqueta enviada")
+                copias = self._inteiro(parametros, 'copias', 1, 1, 1000)
+                if len(etiquetas) * copias > MAX_ETIQUETAS_PEDIDO:
+                    raise PedidoInvalido(f"no máximo {MAX_ETIQUETAS_PEDIDO} etiquetas por pedido (etiquetas x cópias)")
+                etiquetas = [validar_etiqueta(d, self.servico.pasta_imagens) for d in etiquetas] * copias
+                conteudo, tipo = self.servico.pdf(etiquetas, usar_img), 'application/pdf'
+            elif url.path == '/preview':
+                largura = self._inteiro(parametros, 'largura', 400, 50, LARGURA_MAX_PREVIEW)
+                conteudo, tipo = self.servico.png(validar_etiqueta(corpo, self.servico.pasta_imagens), usar_img, largura), 'image/png'
+            else:
+                return self._erro(HTTPStatus.NOT_FOUND, "rota desconhecida")
+        except PedidoInvalido as e:
+            return self._erro(HTTPStatus.BAD_REQUEST, str(e))
+        except Exception as e:
+            logger.error(f"Falha ao atender {url.path}: {e}", exc_info=True)
+            return self._erro(HTTPStatus.INTERNAL_SERVER_ERROR, str(e))
+        if conteudo is None:
+            return self._erro(HTTPStatus.SERVICE_UNAVAILABLE, "fila cheia, tente novamente")
+        self._responder(HTTPStatus.OK, tipo, conteudo)
+
+    def _ler_json(self):
+        try:
+            tamanho = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            raise PedidoInvalido("Content-Length inválido")
+        if tamanho <= 0: raise PedidoInvalido("corpo vazio")
+        if tamanho > TAMANHO_MAX_CORPO: raise PedidoInvalido("corpo grande demais")
+        corpo = self.rfile.read(tamanho)
+        self._corpo_lido = True
+        try:
+            return json.loads(corpo.decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise PedidoInvalido(f"JSON inválido: {e}")
+
+    @staticmethod
+    def _inteiro(parametros: Dict[str, str], nome: str, padrao: int, minimo: int, maximo: int) -> int:
+        try:
+            valor = int(parametros.get(nome, padrao))
+        except ValueError:
+            raise PedidoInvalido(f"'{nome}' deve ser um número inteiro")
+        if not minimo <= valor <= maximo: raise PedidoInvalido(f"'{nome}' deve estar entre {minimo} e {maximo}")
+        return valor
+
+    def _responder(self, status: HTTPStatus, tipo: str, conteudo: bytes):
+        self.send_response(status)
+        self.send_header('Content-Type', tipo)
+        self.send_header('Content-Length', str(len(conteudo)))
+        if self.close_connection: self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(conteudo)
+
+    def _erro(self, status: HTTPStatus, mensagem: str):
+        # Corpo não lido ficaria no socket e seria lido como o próximo pedido da conexão
+        if not self._corpo_lido and self.headers.get('Content-Length', '0') != '0': self.close_connection = True
+        self._responder(status, 'application/json', json.dumps({"erro": mensagem}, ensure_ascii=False).encode('utf-8'))
+
+    def log_message(self, formato, *args):
+        logger.debug(f"{self.address_string()} {formato % args}")
+
+
+def criar_servidor(host: str = '127.0.0.1', porta: int = PORTA_PADRAO,
+                   servico: Optional[ServicoEtiquetas] = None) -> ThreadingHTTPServer:
+    """Servidor pronto para `serve_forever()` (porta 0 escolhe uma porta livre)"""
+    servico = servico or ServicoEtiquetas()
+    manipulador = type('Manipulador', (_Manipulador,), {'servico': servico})
+    servidor = ThreadingHTTPServer((host, porta), manipulador)
+    servidor.daemon_threads = True
+    servidor.servico = servico
+    return servidor
+
+
+def servir(host: str = '127.0.0.1', porta: Optional[int] = None, logo_path: str = '', trabalhadores: int = 2,
+           folha: Optional[LayoutFolha] = None, pasta_imagens: Optional[str] = None):
+    """Aquece os caches e atende até Ctrl+C"""
+    if porta is None: porta = PORTA_PADRAO
+    servico = ServicoEtiquetas(logo_path, trabalhadores, folha=folha, pasta_imagens=pasta_imagens)
+    with etapa("servidor.aquecer"):
+        servico.aquecer()
+    servidor = criar_servidor(host, porta, servico)
+    logger.info(f"Servindo etiquetas em http://{host}:{servidor.server_address[1]} ({servico.trabalhadores} trabalhador(es))")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        servico.encerrar()
@@ -0,0 +1,135 @@
+"""Tarefas longas (leitura da planilha, geração do PDF) fora do loop da interface.
+
+Não depende de Tk. A função da tarefa roda em uma thread própria e recebe a
+`Tarefa`, usando `tarefa.informar(etapa, feitos, total)` como callback de
+progresso. A interface consulta `eventos()` via `root.after`; `cancelar()` faz o
+próximo `informar` levantar `Cancelado`, que encerra a tarefa sem resultado.
+
+    tarefa = Tarefa(lambda t: lote.gerar_pdf(lista, destino, progresso=t.informar))
+    tarefa.iniciar()
+"""
+import os
+import time
+import shutil
+import queue
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+
+logger = logging.getLogger("FortunneApp")
+
+
+class Cancelado(Exception):
+    """A tarefa foi cancelada pelo usuário"""
+
+
+@dataclass(frozen=True)
+class Progresso:
+    etapa: str
+    feitos: int
+    total: Optional[int] = None         # None: total desconhecido (ex.: linhas da planilha)
+    restante_s: Optional[float] = None  # estimativa do tempo que falta para a etapa
+
+
+class Tarefa:
+    def __init__(self, funcao: Callable[["Tarefa"], Any], nome: str = "tarefa"):
+        self.funcao = funcao
+        self.nome = nome
+        self.resultado: Any = None
+        self.erro: Optional[BaseException] = None
+        self.cancelada = False  # terminou por cancelamento (sem resultado)
+        self._eventos: "queue.Queue[Progresso]" = queue.Queue()
+        self._cancelar = threading.Event()
+        self._fim = threading.Event()
+        self._etapa: Optional[str] = None
+        self._inicio_etapa = 0.0
+        self._thread = threading.Thread(target=self._executar, name=nome, daemon=True)
+
+    def iniciar(self) -> "Tarefa":
+        self._thread.start()
+        return self
+
+    def cancelar(self):
+        """Pede o cancelamento; vale a partir do próximo `informar` da função"""
+        self._cancelar.set()
+
+    @property
+    def concluida(self) -> bool:
+        return self._fim.is_set()
+
+    def aguardar(self, timeout: Optional[float] = None) -> bool:
+        return self._fim.wait(timeout)
+
+    def informar(self, etapa: str, feitos: int, total: Optional[int] = None):
+        """Callback de progresso, chamado pela função da tarefa (levanta `Cancelado` se pedido)"""
+        if self._cancelar.is_set(): raise Cancelado()
+        agora = time.perf_counter()
+        if etapa != self._etapa:
+            self._etapa, self._inicio_etapa = etapa, agora
+        restante = None
+        if total and feitos:
+            restante = (agora - self._inicio_etapa) / feitos * (total - feitos)
+        self._eventos.put(Progresso(etapa, feitos, total, restante))
+
+    def eventos(self) -> List[Progresso]:
+        """Progresso informado desde a última consulta (não bloqueia)"""
+        eventos = []
+        while True:
+            try:
+                eventos.append(self._eventos.get_nowait())
+            except queue.Empty:
+                return eventos
+
+    def _executar(self):
+        try:
+            self.resultado = self.funcao(self)
+        except Cancelado:
+            self.cancelada = True
+            logger.info(f"Tarefa '{self.nome}' cancelada")
+        except Exception as e:
+            self.erro = e
+            logger.error(f"Falha na tarefa '{self.nome}': {e}", exc_info=True)
+        finally:
+            self._fim.set()
+
+
+@contextmanager
+def saida_temporaria(destino: str, sufixo: str = '.tmp'):
+    """Caminho temporário na pasta de `destino`; vira `destino` só se o bloco terminar sem erro.
+
+    Cancelamento ou falha apagam o arquivo parcial, e um `destino` já existente
+    só é substituído pelo arquivo completo.
+    """
+    pasta = os.path.dirname(os.path.abspath(destino))
+    fd, temporario = tempfile.mkstemp(prefix=os.path.basename(destino) + '.', suffix=sufixo, dir=pasta)
+    os.close(fd)
+    try:
+        yield temporario
+        os.replace(temporario, destino)
+    except BaseException:
+        try:
+            os.remove(temporario)
+        except OSError:
+            pass
+        raise
+
+
+@contextmanager
+def saidas_temporarias(destino: str):
+    """Como `saida_temporaria`, para saídas de vários arquivos (ex.: `nome-0001.png`...).
+
+    O bloco grava no caminho devolvido, dentro de uma pasta temporária ao lado de
+    `destino`; só se ele terminar sem erro os arquivos gerados vão para a pasta de
+    `destino`. Cancelamento ou falha apagam tudo o que já foi gravado.
+    """
+    pasta = os.path.dirname(os.path.abspath(destino))
+    temporaria = tempfile.mkdtemp(prefix=os.path.basename(destino) + '.', suffix='.tmp', dir=pasta)
+    try:
+        yield os.path.join(temporaria, os.path.basename(destino))
+        for nome in sorted(os.listdir(temporaria)):
+            os.replace(os.path.join(temporaria, nome), os.path.join(pasta, nome))
+    finally:
+        shutil.rmtree(temporaria, ignore_errors=True)
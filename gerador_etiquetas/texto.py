@@ -0,0 +1,49 @@
+"""Ajuste e quebra de texto com memoização.
+
+A largura de um texto é linear no tamanho da fonte, então o maior tamanho que cabe
+é calculado direto a partir da largura em 1 pt, sem reduzir a fonte de ponto em
+ponto. Os resultados ficam em caches LRU compartilhados por todo o lote, já que
+especificações, fornecedores e tamanhos se repetem milhares de vezes.
+"""
+import math
+from functools import lru_cache
+from typing import Tuple
+
+TAMANHO_CACHE = 16384
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def ajustar_fonte(texto: str, fonte: str, tamanho_max: float, largura: float, tamanho_min: float) -> float:
+    """Maior tamanho (tamanho_max - n pontos, n inteiro) em que o texto cabe na largura.
+
+    Equivale ao laço "diminui 1 pt enquanto não couber e for maior que o mínimo".
+    """
+    if tamanho_max <= tamanho_min:
+        return tamanho_max
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    largura_1pt = stringWidth(texto, fonte, 1)
+    if largura_1pt * tamanho_max <= largura:
+        return tamanho_max
+    # Menor tamanho alcançável pelo laço: o primeiro passo que chega ao mínimo
+    piso = tamanho_max - math.ceil(tamanho_max - tamanho_min)
+    reducao = math.ceil(tamanho_max - largura / largura_1pt)
+    tamanho = max(piso, tamanho_max - reducao)
+    # Corrige arredondamentos de ponto flutuante nas bordas
+    while tamanho < tamanho_max and stringWidth(texto, fonte, tamanho + 1) <= largura:
+        tamanho += 1
+    while tamanho > piso and stringWidth(texto, fonte, tamanho) > largura:
+        tamanho -= 1
+    return tamanho
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def quebrar_linhas(texto: str, fonte: str, tamanho: float, largura: float) -> Tuple[str, ...]:
+    """Linhas de `texto` quebradas para caber na largura (resultado imutável, cacheado)"""
+    from reportlab.lib.utils import simpleSplit
+    return tuple(simpleSplit(texto, fonte, tamanho, largura))
+
+
+def estatisticas_cache() -> dict:
+    """Acertos e falhas dos caches de texto, para diagnóstico"""
+    return {"ajustar_fonte": ajustar_fonte.cache_info()._asdict(),
+            "quebrar_linhas": quebrar_linhas.cache_info()._asdict()}
@@ -0,0 +1,8 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def pasta_de_trabalho(tmp_path, monkeypatch):
+    """Cada teste roda em uma pasta própria: os arquivos de dados e o cache de imagens são relativos"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
@@ -0,0 +1,87 @@
+import io
+import random
+import re
+
+import pytest
+from PIL import Image
+
+from gerador_etiquetas.backends import _contagem_zpl, grafico_zpl
+from gerador_etiquetas.folha import FOLHAS
+from gerador_etiquetas.lote import gerar_termica
+
+
+def _descomprimir(dados: str, por_linha: int) -> bytes:
+    """Decodificador de referência da compressão ASCII da Zebra (^GF/~DG)"""
+    largura = 2 * por_linha
+    linhas, atual, contagem = [], '', 0
+    for c in dados:
+        if c == ':':
+            assert atual == '' and linhas
+            linhas.append(linhas[-1])
+            continue
+        if 'G' <= c <= 'Y': contagem += ord(c) - ord('G') + 1
+        elif 'g' <= c <= 'z': contagem += (ord(c) - ord('g') + 1) * 20
+        elif c in ',!': atual += ('0' if c == ',' else 'F') * (largura - len(atual))
+        else:
+            atual += c * (contagem or 1)
+            contagem = 0
+        assert len(atual) <= largura
+        if len(atual) == largura:
+            linhas.append(atual)
+            atual = ''
+    assert atual == '' and contagem == 0
+    return bytes.fromhex(''.join(linhas))
+
+
+@pytest.mark.parametrize('n, esperado', [(1, 'G'), (19, 'Y'), (20, 'g'), (21, 'gG'), (399, 'yY'),
+                                         (400, 'z'), (401, 'zG'), (839, 'zzgY')])
+def test_contagem_zpl(n, esperado):
+    assert _contagem_zpl(n) == esperado
+
+
+def _aleatoria(tamanho, semente):
+    rnd = random.Random(semente)
+    img = Image.new('1', tamanho, 1)
+    # Blocos sólidos (repetições longas e linhas iguais) misturados com ruído
+    for _ in range(6):
+        x, y = rnd.randrange(tamanho[0]), rnd.randrange(tamanho[1])
+        img.paste(0, (x, y, x + rnd.randrange(1, 60), y + rnd.randrange(1, 30)))
+    for _ in range(tamanho[0] * tamanho[1] // 20):
+        img.putpixel((rnd.randrange(tamanho[0]), rnd.randrange(tamanho[1])), rnd.randrange(2))
+    return img
+
+
+@pytest.mark.parametrize('img', [
+    Image.new('1', (17, 9), 1), Image.new('1', (17, 9), 0), Image.new('1', (1, 1), 0),
+    Image.new('1', (3300, 4), 0), _aleatoria((203, 150), 1), _aleatoria((61, 40), 2), _aleatoria((64, 64), 3),
+], ids=['branca', 'preta', '1px', 'larga', 'foto', 'logo', 'multipla-de-8'])
+def test_grafico_zpl_ida_e_volta(img):
+    total, por_linha, dados = grafico_zpl(img)
+    assert por_linha == (img.width + 7) // 8 and total == por_linha * img.height
+    assert re.fullmatch(r'[0-9A-FG-Yg-z,!:]*', dados)
+    bruto = _descomprimir(dados, por_linha)
+    assert len(bruto) == total
+    # ZPL: 1 = preto; os bits de preenchimento do fim de cada linha ficam brancos
+    de_volta = Image.frombytes('1', img.size, bytes(255 - b for b in bruto))
+    assert de_volta.convert('L').tobytes() == img.convert('L').tobytes()
+    sobra = img.width % 8
+    if sobra:
+        assert all(bruto[i] & (0xFF >> sobra) == 0 for i in range(por_linha - 1, total, por_linha))
+
+
+def test_etiquetas_iguais_seguidas_viram_quantidade(tmp_path):
+    foto = str(tmp_path / 'foto.jpg')
+    Image.new('RGB', (400, 300), '#336699').save(foto)
+    sofa = {'Produto': 'Sofá', 'Fornecedor': 'Acme', 'Prazo': '30 dias', 'imagem': foto,
+            'specs_list': ['Tecido: Linho'], 'tamanhos': [{'tamanho': 'P', 'medida': '1 m', 'codigo': '1'}]}
+    mesa = {'Produto': 'Mesa ^_~', 'Fornecedor': 'Acme', 'Prazo': '', 'imagem': foto,
+            'specs_list': [], 'tamanhos': []}
+    destino = io.BytesIO()
+    n = gerar_termica([sofa, sofa, sofa, mesa, sofa], destino, folha=FOLHAS['rolo-100x150'])
+    zpl = destino.getvalue().decode('utf-8')
+    assert n == 5
+    assert zpl.count('^XA^CI28') == 3
+    assert re.findall(r'\^PQ(\d+)', zpl) == ['3']
+    assert zpl.count('~DG') == 1  # a mesma foto, no mesmo tamanho, vai uma vez por trabalho
+    assert 'Mesa _5E_5F_7E' in zpl
+    assert zpl.endswith('^XA^IDR:ETQ*.GRF^FS^XZ\n')
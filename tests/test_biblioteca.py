@@ -0,0 +1,63 @@
+import json
+
+from gerador_etiquetas.biblioteca import BibliotecaSQLite
+
+
+ANTIGO = {
+    'Acme': {
+        'Sofá Lisboa': {
+            'Produto': 'Sofá Lisboa', 'Fornecedor': 'Acme', 'Prazo': '30 dias', 'imagem': 'fotos/lisboa.jpg',
+            'Tecido': 'Linho', 'specs_list': ['Tecido: Linho', 'Espuma: D33'],
+            'tamanhos': [{'tamanho': '2 lug', 'medida': '180 cm', 'codigo': 'SL2'},
+                         {'tamanho': '3 lug', 'medida': '220 cm', 'codigo': 'SL3'}],
+        },
+        'Mesa Ática': {
+            'Produto': 'Mesa Ática', 'Fornecedor': 'Acme', 'Prazo': '', 'specs_list': [], 'tamanhos': [],
+        },
+    },
+    'Móveis Sul': {
+        'Cadeira': {
+            'Produto': 'Cadeira', 'Fornecedor': 'Móveis Sul', 'Prazo': '15 dias',
+            'specs_list': ['Madeira: Freijó'], 'tamanhos': [{'tamanho': 'U', 'medida': '', 'codigo': '7'}],
+        },
+    },
+}
+
+
+def _migrar(tmp_path, db):
+    caminho = tmp_path / 'db_produtos.json'
+    caminho.write_text(json.dumps(db, ensure_ascii=False), encoding='utf-8')
+    biblioteca = BibliotecaSQLite(str(tmp_path / 'biblioteca.db'))
+    return biblioteca, biblioteca.migrar_json(str(caminho)), str(caminho)
+
+
+def test_migrar_json_ida_e_volta(tmp_path):
+    biblioteca, total, caminho = _migrar(tmp_path, ANTIGO)
+    try:
+        assert total == 3 and biblioteca.contar() == 3
+        assert biblioteca.carregar_tudo() == ANTIGO
+        assert biblioteca.carregar_produto('Acme', 'Sofá Lisboa') == ANTIGO['Acme']['Sofá Lisboa']
+        assert biblioteca.obter_meta('json_migrado') == caminho
+    finally:
+        biblioteca.fechar()
+
+
+def test_registro_antigo_herda_as_chaves_do_json(tmp_path):
+    biblioteca, total, _ = _migrar(tmp_path, {'Acme': {'Poltrona': {'Prazo': '10 dias', 'specs_list': ['Cor: Azul']}}})
+    try:
+        assert total == 1
+        assert biblioteca.carregar_tudo() == {'Acme': {'Poltrona': {
+            'Produto': 'Poltrona', 'Fornecedor': 'Acme', 'Prazo': '10 dias',
+            'specs_list': ['Cor: Azul'], 'tamanhos': []}}}
+    finally:
+        biblioteca.fechar()
+
+
+def test_migrar_de_novo_atualiza_sem_duplicar(tmp_path):
+    biblioteca, _, caminho = _migrar(tmp_path, ANTIGO)
+    try:
+        assert biblioteca.migrar_json(caminho) == 3
+        assert biblioteca.contar() == 3
+        assert biblioteca.carregar_tudo() == ANTIGO
+    finally:
+        biblioteca.fechar()
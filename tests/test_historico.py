@@ -0,0 +1,125 @@
+import os
+import json
+import time
+
+import pytest
+
+from gerador_etiquetas.historico import SUFIXO_COMPACTANDO, HistoricoAutocompletar
+
+
+def _abrir(pasta, **opcoes):
+    h = HistoricoAutocompletar(str(pasta / 'historico.json'), str(pasta / 'historico.jsonl'), **opcoes)
+    return h
+
+
+@pytest.fixture
+def abrir(tmp_path):
+    abertos = []
+    def abrir(**opcoes):
+        h = _abrir(tmp_path, **opcoes)
+        abertos.append(h)
+        return h
+    yield abrir
+    for h in abertos:
+        h.fechar()
+
+
+def test_registrar_e_reabrir_reaplica_o_diario(abrir):
+    h = abrir()
+    assert h.registrar({'Fornecedor': 'Alfa', 'Prazo': '10 dias'}) == 2
+    assert h.registrar({'Fornecedor': 'Alfa', 'Prazo': ''}) == 0
+    h.registrar({'Fornecedor': 'Beta'})
+    h.fechar()
+
+    reaberto = abrir()
+    assert reaberto.valores() == {'Fornecedor': ['Alfa', 'Beta'], 'Prazo': ['10 dias']}
+    assert reaberto.sugerir('Fornecedor') == ['Alfa', 'Beta']  # mais usado primeiro
+
+
+def test_linha_cortada_no_fim_do_diario_e_ignorada(abrir, tmp_path):
+    h = abrir()
+    h.registrar({'Fornecedor': 'Alfa'})
+    h.fechar()
+    with open(tmp_path / 'historico.jsonl', 'ab') as f:
+        f.write(b'{"c": "Fornecedor", "v": "Cort')
+    reaberto = abrir()
+    assert reaberto.valores() == {'Fornecedor': ['Alfa']}
+    reaberto.registrar({'Fornecedor': 'Beta'})
+    reaberto.fechar()
+    assert abrir().valores() == {'Fornecedor': ['Alfa', 'Beta']}
+
+
+def test_compactacao_grava_retrato_e_apaga_o_diario(abrir, tmp_path):
+    h = abrir(limite_linhas=5)
+    for i in range(12):
+        h.registrar({'Produto': f'P{i % 4}'})
+    h.compactar()
+    h.fechar()
+    assert not [n for n in os.listdir(tmp_path) if SUFIXO_COMPACTANDO in n]
+    retrato = json.loads((tmp_path / 'historico.json').read_text(encoding='utf-8'))
+    assert sorted(map(tuple, retrato['Produto'])) == [('P0', 3), ('P1', 3), ('P2', 3), ('P3', 3)]
+
+    reaberto = abrir()
+    assert sorted(reaberto.valores()['Produto']) == ['P0', 'P1', 'P2', 'P3']
+    assert reaberto._campos['Produto'].usos == {'P0': 3, 'P1': 3, 'P2': 3, 'P3': 3}
+
+
+def test_compactacao_nao_remonta_o_estado_na_thread_que_salva(abrir, monkeypatch):
+    h = abrir(limite_linhas=3)
+    monkeypatch.setattr(h, '_carregar', lambda: pytest.fail("remontou o estado ao salvar"))
+    for i in range(3):
+        h.registrar({'Produto': f'P{i}'})
+    tarefa = h._compactacao
+    if tarefa is not None: tarefa.join()
+    assert h.sugerir('Produto', 'P') == ['P2', 'P1', 'P0']
+
+
+def test_diario_de_compactacao_abandonado_e_incorporado(abrir, tmp_path):
+    # Sobra de uma queda no formato anterior (um único diário em compactação)
+    abandonado = tmp_path / ('historico.jsonl' + SUFIXO_COMPACTANDO)
+    abandonado.write_text('{"diario": "antigo"}\n{"c": "Prazo", "v": "30 dias"}\n', encoding='utf-8')
+    passado = time.time() - 3600
+    os.utime(abandonado, (passado, passado))
+
+    h = abrir(limite_linhas=2)
+    assert h.valores() == {'Prazo': ['30 dias']}
+    h.registrar({'Prazo': '10 dias', 'Fornecedor': 'Alfa'})
+    h.compactar()
+    assert not abandonado.exists()
+    h.fechar()
+    assert abrir().valores() == {'Prazo': ['30 dias', '10 dias'], 'Fornecedor': ['Alfa']}
+
+
+def test_instancias_compartilham_o_diario(abrir):
+    a, b = abrir(limite_linhas=4), abrir(limite_linhas=4)
+    a.registrar({'Fornecedor': 'Alfa'})
+    b.atualizar()
+    assert b.valores() == {'Fornecedor': ['Alfa']}
+    for i in range(5):
+        b.registrar({'Fornecedor': f'B{i}'})
+    b.compactar()
+    a.registrar({'Fornecedor': 'Gama'})  # percebe a troca do diário e remonta
+    assert sorted(a.valores()['Fornecedor']) == ['Alfa', 'B0', 'B1', 'B2', 'B3', 'B4', 'Gama']
+
+
+def test_retrato_no_formato_antigo(abrir, tmp_path):
+    # Antes de guardar os usos, o retrato era só a lista de valores (do mais antigo ao mais novo)
+    (tmp_path / 'historico.json').write_text(json.dumps({'Fornecedor': ['Alfa', 'Beta'], 'Prazo': ['10 dias']}),
+                                             encoding='utf-8')
+    h = abrir(limite_linhas=2)
+    assert h.valores() == {'Fornecedor': ['Alfa', 'Beta'], 'Prazo': ['10 dias']}
+    assert h._campos['Fornecedor'].usos == {'Alfa': 1, 'Beta': 1}
+    assert h.sugerir('Fornecedor') == ['Beta', 'Alfa']  # empate nos usos: o mais recente primeiro
+
+    h.registrar({'Fornecedor': 'Alfa'})
+    h.compactar()
+    retrato = json.loads((tmp_path / 'historico.json').read_text(encoding='utf-8'))
+    assert retrato['Fornecedor'] == [['Beta', 1], ['Alfa', 2]]
+    assert retrato['Prazo'] == [['10 dias', 1]]
+
+
+def test_retrato_com_formatos_misturados(abrir, tmp_path):
+    (tmp_path / 'historico.json').write_text(json.dumps({'Produto': ['Mesa', ['Sofá', 4]]}), encoding='utf-8')
+    h = abrir()
+    assert h._campos['Produto'].usos == {'Mesa': 1, 'Sofá': 4}
+    assert h.sugerir('Produto', 'so') == ['Sofá']
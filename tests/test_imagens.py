@@ -0,0 +1,55 @@
+import os
+import time
+
+from PIL import Image
+
+from gerador_etiquetas import imagens
+from gerador_etiquetas.config import EtiquetaConfig
+from gerador_etiquetas.imagens import CacheImagens, cache_padrao, tamanho_alvo
+from gerador_etiquetas.pdf import GeradorPDF
+from gerador_etiquetas.folha import FOLHAS
+
+
+def _foto(caminho, tamanho=(3000, 2000)):
+    Image.new('RGB', tamanho, '#336699').save(caminho)
+    return str(caminho)
+
+
+def test_alvo_segue_a_area_de_imagem_da_folha():
+    for folha in FOLHAS.values():
+        gen = GeradorPDF(folha=folha)
+        assert gen.imagens.alvo == tamanho_alvo(gen.cfg)
+    maior = EtiquetaConfig().escalada(EtiquetaConfig().LARGURA * 2, EtiquetaConfig().ALTURA * 2)
+    assert cache_padrao(maior).alvo[0] > cache_padrao().alvo[0]
+    assert cache_padrao(maior) is not cache_padrao()
+
+
+def test_foto_reduzida_para_o_alvo_de_cada_folha(tmp_path):
+    foto = _foto(tmp_path / 'foto.jpg')
+    pequeno = CacheImagens(str(tmp_path / 'cache'), alvo=(200, 100))
+    grande = CacheImagens(str(tmp_path / 'cache'), alvo=(800, 400))
+    a, b = pequeno.obter(foto), grande.obter(foto)
+    assert a != b
+    assert Image.open(a).size == (150, 100)
+    assert Image.open(b).size == (600, 400)
+
+
+def test_despejo_poupa_arquivos_recentes(tmp_path, monkeypatch):
+    cache = CacheImagens(str(tmp_path / 'cache'), alvo=(300, 200), limite_bytes=1)
+    os.makedirs(cache.diretorio)
+    antigo = os.path.join(cache.diretorio, 'antigo.jpg')
+    gravando = os.path.join(cache.diretorio, 'outro.jpg.123.456.tmp')
+    for caminho in (antigo, gravando):
+        with open(caminho, 'wb') as f:
+            f.write(b'x' * 100)
+    passado = time.time() - 3600
+    os.utime(antigo, (passado, passado))
+
+    recente = cache.obter(_foto(tmp_path / 'foto.jpg'))  # passa do limite e dispara o despejo
+    assert recente and os.path.exists(recente)
+    assert os.path.exists(gravando)
+    assert not os.path.exists(antigo)
+
+    monkeypatch.setattr(imagens, 'CARENCIA_DESPEJO_S', 0)
+    cache._despejar()
+    assert not os.listdir(cache.diretorio)
@@ -0,0 +1,45 @@
+import io
+
+import pytest
+from PIL import Image
+from pypdf import PdfReader
+
+from gerador_etiquetas.folha import FOLHAS
+from gerador_etiquetas.paralelo import gerar_pdf_paralelo
+from gerador_etiquetas.pdf import Compactacao
+
+
+def _lote(tmp_path, quantidade=14):
+    fotos = []
+    for i, cor in enumerate(('#336699', '#993366', '#669933')):
+        caminho = str(tmp_path / f'foto{i}.jpg')
+        Image.new('RGB', (400, 300), cor).save(caminho)
+        fotos.append(caminho)
+    return [{'Produto': f'Produto {i}', 'Fornecedor': 'Acme', 'Prazo': '30 dias',
+             'specs_list': [f'Tecido: Linho {i % 4}'],
+             'tamanhos': [{'tamanho': 'P', 'medida': f'{100 + i} cm', 'codigo': str(i)}],
+             'imagem': fotos[i % len(fotos)]}
+            for i in range(quantidade)]
+
+
+def _gerar(lista, trabalhadores, **kwargs):
+    destino = io.BytesIO()
+    paginas = gerar_pdf_paralelo(lista, destino, trabalhadores=trabalhadores, paginas_por_fatia=1, **kwargs)
+    return paginas, destino.getvalue()
+
+
+@pytest.mark.parametrize('kwargs', [{}, {'compactacao': Compactacao(qualidade_jpeg=60, dpi=150)},
+                                    {'mapeamento': {1: 5, 0: 2}, 'incluir_restantes': True}])
+def test_pdf_identico_para_qualquer_numero_de_processos(tmp_path, kwargs):
+    lista = _lote(tmp_path)
+    paginas, sequencial = _gerar(lista, 1, **kwargs)
+    assert paginas >= 3
+    assert len(PdfReader(io.BytesIO(sequencial)).pages) == paginas
+    for trabalhadores in (2, 3):
+        assert _gerar(lista, trabalhadores, **kwargs) == (paginas, sequencial)
+
+
+def test_folha_de_rolo_identica_em_paralelo(tmp_path):
+    lista = _lote(tmp_path, 5)
+    folha = next(f for f in FOLHAS.values() if f.por_folha == 1)
+    assert _gerar(lista, 1, folha=folha) == _gerar(lista, 2, folha=folha)
@@ -0,0 +1,28 @@
+import logging
+
+import pytest
+
+from gerador_etiquetas.pdf import planejar_paginas
+
+
+def test_distribuicao_automatica():
+    assert planejar_paginas(5, por_pagina=2) == [[(0, 0), (1, 1)], [(0, 2), (1, 3)], [(0, 4)]]
+    assert planejar_paginas(0) == []
+
+
+def test_mapeamento_define_a_primeira_folha():
+    paginas = planejar_paginas(5, {1: 3, 0: 4}, incluir_restantes=True, por_pagina=2)
+    assert paginas == [[(0, 4), (1, 3)], [(0, 0), (1, 1)], [(0, 2)]]
+    assert planejar_paginas(5, {1: 3}, incluir_restantes=False, por_pagina=2) == [[(1, 3)]]
+
+
+def test_mapeamento_ignora_posicoes_e_indices_fora_do_lote():
+    assert planejar_paginas(3, {0: 2, 7: 0, 1: 9}, incluir_restantes=False, por_pagina=4) == [[(0, 2)]]
+
+
+@pytest.mark.parametrize('incluir_restantes', [False, True])
+def test_mapeamento_sem_posicao_valida_usa_distribuicao_automatica(caplog, incluir_restantes):
+    with caplog.at_level(logging.WARNING, logger="FortunneApp"):
+        paginas = planejar_paginas(3, {9: 0, 1: 42}, incluir_restantes=incluir_restantes, por_pagina=2)
+    assert paginas == [[(0, 0), (1, 1)], [(0, 2)]]
+    assert "nenhuma posição válida" in caplog.text
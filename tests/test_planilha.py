@@ -0,0 +1,48 @@
+import re
+import zipfile
+
+from openpyxl import Workbook
+
+from gerador_etiquetas.planilha import iterar_planilha, ler_planilha
+
+
+def _xlsx_sem_dimensao(caminho, linhas):
+    """Planilha como a de alguns exportadores: sem <dimension>, as linhas vêm sem as células vazias do fim"""
+    wb = Workbook()
+    for linha in linhas:
+        wb.active.append(linha)
+    original = str(caminho) + '.orig'
+    wb.save(original)
+    with zipfile.ZipFile(original) as zin, zipfile.ZipFile(caminho, 'w') as zout:
+        for item in zin.infolist():
+            dados = zin.read(item.filename)
+            if item.filename.startswith('xl/worksheets/'):
+                dados = re.sub(rb'<dimension[^>]*/>', b'', dados)
+            zout.writestr(item, dados)
+    return str(caminho)
+
+
+def test_colunas_vazias_no_fim_da_linha(tmp_path):
+    caminho = _xlsx_sem_dimensao(tmp_path / 'produtos.xlsx', [
+        ['Produto', 'Fornecedor', 'Prazo', 'Tecido', 'Tam1', 'Med1', 'Cod1', 'Imagem'],
+        ['Sofá', 'Acme'],
+        ['Mesa'],
+    ])
+    etiquetas = ler_planilha(caminho, ['Tecido'])
+    assert [e['Produto'] for e in etiquetas] == ['Sofá', 'Mesa']
+    assert etiquetas[0]['Fornecedor'] == 'Acme' and etiquetas[1]['Fornecedor'] == ''
+    assert all(e['specs_list'] == [] and e['tamanhos'] == [] and 'imagem' not in e for e in etiquetas)
+
+
+def test_bloco_inteiro_de_linhas_curtas(tmp_path):
+    caminho = _xlsx_sem_dimensao(tmp_path / 'produtos.xlsx', [
+        ['Produto', 'Fornecedor', 'Prazo', 'Tecido', 'Tam1'],
+        ['Sofá', 'Acme', '30 dias', 'Linho', 'P'],
+        ['Mesa'],
+        ['Cadeira', 'Acme'],
+    ])
+    etiquetas = list(iterar_planilha(caminho, ['Tecido'], linhas_por_bloco=1))
+    assert [e['Produto'] for e in etiquetas] == ['Sofá', 'Mesa', 'Cadeira']
+    assert etiquetas[0]['specs_list'] == ['Tecido: Linho']
+    assert etiquetas[0]['tamanhos'] == [{'tamanho': 'P', 'medida': '', 'codigo': ''}]
+    assert etiquetas[2]['Fornecedor'] == 'Acme' and etiquetas[2]['tamanhos'] == []
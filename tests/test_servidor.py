@@ -0,0 +1,140 @@
+import os
+import json
+import threading
+import http.client
+
+import pytest
+from PIL import Image
+
+from gerador_etiquetas import servidor
+from gerador_etiquetas.servidor import PedidoInvalido, ServicoEtiquetas, criar_servidor, validar_etiqueta
+
+ETIQUETA = {'Produto': 'Sofá', 'Fornecedor': 'X', 'specs_list': ['Tecido: Linho'],
+            'tamanhos': [{'tamanho': 'P', 'medida': '1 m', 'codigo': '1'}]}
+
+
+@pytest.fixture
+def pasta_imagens(tmp_path):
+    pasta = tmp_path / 'fotos'
+    pasta.mkdir()
+    Image.new('RGB', (40, 30), '#884422').save(pasta / 'sofa.jpg')
+    return str(pasta)
+
+
+@pytest.fixture
+def servico(pasta_imagens):
+    s = ServicoEtiquetas(trabalhadores=1, pasta_imagens=pasta_imagens)
+    yield s
+    s.encerrar()
+
+
+@pytest.fixture
+def conexao(servico):
+    srv = criar_servidor(porta=0, servico=servico)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    conn = http.client.HTTPConnection('127.0.0.1', srv.server_address[1], timeout=30)
+    yield conn
+    conn.close()
+    srv.shutdown()
+    srv.server_close()
+
+
+def _post(conn, rota, corpo, cabecalhos=None):
+    dados = corpo if isinstance(corpo, bytes) else json.dumps(corpo).encode('utf-8')
+    conn.request('POST', rota, dados, cabecalhos or {'Content-Type': 'application/json'})
+    resposta = conn.getresponse()
+    return resposta.status, resposta.read(), resposta
+
+
+# --- VALIDAÇÃO ---
+@pytest.mark.parametrize('etiqueta', [
+    {'Produto': ''},
+    {'Produto': 'X', 'Fornecedor': None},
+    {'Produto': 'X', 'specs_list': [1]},
+    {'Produto': 'X', 'tamanhos': ['P']},
+    {'Produto': 'X', 'tamanhos': [{'tamanho': 5}]},
+])
+def test_etiqueta_invalida(etiqueta):
+    with pytest.raises(PedidoInvalido):
+        validar_etiqueta(etiqueta)
+
+
+def test_imagem_recusada_sem_pasta_configurada(pasta_imagens):
+    with pytest.raises(PedidoInvalido):
+        validar_etiqueta(dict(ETIQUETA, imagem=os.path.join(pasta_imagens, 'sofa.jpg')))
+
+
+def test_imagem_relativa_a_pasta(pasta_imagens):
+    dados = validar_etiqueta(dict(ETIQUETA, imagem='sofa.jpg'), pasta_imagens)
+    assert dados['imagem'] == os.path.realpath(os.path.join(pasta_imagens, 'sofa.jpg'))
+
+
+@pytest.mark.parametrize('caminho', ['../fora.jpg', '/etc/passwd', 'nao_existe.jpg', '.'])
+def test_imagem_fora_da_pasta_ou_invalida(pasta_imagens, caminho):
+    open(os.path.join(pasta_imagens, '..', 'fora.jpg'), 'wb').close()
+    with pytest.raises(PedidoInvalido):
+        validar_etiqueta(dict(ETIQUETA, imagem=caminho), pasta_imagens)
+
+
+@pytest.mark.skipif(not hasattr(os, 'mkfifo'), reason="FIFO só em sistemas POSIX")
+def test_imagem_que_nao_e_arquivo_comum(pasta_imagens):
+    os.mkfifo(os.path.join(pasta_imagens, 'fila.jpg'))
+    with pytest.raises(PedidoInvalido):
+        validar_etiqueta(dict(ETIQUETA, imagem='fila.jpg'), pasta_imagens)
+
+
+def test_imagem_grande_demais(pasta_imagens, monkeypatch):
+    monkeypatch.setattr(servidor, 'TAMANHO_MAX_IMAGEM', 10)
+    with pytest.raises(PedidoInvalido):
+        validar_etiqueta(dict(ETIQUETA, imagem='sofa.jpg'), pasta_imagens)
+
+
+# --- HTTP ---
+def test_pdf_e_preview(conexao):
+    status, corpo, resposta = _post(conexao, '/pdf', dict(ETIQUETA, imagem='sofa.jpg'))
+    assert status == 200 and corpo.startswith(b'%PDF')
+    status, corpo, resposta = _post(conexao, '/preview?largura=100', ETIQUETA)
+    assert status == 200 and resposta.getheader('Content-Type') == 'image/png'
+
+
+@pytest.mark.parametrize('rota, corpo', [
+    ('/pdf', {'Produto': 'X', 'tamanhos': [{'tamanho': 5}]}),
+    ('/pdf', {'Produto': 'X', 'imagem': '/dev/zero'}),
+    ('/pdf?copias=1000', [ETIQUETA] * 3),
+    ('/pdf?copias=abc', ETIQUETA),
+    ('/pdf', b'{nao e json'),
+])
+def test_pedido_invalido_da_400(conexao, rota, corpo):
+    status, corpo, _ = _post(conexao, rota, corpo)
+    assert status == 400
+    assert 'erro' in json.loads(corpo)
+
+
+def test_fila_cheia_da_503(conexao, servico):
+    servico._vagas = threading.BoundedSemaphore(1)
+    servico._vagas.acquire()
+    status, _, _ = _post(conexao, '/pdf', ETIQUETA)
+    assert status == 503
+
+
+def test_corpo_nao_lido_fecha_a_conexao(conexao, monkeypatch):
+    monkeypatch.setattr(servidor, 'TAMANHO_MAX_CORPO', 10)
+    status, _, resposta = _post(conexao, '/pdf', dict(ETIQUETA, Produto='x' * 100))
+    assert status == 400
+    assert resposta.getheader('Connection') == 'close'
+
+
+def test_content_length_invalido_da_400(conexao):
+    conexao.putrequest('POST', '/pdf')
+    conexao.putheader('Content-Length', 'abc')
+    conexao.endheaders()
+    resposta = conexao.getresponse()
+    assert resposta.status == 400
+    assert resposta.getheader('Connection') == 'close'
+
+
+def test_conexao_continua_depois_de_erro_com_corpo_lido(conexao):
+    status, _, _ = _post(conexao, '/nada', ETIQUETA)
+    assert status == 404
+    status, _, _ = _post(conexao, '/preview?largura=80', ETIQUETA)
+    assert status == 200